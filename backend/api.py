@@ -1,9 +1,13 @@
 """"
 Beschreibung:
-- Definiert die FastAPI-Anwendung, Authentifizierungs-Router und drei Endpunkte:
-  1) POST /upload  – lädt eine Datei zu ImageKit hoch und speichert einen Post in der DB
-  2) GET  /feed    – listet Posts absteigend nach Erstellzeit
+- Definiert die FastAPI-Anwendung, Authentifizierungs-Router und folgende Endpunkte:
+  1) POST /upload  – nimmt eine Datei an und lädt sie im Hintergrund zu ImageKit hoch
+     GET  /upload/{job_id} – Status des Upload-Jobs
+  2) GET  /feed    – listet Posts seitenweise (Cursor) absteigend nach Erstellzeit
   3) DELETE /post/{post_id} – löscht einen Post (nur Besitzer darf löschen)
+  4) GET  /events  – Live-Änderungen am Feed als Server-Sent Events
+  5) GET  /metrics – Messwerte im Prometheus-Format (Latenzen, SQL, Speicher-Aufrufe)
+  6) GET  /admin/profile – Sampling-Profiler für diesen Worker (nur Superuser)
 
 Für Anfänger:
 - FastAPI stellt die Web-API bereit.
@@ -17,31 +21,61 @@ Für Anfänger:
 # -----------------------------
 # Importe aus FastAPI
 # -----------------------------
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Depends
+from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Depends, Query, Request
+from fastapi.responses import StreamingResponse, Response
 # Schemas für Requests/Responses (hier nur Import, in Endpunkten nicht direkt verwendet)
-from backend.schemas import PostCreate, PostResponse, UserRead, UserCreate, UserUpdate
+from backend.schemas import (
+    UserRead, UserCreate, UserUpdate, FeedResponse, FeedDeltaResponse, CommentsResponse, CommentsBatchResponse,
+)
 # DB-Modelle und Helfer: Post-ORM, DB-Setup, Session-Dependency, User-ORM
-from backend.database import Post, create_db_and_tables, get_async_session, User
+from backend.database import Post, Comment, Reaction, ReactionEvent, PostDeletion, run_migrations, get_async_session, get_read_session, async_session_maker, User, engine, read_engine
+# Bericht über langsame SQL-Statements (an die Engines gehängt in backend/database.py)
+from backend.slow_queries import slow_query_log
 
 # Asynchrone SQLAlchemy-Session
 from sqlalchemy.ext.asyncio import AsyncSession
 # Kontextmanager für asynchrone Startup/Shutdown-Logik
 from contextlib import asynccontextmanager
 # SQLAlchemy-Select zum Abfragen
-from sqlalchemy import select
-# ImageKit-Client aus deinem Storage-Modul
-from backend.storage_imagekit import imagekit
-# Upload-Options-Klasse des ImageKit SDK
-from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
+from sqlalchemy import select, delete, or_, and_, func
+from sqlalchemy.exc import IntegrityError
+# Austauschbares Speicher-Backend (ImageKit oder lokales Verzeichnis, per STORAGE_BACKEND)
+from backend.storage import get_storage, LocalStorage, STORAGE_BACKEND
 
-# Dateioperationen (Zwischenspeicherung, temporäre Pfade, etc.)
+# Dateioperationen, Nebenläufigkeit für blockierende SDK-Aufrufe
 import shutil
 import os
 import uuid
-import tempfile
+import asyncio
+import mimetypes
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+# Cursor-Kodierung für die Feed-Pagination
+import base64
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Union
+import logging
 
 # fastapi-users: Auth-Backend, Current-User-Dependency, zentraler fastapi_users Container
-from backend.users import auth_backend, current_active_user, fastapi_users
+from backend.users import auth_backend, current_active_user, current_active_user_fast, current_superuser, fastapi_users
+# Hintergrund-Queue für Uploads (Job-Store austauschbar: Speicher oder DB-Tabelle)
+from backend.upload_jobs import UploadQueue, QueueFull, make_job_store, UPLOAD_SPOOL_DIR
+# Write-Behind-Zähler für Likes/Dislikes
+from backend.reaction_counters import ReactionAggregator, counter_columns
+# Cache der serialisierten Feed-Seiten (Invalidierung bei Schreibzugriffen)
+from backend.feed_cache import FeedCache, FeedPage
+# orjson-Serialisierung für Feed und Kommentare
+from backend.responses import ORJSONResponse, dumps
+# Live-Ereignisse (Pub/Sub) für GET /events
+from backend.events import EventHub
+# Request-Metriken (Latenz, SQL, Speicher-Aufrufe) und GET /metrics
+from backend.metrics import (
+    MetricsMiddleware, instrument_engine, phase, storage_call, registry, render as render_metrics,
+    METRICS_TOKEN, PROMETHEUS_CONTENT_TYPE,
+)
+# Sampling-Profiler (GET /admin/profile) und Überwachung der Event-Loop
+from backend.diagnostics import SamplingProfiler, LoopLagMonitor, PROFILE_INTERVAL_MS, PROFILE_MAX_SECONDS
 
 # Zusätzliche Importe (werden weiter unten für Kommentar-Endpunkte genutzt)
 from pydantic import BaseModel
@@ -50,23 +84,73 @@ from sqlalchemy import select
 # HINWEIS: HTTPException und select sind bereits oben importiert.
 # Doppelimporte sind in Python erlaubt, aber redundant.
 
+logger = logging.getLogger(__name__)
+
+# Schema-Migrationen beim Start ausführen ("1", Standard für Entwicklung).
+# Mit mehreren Workern auf "0" setzen und `alembic upgrade head` einmalig vor dem Start
+# ausführen, damit nicht mehrere Prozesse gleichzeitig migrieren – `run_production.py`
+# macht genau das.
+DB_AUTO_MIGRATE: bool = os.getenv("DB_AUTO_MIGRATE", "1") == "1"
+
 # -----------------------------------------------------------------------------
-# App-Lebenszyklus: Tabellen beim Start anlegen
+# App-Lebenszyklus: Schema migrieren, Hintergrund-Tasks starten
 # -----------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(backend: FastAPI):
     """
     Wird beim Start der App aufgerufen.
-    - Erstellt DB-Tabellen, falls sie fehlen.
+    - Bringt das DB-Schema per Alembic auf den neuesten Stand (abschaltbar über DB_AUTO_MIGRATE).
+    - Erzeugt das Speicher-Backend (bei ImageKit: SDK laden, Client anlegen) und den Upload-Thread-Pool.
+    - Startet den Event-Loop-Lag-Monitor, den Ereignis-Hub, die Upload-Worker (setzt unterbrochene Jobs
+      fort), den Reaktions-Aggregator und (bei SLOW_QUERY_MS > 0) den Bericht über langsame SQL-Statements.
     - `yield` übergibt an die laufende App.
-    - Nach dem `yield` wäre Platz für Aufräumarbeiten beim Shutdown.
+    - Nach dem `yield`: Upload-Worker beenden (offene Jobs laufen mit UPLOAD_JOB_BACKEND=db beim
+      nächsten Start weiter, mit "memory" werden sie vorher abgearbeitet), Worker-Pool und offene
+      /events-Streams beenden, letzten Slow-Query-Bericht schreiben.
     """
-    await create_db_and_tables()  # legt alle per ORM definierten Tabellen an, falls nicht vorhanden
+    if DB_AUTO_MIGRATE:
+        await run_migrations()  # "alembic upgrade head"; kein create_all mehr
+    # Speicher-Client hier erzeugen statt beim Import: `import backend.api` bleibt schnell, und
+    # fehlende ImageKit-Schlüssel fallen beim Start auf statt beim ersten Upload.
+    get_storage()
+    _upload_pool()
+    os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+    await loop_lag_monitor.start()
+    await event_hub.start()
+    await upload_queue.start()
+    await reaction_aggregator.start()
+    await slow_query_log.start()
     yield  # Rückgabe der Kontrolle an FastAPI (App läuft), danach würden Shutdown-Aktionen kommen
+    await reaction_aggregator.stop()
+    await upload_queue.stop()
+    _shutdown_upload_pool()
+    await event_hub.stop()
+    await slow_query_log.stop()
+    await loop_lag_monitor.stop()
+
+# Faltet reaction_events regelmäßig in die Post-Zähler (Start/Stopp im lifespan-Hook)
+reaction_aggregator = ReactionAggregator()
+
+# Serialisierte Feed-Seiten (gemeinsamer Teil für alle User), siehe backend/feed_cache.py
+feed_cache = FeedCache()
+
+# Verteilt Änderungen an offene /events-Verbindungen (Start/Stopp im lifespan-Hook)
+event_hub = EventHub()
+
+# Loggt Blockaden der Event-Loop samt blockierendem Stack (Start/Stopp im lifespan-Hook)
+loop_lag_monitor = LoopLagMonitor()
 
 # FastAPI-App mit Lebenszyklusmanager registrieren
 app = FastAPI(lifespan=lifespan)
 
+# -----------------------------------------------------------------------------
+# Metriken: jeder Request wird gemessen, jedes SQL-Statement gezählt (siehe backend/metrics.py)
+# -----------------------------------------------------------------------------
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine, "write")
+if read_engine is not engine:
+    instrument_engine(read_engine, "read")
+
 # -----------------------------------------------------------------------------
 # Auth- und User-Router von fastapi-users einbinden
 # -----------------------------------------------------------------------------
@@ -106,9 +190,117 @@ app.include_router(
 )
 
 # -----------------------------------------------------------------------------
-# POST /upload – Datei zu ImageKit hochladen und Post speichern
+# Upload-Worker-Pool
+# -----------------------------------------------------------------------------
+# Die Speicher-Backends arbeiten synchron (das ImageKit SDK nutzt requests). Direkt im
+# async-Handler aufgerufen, blockiert das die Event-Loop für die komplette Upload-Dauer,
+# also auch /feed usw. Deshalb laufen Uploads als Hintergrund-Jobs, deren Speicher-Aufruf
+# in einem eigenen, begrenzten Thread-Pool ausgeführt wird.
+# UPLOAD_MAX_CONCURRENCY: wie viele Uploads gleichzeitig zum Speicher laufen dürfen
+# (= Anzahl Upload-Worker). Weitere Jobs warten in der Queue (UPLOAD_QUEUE_MAXSIZE).
+UPLOAD_MAX_CONCURRENCY: int = int(os.getenv("UPLOAD_MAX_CONCURRENCY", "4"))
+
+# Der Pool gehört zum Lebenszyklus der App: im lifespan-Hook erzeugt und beim Beenden
+# geschlossen. Ein zweiter Start im selben Prozess (z. B. ein weiterer TestClient) bekommt
+# einen neuen Pool statt des geschlossenen.
+_upload_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _upload_pool() -> ThreadPoolExecutor:
+    """Liefert den Upload-Pool; erzeugt ihn bei Bedarf (auch ohne lifespan, z. B. in Skripten)."""
+    global _upload_executor
+    if _upload_executor is None:
+        _upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_MAX_CONCURRENCY, thread_name_prefix="upload")
+    return _upload_executor
+
+
+def _shutdown_upload_pool() -> None:
+    """Wartet auf laufende Aufrufe und schließt den Pool; der nächste Gebrauch erzeugt einen neuen."""
+    global _upload_executor
+    if _upload_executor is not None:
+        _upload_executor.shutdown(wait=True)
+        _upload_executor = None
+
+
+async def _run_in_upload_pool(func, *args):
+    """Führt eine blockierende Funktion im Upload-Pool aus, ohne die Event-Loop zu blockieren."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_upload_pool(), func, *args)
+
+
+async def _run_storage(operation: str, func, *args):
+    """
+    Aufruf ans Speicher-Backend, gemessen als storage_call_duration_seconds.
+    Nur Uploads laufen im begrenzten Upload-Pool; alles andere (z. B. Löschen bei DELETE /post)
+    über `asyncio.to_thread`, damit es nicht hinter langen Uploads wartet.
+    """
+    with storage_call(STORAGE_BACKEND, operation):
+        if operation == "upload":
+            return await _run_in_upload_pool(func, *args)
+        return await asyncio.to_thread(func, *args)
+
+
+def _spool_upload_blocking(fileobj, path: str) -> None:
+    """Kopiert den Upload-Body in die Spool-Datei, damit er die Request-Dauer überlebt."""
+    fileobj.seek(0)
+    with open(path, "wb") as target:
+        shutil.copyfileobj(fileobj, target)
+
+
+async def _process_upload_job(job: dict) -> None:
+    """
+    Verarbeitet einen Upload-Job (läuft in einem Upload-Worker):
+    1) Datei im Thread-Pool zum Speicher-Backend hochladen.
+    2) Post mit URL/Dateiname/Datei-ID ergänzen und auf "ready" setzen.
+    Bei Fehlern wird der Post auf "failed" gesetzt und der Fehler weitergereicht
+    (die Queue markiert den Job dann als "failed"). Die Spool-Datei wird danach gelöscht –
+    außer beim Abbruch durch den Shutdown: dann bleibt der Job "running" und wird beim
+    nächsten Start mit derselben Datei fortgesetzt.
+    """
+    storage = get_storage()
+    keep_spool = False
+    try:
+        stored = await _run_storage("upload", storage.upload, job["spool_path"], job["file_name"])
+        async with async_session_maker() as session:
+            post = await session.get(Post, job["post_id"])
+            if post is None:
+                # Post wurde inzwischen gelöscht – hochgeladene Datei wieder entfernen
+                await _run_storage("delete", storage.delete, stored.file_id)
+                return
+            post.url = stored.url                     # öffentlich erreichbare URL
+            post.file_name = stored.name              # tatsächlich gespeicherter Name
+            post.file_id = stored.file_id             # Backend-ID, z. B. zum Löschen
+            post.created_at = datetime.utcnow()       # im Feed ab Veröffentlichung oben einsortieren
+            post.status = "ready"
+            await session.commit()
+            feed_cache.invalidate_all()  # Post ist ab jetzt im Feed sichtbar
+            emails = await _author_emails(session, {post.user_id})
+            await event_hub.publish(
+                "post_created", post=_post_to_dict(post, emails.get(post.user_id, "Unknown"), post.likes, post.dislikes)
+            )
+    except Exception:
+        async with async_session_maker() as session:
+            post = await session.get(Post, job["post_id"])
+            if post is not None:
+                post.status = "failed"
+                await session.commit()
+        raise
+    except asyncio.CancelledError:
+        keep_spool = True
+        raise
+    finally:
+        if not keep_spool and os.path.exists(job["spool_path"]):
+            os.unlink(job["spool_path"])
+
+
+# Zentrale Upload-Queue; Start/Stopp im lifespan-Hook
+upload_queue = UploadQueue(make_job_store(), _process_upload_job, workers=UPLOAD_MAX_CONCURRENCY)
+
+
+# -----------------------------------------------------------------------------
+# POST /upload – Datei annehmen und Upload-Job einreihen
 # -----------------------------------------------------------------------------
-@app.post("/upload")
+@app.post("/upload", status_code=202)
 async def upload_file(
     # Datei kommt als Multipart-Upload
     file: UploadFile = File(),
@@ -121,103 +313,438 @@ async def upload_file(
 ):
     """
     Ablauf:
-    1) Temporäre Datei anlegen und Upload-Inhalt hineinschreiben.
-    2) Datei mit ImageKit SDK hochladen.
-    3) Bei Erfolg Post-Objekt in DB speichern und zurückgeben.
-    4) Temporäre Datei löschen und Upload-Stream schließen.
+    1) Upload-Inhalt in das Spool-Verzeichnis schreiben (in einem Thread, nicht im Upload-Pool).
+    2) Post mit Status "pending" anlegen.
+    3) Upload-Job einreihen und sofort 202 mit job_id antworten.
+    Den Fortschritt fragt der Client über GET /upload/{job_id} ab.
     """
-    temp_file_path = None  # Pfad zur temporären Datei, falls angelegt
+    job_id = uuid.uuid4()
+    spool_path = os.path.join(UPLOAD_SPOOL_DIR, job_id.hex + os.path.splitext(file.filename or "")[1])
+    post = None
 
     try:
-        # 1) Temporäre Datei mit gleicher Endung wie Upload erzeugen
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            temp_file_path = temp_file.name
-            # Upload-Stream in temporäre Datei kopieren
-            shutil.copyfileobj(file.file, temp_file)
-
-        # 2) Upload zu ImageKit durchführen
-        upload_result = imagekit.upload_file(
-            file=open(temp_file_path, "rb"),  # Binär-Handle der temporären Datei
-            file_name=file.filename,          # Zieldateiname bei ImageKit
-            options=UploadFileRequestOptions(
-                use_unique_file_name=True,    # True = eindeutige Namen, Kollisionsschutz
-                tags=["backend-upload"]       # Tagging zu Diagnose/Zwecken
-            )
+        # 1) Datei zwischenspeichern (der Request-Body lebt nur bis zum Ende des Requests)
+        # (asyncio.to_thread: der Upload-Pool kann mit langen Uploads belegt sein, die job_id
+        # soll trotzdem sofort zurückkommen)
+        with phase("spool"):
+            await asyncio.to_thread(_spool_upload_blocking, file.file, spool_path)
+
+        # 2) Post vorab anlegen; URL folgt, sobald ImageKit fertig ist
+        post = Post(
+            user_id=user.id,
+            caption=caption,
+            url="",
+            file_type="video" if (file.content_type or "").startswith("video/") else "image",
+            file_name=file.filename,
+            status="pending",
         )
+        session.add(post)
+        await session.commit()
+        await session.refresh(post)
 
-        # 3) Prüfen, ob Upload erfolgreich (HTTP 200)
-        if upload_result.response_metadata.http_status_code == 200:
-            # Post-Objekt bauen; user.id stammt aus dem eingeloggten User
-            post = Post(
-                user_id=user.id,
-                caption=caption,
-                url=upload_result.url,  # öffentlich erreichbare URL vom SDK
-                file_type="video" if file.content_type.startswith("video/") else "image",
-                file_name=upload_result.name  # tatsächlicher gespeicherter Name bei ImageKit
-            )
-            # ORM: hinzufügen, committen, und frisch laden (damit z. B. Defaults gesetzt sind)
-            session.add(post)
-            await session.commit()
-            await session.refresh(post)
-            return post  # FastAPI serialisiert ORM-Objekte entsprechend der Modelle/Response-Modelle
+        # 3) Job einreihen
+        await upload_queue.submit({
+            "id": job_id,
+            "post_id": post.id,
+            "user_id": user.id,
+            "status": "pending",
+            "error": None,
+            "spool_path": spool_path,
+            "file_name": file.filename,
+            "content_type": file.content_type,
+        })
+        return {"job_id": str(job_id), "post_id": str(post.id), "status": "pending"}
 
+    except QueueFull:
+        await _discard_pending_upload(session, post, spool_path)
+        raise HTTPException(status_code=503, detail="Too many pending uploads, try again later")
     except Exception as e:
-        # Fehlerbehandlung
-        # HINWEIS: Üblich ist HTTPException(detail="..."). Hier wird `status=` verwendet.
-        # Das belassen wir unverändert, da Logik nicht geändert werden soll.
-        raise HTTPException(status_code=500, status=str(e))
+        await _discard_pending_upload(session, post, spool_path)
+        raise HTTPException(status_code=500, detail=str(e))
 
     finally:
-        # 4) Aufräumen: temporäre Datei löschen und Upload-Stream schließen
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+        # Upload-Stream schließen
         file.file.close()
 
+
+async def _discard_pending_upload(session: AsyncSession, post: Optional[Post], spool_path: str) -> None:
+    """Räumt nach einem gescheiterten Einreihen auf: Pending-Post und Spool-Datei entfernen."""
+    if post is not None and post.id is not None:
+        await session.delete(post)
+        await session.commit()
+    if os.path.exists(spool_path):
+        os.unlink(spool_path)
+
+
+# -----------------------------------------------------------------------------
+# GET /upload/{job_id} – Status eines Upload-Jobs
+# -----------------------------------------------------------------------------
+@app.get("/upload/{job_id}")
+async def get_upload_status(
+    job_id: str,
+    user: User = Depends(current_active_user_fast),
+):
+    """
+    Liefert den Status eines Upload-Jobs: "pending", "running", "done" oder "failed".
+    Nur der Besitzer des Jobs darf den Status abfragen.
+    """
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job_id")
+
+    job = await upload_queue.store.get(job_uuid)
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    if job["user_id"] != user.id:
+        raise HTTPException(status_code=403, detail="You do not have the permission to view this upload")
+
+    return {
+        "job_id": str(job["id"]),
+        "post_id": str(job["post_id"]),
+        "status": job["status"],
+        "error": job["error"],
+    }
+
+# -----------------------------------------------------------------------------
+# GET /media/{name} – Dateien des lokalen Speicher-Backends ausliefern
+# -----------------------------------------------------------------------------
+# Blockgröße, in der gemappte Dateien an den Client gestreamt werden.
+MEDIA_CHUNK_SIZE = 256 * 1024
+
+
+@app.get("/media/{name}")
+async def get_media(name: str):
+    """
+    Liefert eine Datei aus STORAGE_LOCAL_DIR (nur bei STORAGE_BACKEND=local).
+    Die Datei wird per mmap eingeblendet und blockweise gestreamt, d. h. ohne sie
+    vorher vollständig in den Python-Speicher zu lesen.
+    Öffentlich wie eine CDN-URL, daher ohne Login.
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=404, detail="Not found")
+    mapped = storage.open_mapped(name)
+    if mapped is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    def chunks():
+        try:
+            for offset in range(0, len(mapped), MEDIA_CHUNK_SIZE):
+                yield mapped[offset:offset + MEDIA_CHUNK_SIZE]
+        finally:
+            if hasattr(mapped, "close"):
+                mapped.close()
+
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={"Content-Length": str(len(mapped)), "Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+# -----------------------------------------------------------------------------
+# Autoren-Lookup (Feed und Kommentare)
+# -----------------------------------------------------------------------------
+async def _author_emails(session: AsyncSession, user_ids: set) -> dict:
+    """
+    Liefert {user_id -> email} für genau die übergebenen User-IDs (ein IN-Lookup).
+    Seit alle IDs `PortableUUID` nutzen, wäre auch ein JOIN möglich. Der getrennte Lookup
+    bleibt: er liefert jede E-Mail nur einmal pro Autor statt einmal pro Post/Kommentar
+    und wird von Feed und Kommentar-Endpunkten gemeinsam genutzt.
+    """
+    if not user_ids:
+        return {}
+    result = await session.execute(select(User.id, User.email).where(User.id.in_(user_ids)))
+    return {row.id: row.email for row in result.all()}
+
+
+# -----------------------------------------------------------------------------
+# Bedingte Requests (ETag / If-None-Match)
+# -----------------------------------------------------------------------------
+# Clients sollen gespeicherte Antworten bei jedem Abruf neu prüfen (no-cache) und bei
+# unverändertem ETag nur ein 304 ohne Body bekommen.
+VALIDATOR_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True, wenn der Client per If-None-Match genau diese Version schon hat."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Für If-None-Match gilt der schwache Vergleich: W/"x" passt zu "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": VALIDATOR_CACHE_CONTROL})
+
+
+# -----------------------------------------------------------------------------
+# Feed-Pagination (Keyset/Cursor)
+# -----------------------------------------------------------------------------
+# Standard- und Maximalgröße einer Feed-Seite. Per ENV anpassbar.
+FEED_PAGE_SIZE: int = int(os.getenv("FEED_PAGE_SIZE", "20"))
+FEED_MAX_PAGE_SIZE: int = int(os.getenv("FEED_MAX_PAGE_SIZE", "100"))
+# Standard- und Maximalzahl Kommentare pro Post (Batch-Endpunkt und ?comments= im Feed).
+COMMENTS_BATCH_LIMIT: int = int(os.getenv("COMMENTS_BATCH_LIMIT", "20"))
+COMMENTS_BATCH_MAX_LIMIT: int = int(os.getenv("COMMENTS_BATCH_MAX_LIMIT", "100"))
+# Delta-Abfragen (?since=): so viele Sekunden vor dem Marker wird zusätzlich gesucht. Der
+# Zeitstempel eines Posts wird vor dem Commit gesetzt; ohne Überlappung könnte ein Post, der
+# während einer Delta-Abfrage gerade gespeichert wird, durchrutschen. Doppelte entfernt der Client.
+FEED_SINCE_OVERLAP: float = float(os.getenv("FEED_SINCE_OVERLAP", "5"))
+# So lange (Sekunden) bleiben Tombstones in post_deletions; ältere Marker bekommen reset=True.
+FEED_TOMBSTONE_RETENTION: float = float(os.getenv("FEED_TOMBSTONE_RETENTION", str(7 * 24 * 3600)))
+
+
+def _encode_cursor(created_at: datetime, post_id: uuid.UUID) -> str:
+    """
+    Baut einen undurchsichtigen Cursor aus (created_at, id) des letzten Posts einer Seite.
+    Der Client reicht ihn unverändert als `?cursor=` zurück, um die nächste Seite zu holen.
+    """
+    raw = f"{created_at.isoformat()}|{post_id.hex}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Gegenstück zu `_encode_cursor`. Wirft ValueError bei manipulierten/kaputten Cursorn."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, post_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(hex=post_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _decode_since(value: str) -> datetime:
+    """
+    Marker für `?since=`: ISO-Zeitstempel (z. B. `since` aus einer früheren Antwort) oder ein
+    Feed-Cursor (dann zählt dessen created_at). Mit Zeitzone wird nach UTC umgerechnet, denn die
+    DB speichert naive UTC-Zeiten (datetime.utcnow). Wirft ValueError bei ungültigen Werten.
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        moment = _decode_cursor(value)[0]
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
 # -----------------------------------------------------------------------------
-# GET /feed – Posts als Liste zurückgeben
+# GET /feed – Posts seitenweise zurückgeben
 # -----------------------------------------------------------------------------
-@app.get("/feed")
+@app.get("/feed", response_model=Union[FeedResponse, FeedDeltaResponse])
 async def get_feed(
-    # DB-Session
-    session: AsyncSession = Depends(get_async_session),
-    # Eingeloggter Benutzer, um "is_owner" zu berechnen
-    user: User = Depends(current_active_user),
+    request: Request,
+    # Seitengröße (Anzahl Posts pro Antwort)
+    limit: int = Query(FEED_PAGE_SIZE, ge=1, le=FEED_MAX_PAGE_SIZE),
+    # Cursor aus `next_cursor` der vorherigen Seite; leer = erste Seite
+    cursor: Optional[str] = Query(None),
+    # Marker (`since` einer früheren Antwort, ISO-Zeitstempel oder Cursor): nur Änderungen seitdem
+    since: Optional[str] = Query(None),
+    # > 0: pro Post `comment_count` und die neuesten N Kommentare mitliefern (ein Request für alles)
+    comments: int = Query(0, ge=0, le=COMMENTS_BATCH_MAX_LIMIT),
+    # DB-Session (Lese-Engine, eigener Pool)
+    session: AsyncSession = Depends(get_read_session),
+    # Eingeloggter Benutzer aus den Token-Claims (keine DB-Abfrage), um "is_owner" zu berechnen
+    user: User = Depends(current_active_user_fast),
 ):
     """
-    Holt Posts absteigend nach Erstellzeit, baut eine flache Response-Struktur.
-    Hinweis: Logik bleibt unverändert, auch wenn es kleinere Inkonsistenzen gibt.
+    Holt eine Seite Posts absteigend nach Erstellzeit (Keyset-Pagination).
+    - Sortierung: created_at DESC, id ASC (passt zum Index ix_posts_created_at_id).
+    - `next_cursor` zeigt auf den letzten Post der Seite; None = keine weiteren Posts.
+    - `?comments=N` bettet `comment_count` und die neuesten N Kommentare je Post ein
+      (eine gruppierte Abfrage für die ganze Seite). Ohne Parameter bleibt die Antwort klein.
+    - Der für alle User gleiche Teil kommt aus `feed_cache` (Header X-Cache: HIT/MISS);
+      pro Request werden nur noch die eigenen Reaktionen abgefragt und angehängt.
+    - Antwort mit ETag; passt If-None-Match, kommt 304 ohne Body.
+    - `since` in der Antwort ist der Marker für spätere Delta-Abfragen.
+    - `?since=<marker>`: nur neue Posts seit dem Marker (höchstens `limit`) und die IDs der seitdem
+      gelöschten Posts, siehe `_feed_delta`. Für Clients ohne offene /events-Verbindung.
     """
-    # Alle Posts nach Erstellzeit absteigend holen
-    result = await session.execute(select(Post).order_by(Post.created_at.desc()))
-    posts = [row[0] for row in result.all()]  # SQLAlchemy liefert Tuples; Modell steckt bei Index 0
+    if since is not None:
+        if cursor:
+            raise HTTPException(status_code=400, detail="Use either cursor or since")
+        return await _feed_delta(session, user, since, limit, comments)
 
-    posts_data = []
+    key = (cursor, limit, comments)
+    page = feed_cache.get(key)
+    cache_status = "HIT"
+    if page is None:
+        cache_status = "MISS"
+        generation = feed_cache.generation
+        page = await _build_feed_page(session, limit, cursor, comments)
+        feed_cache.put(key, page, generation)
+
+    # Eigene Reaktionen des Users auf dieser Seite (ein Lookup)
+    my_reactions = await _my_reactions(session, user.id, page.post_ids)
+
+    etag = page.etag(user.id, my_reactions)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
+    # Als Objekt { "posts": [...], "next_cursor": ..., "since": ... } zurückgeben (bereits serialisiert)
+    return Response(
+        content=page.render(user.id, my_reactions),
+        media_type="application/json",
+        headers={"X-Cache": cache_status, "ETag": etag, "Cache-Control": VALIDATOR_CACHE_CONTROL},
+    )
+
+
+async def _my_reactions(session: AsyncSession, user_id: uuid.UUID, post_ids: list) -> dict:
+    """Reaktionen des Users auf die angegebenen Posts: {post_id: "like"|"dislike"} (ein Lookup)."""
+    if not post_ids:
+        return {}
+    result = await session.execute(
+        select(Reaction.post_id, Reaction.kind)
+        .where(Reaction.user_id == user_id, Reaction.post_id.in_(post_ids))
+    )
+    return {row.post_id: row.kind for row in result.all()}
+
+
+async def _feed_delta(session: AsyncSession, user: User, since: str, limit: int, comments: int) -> ORJSONResponse:
+    """
+    GET /feed?since=...: neue Posts und Tombstones seit dem Marker (schemas.FeedDeltaResponse).
+    - Neue Posts: created_at nach (Marker - FEED_SINCE_OVERLAP), neueste zuerst, mit denselben
+      Feldern wie im normalen Feed (inkl. is_owner/is_liked/is_disliked).
+    - Gelöschte Posts: aus dem Löschprotokoll post_deletions.
+    - `reset=True` statt Delta, wenn der Marker älter als FEED_TOMBSTONE_RETENTION ist oder mehr
+      als `limit` neue Posts anstehen: dann lädt der Client die erste Seite neu.
+    Bewusst ohne Cache: beide Abfragen lesen nur einen kleinen Bereich über die Zeit-Indizes.
+    """
+    try:
+        marker = _decode_since(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since")
+    now = datetime.utcnow()  # vor dem Lesen: der neue Marker darf nichts überspringen
+    reset = {"posts": [], "deleted": [], "since": now.isoformat(), "reset": True}
+    if marker < now - timedelta(seconds=FEED_TOMBSTONE_RETENTION):
+        return ORJSONResponse(reset)
+
+    after = marker - timedelta(seconds=FEED_SINCE_OVERLAP)
+    result = await session.execute(_feed_query().where(Post.created_at > after).limit(limit + 1))
+    rows = result.all()
+    if len(rows) > limit:
+        return ORJSONResponse(reset)
+    result = await session.execute(select(PostDeletion.post_id).where(PostDeletion.deleted_at > after))
+    deleted = result.scalars().all()
+
+    posts = await _post_rows_to_dicts(session, rows, comments)
+    my_reactions = await _my_reactions(session, user.id, [p["id"] for p in posts])
+    for p in posts:
+        kind = my_reactions.get(p["id"])
+        p["is_owner"] = p["user_id"] == user.id
+        p["is_liked"] = kind == "like"
+        p["is_disliked"] = kind == "dislike"
+    return ORJSONResponse({"posts": posts, "deleted": deleted, "since": now.isoformat(), "reset": False})
 
-    # Alle User holen, um ein Mapping {user_id -> email} zu bauen
-    result = await session.execute(select(User))
-    users = [row[0] for row in result.all()]
-    user_dict = {U.id: U.email for U in users}
+
+def _post_to_dict(post, email: str, likes: int, dislikes: int) -> dict:
+    """
+    Für alle User gleiche Felder eines Posts (Feed-Seite und Ereignis "post_created").
+    is_owner/is_liked/is_disliked hängt FeedPage.render pro User an.
+    """
+    return {
+        "id": post.id,
+        "user_id": post.user_id,
+        "caption": post.caption,
+        "url": post.url,
+        # HINWEIS: Hier wird "file_type" mit dem Dateinamen gefüllt.
+        # Vermutlich war "post.file_type" gemeint. Unverändert gelassen.
+        "file_type": post.file_name,
+        "created_at": post.created_at,
+        "email": email,
+        "likes": likes,
+        "dislikes": dislikes,
+    }
+
+
+def _feed_query():
+    """Sichtbare Posts, neueste zuerst; nur die Spalten, die serialisiert werden (keine ORM-Objekte)."""
+    return (
+        select(
+            Post.id,
+            Post.user_id,
+            Post.caption,
+            Post.url,
+            Post.file_name,
+            Post.created_at,
+            *counter_columns(),  # likes/dislikes inkl. offener Änderungen, gleicher Snapshot
+        )
+        .where(Post.status == "ready")  # laufende/fehlgeschlagene Uploads nicht anzeigen
+        .order_by(Post.created_at.desc(), Post.id.asc())
+    )
+
+
+async def _build_feed_page(session: AsyncSession, limit: int, cursor: Optional[str], comments: int) -> FeedPage:
+    """Baut den für alle User gleichen Teil einer Feed-Seite aus der DB (Cache-Miss)."""
+    since = datetime.utcnow().isoformat()  # Delta-Marker: vor dem Lesen festhalten
+    query = _feed_query()
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = _decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # Alles "hinter" dem Cursor: älter, oder gleich alt mit größerer id
+        query = query.where(
+            or_(
+                Post.created_at < cursor_created_at,
+                and_(Post.created_at == cursor_created_at, Post.id > cursor_id),
+            )
+        )
+    # Einen Post mehr holen, um zu wissen, ob es eine weitere Seite gibt
+    result = await session.execute(query.limit(limit + 1))
+    rows = result.all()  # Row-Tupel mit benannten Spalten, keine ORM-Objekte
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    posts_data = await _post_rows_to_dicts(session, rows, comments)
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    return FeedPage.build(posts_data, next_cursor, since)
+
+
+async def _post_rows_to_dicts(session: AsyncSession, rows: list, comments: int) -> list[dict]:
+    """
+    Zeilen aus `_feed_query` -> Dicts mit den für alle User gleichen Feldern
+    (Autor-E-Mail, Zähler inkl. offener Änderungen, optional die neuesten `comments` Kommentare).
+    """
+    # Optional: Kommentare der Seite in einer Abfrage mitladen
+    comment_rows = []
+    if comments:
+        comment_rows = await _latest_comment_rows(session, {post.id for post in rows}, comments)
+
+    # E-Mails nur für die Autoren dieser Seite holen (ein IN-Lookup statt der ganzen User-Tabelle).
+    user_dict = await _author_emails(
+        session, {post.user_id for post in rows} | {c.user_id for c in comment_rows}
+    )
+    if comments:
+        comments_by_post, counts_by_post = _group_comments(comment_rows, [post.id for post in rows], user_dict)
+
+    posts_data = []
 
     # In einfache Dicts umformen
-    for post in posts:
+    for post in rows:
+        # Reaktionen: denormalisierte Zähler + noch nicht aggregierte Änderungen (aus _feed_query)
         posts_data.append(
-            {
-                "id": str(post.id),
-                "user_id": str(post.user_id),
-                "caption": post.caption,
-                "url": post.url,
-                # HINWEIS: Hier wird "file_type" mit dem Dateinamen gefüllt.
-                # Vermutlich war "post.file_type" gemeint. Unverändert gelassen.
-                "file_type": post.file_name,
-                "created_at": post.created_at.isoformat(),
-                # Besitzer-Flag relativ zum eingeloggten User
-                "is_owner": post.user_id == user.id,
-                # E-Mail des Besitzers (Fallback "Unknown")
-                "email": user_dict.get(post.user_id, "Unknown"),
-            }
+            _post_to_dict(
+                post,
+                user_dict.get(post.user_id, "Unknown"),  # E-Mail des Besitzers (Fallback "Unknown")
+                post.likes,
+                post.dislikes,
+            )
         )
-    # Als Objekt { "posts": [...] } zurückgeben
-    return {"posts": posts_data}
+        if comments:
+            posts_data[-1]["comment_count"] = counts_by_post[post.id]
+            posts_data[-1]["comments"] = comments_by_post[post.id]
+    return posts_data
 
 # -----------------------------------------------------------------------------
 # DELETE /post/{post_id} – Post löschen
@@ -248,13 +775,28 @@ async def delete_post(
         if post.user_id != user.id:
             raise HTTPException(status_code=403, detail="You do not have the permission to delete this post")
 
-        # Löschen + Commit
+        # Löschen + Tombstone für Delta-Abfragen (abgelaufene gleich mit aufräumen) + Commit
+        file_id = post.file_id
         await session.delete(post)
+        session.add(PostDeletion(post_id=post_uuid))
+        cutoff = datetime.utcnow() - timedelta(seconds=FEED_TOMBSTONE_RETENTION)
+        await session.execute(delete(PostDeletion).where(PostDeletion.deleted_at < cutoff))
         await session.commit()
+        feed_cache.invalidate_all()
+        await event_hub.publish("post_deleted", post_id=post_uuid)
+
+        # Mediendatei im Speicher-Backend entfernen (best effort, in einem Thread)
+        if file_id:
+            try:
+                await _run_storage("delete", get_storage().delete, file_id)
+            except Exception:
+                logger.warning("Could not delete stored file %s", file_id, exc_info=True)
 
         # Erfolgsantwort
         return {"success": True, "message": "Post deleted successfully"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         # Generische Fehlerbehandlung
         raise HTTPException(status_code=500, detail=str(e))
@@ -266,42 +808,128 @@ class CommentIn(BaseModel):
     # Eingabemodell für neuen Kommentar
     text: str
 
-@app.get("/post/{post_id}/comments")
+def _comment_to_dict(c, emails: dict) -> dict:
+    """
+    Einheitliche Form eines Kommentars (schemas.CommentOut) für Einzel-, Batch- und Feed-Antworten.
+    UUIDs und Zeitstempel bleiben native Typen; orjson schreibt sie direkt.
+    """
+    return {
+        "id": c.id,
+        "post_id": c.post_id,
+        "user_id": c.user_id,
+        "text": c.text,
+        "created_at": c.created_at,
+        "author": emails.get(c.user_id) or "Unknown",
+    }
+
+
+async def _latest_comment_rows(session: AsyncSession, post_uuids: set, limit: int) -> list:
+    """
+    Eine gruppierte Abfrage für mehrere Posts: ROW_NUMBER() begrenzt pro Post auf die
+    neuesten `limit` Kommentare, COUNT(*) OVER liefert gleichzeitig die Gesamtzahl (`total`).
+    Ergebnis aufsteigend nach Zeit je Post.
+    """
+    if not post_uuids:
+        return []
+    ranked = (
+        select(
+            Comment.id,
+            Comment.post_id,
+            Comment.user_id,
+            Comment.text,
+            Comment.created_at,
+            func.row_number().over(
+                partition_by=Comment.post_id,
+                order_by=(Comment.created_at.desc(), Comment.id.desc()),
+            ).label("rn"),
+            func.count().over(partition_by=Comment.post_id).label("total"),
+        )
+        .where(Comment.post_id.in_(post_uuids))
+        .subquery()
+    )
+    result = await session.execute(
+        select(ranked)
+        .where(ranked.c.rn <= limit)
+        .order_by(ranked.c.post_id, ranked.c.created_at.asc(), ranked.c.id.asc())
+    )
+    return result.all()
+
+
+def _group_comments(rows: list, post_uuids, emails: dict) -> tuple[dict, dict]:
+    """Verteilt Zeilen aus `_latest_comment_rows` auf {post_id: [...]} und {post_id: total} (UUID-Schlüssel)."""
+    comments = {pid: [] for pid in post_uuids}
+    counts = {pid: 0 for pid in post_uuids}
+    for c in rows:
+        comments[c.post_id].append(_comment_to_dict(c, emails))
+        counts[c.post_id] = c.total
+    return comments, counts
+
+
+@app.get("/comments", response_model=CommentsBatchResponse)
+async def get_comments_batch(
+    # Mehrere Posts: ?post_id=<uuid>&post_id=<uuid>...
+    post_id: list[str] = Query(..., max_length=FEED_MAX_PAGE_SIZE),
+    # Höchstens so viele (die neuesten) Kommentare pro Post
+    limit: int = Query(COMMENTS_BATCH_LIMIT, ge=1, le=COMMENTS_BATCH_MAX_LIMIT),
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_active_user_fast),
+):
+    """
+    Kommentare für mehrere Posts in einem Request (statt einem GET pro Beitragskarte).
+    - Eine gruppierte Abfrage (siehe `_latest_comment_rows`).
+    - Antwort: {"comments": {post_id: [...]}, "counts": {post_id: n}}; Kommentare aufsteigend nach Zeit.
+    """
+    try:
+        post_uuids = {uuid.UUID(pid) for pid in post_id}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid post_id")
+
+    rows = await _latest_comment_rows(session, post_uuids, limit)
+    emails = await _author_emails(session, {c.user_id for c in rows})
+
+    # Jeder angefragte Post taucht in der Antwort auf, auch ohne Kommentare
+    comments, counts = _group_comments(rows, post_uuids, emails)
+    return ORJSONResponse({"comments": comments, "counts": counts})
+
+
+@app.get("/post/{post_id}/comments", response_model=CommentsResponse)
 async def get_comments(
     post_id: str,
-    session: AsyncSession = Depends(get_async_session),
-    user: User = Depends(current_active_user),
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+    user: User = Depends(current_active_user_fast),
 ):
     """
     Liste Kommentare zu einem Post.
     - Erwartet gültige UUID im Pfad.
-    - Joint Comment und User, um den Autor (E-Mail) zurückzugeben.
+    - Autor-E-Mails kommen aus einem IN-Lookup auf die User-Tabelle.
+    - ETag = Hash (blake2b) der fertig serialisierten Antwort. Damit ändert es sich bei jeder
+      Änderung am Inhalt – auch wenn sich nur die E-Mail eines Autors ändert.
+      Bei passendem If-None-Match: 304 ohne Body; die Abfragen laufen trotzdem, gespart werden
+      Übertragung und Parsen beim Client.
     """
     try:
         post_uuid = uuid.UUID(post_id)  # Validierung der UUID
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid post_id")
 
-    # Kommentare + Author-Email holen
-    from backend.database import Comment  # lokaler Import, um Zyklen zu vermeiden
+    # Kommentare holen, danach Author-Emails
     result = await session.execute(
-        select(Comment, User)
-        .join(User, Comment.user_id == User.id)
+        select(Comment.id, Comment.post_id, Comment.user_id, Comment.text, Comment.created_at)
         .where(Comment.post_id == post_uuid)
         .order_by(Comment.created_at.asc())
     )
     rows = result.all()
-    comments = []
-    for c, u in rows:
-        comments.append({
-            "id": str(c.id),
-            "post_id": str(c.post_id),
-            "user_id": str(c.user_id),
-            "text": c.text,
-            "created_at": c.created_at.isoformat(),
-            "author": u.email if u and getattr(u, "email", None) else "Unknown",
-        })
-    return {"comments": comments}
+    emails = await _author_emails(session, {c.user_id for c in rows})
+    body = dumps({"comments": [_comment_to_dict(c, emails) for c in rows]})
+    etag = '"c-%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": VALIDATOR_CACHE_CONTROL},
+    )
 
 @app.post("/post/{post_id}/comments")
 async def add_comment(
@@ -329,7 +957,6 @@ async def add_comment(
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    from backend.database import Comment  # lokaler Import, vermeidet Zyklus
     comment = Comment(
         post_id=post_uuid,
         user_id=user.id,              # aktueller eingeloggter User als Autor
@@ -337,4 +964,221 @@ async def add_comment(
     )
     session.add(comment)
     await session.commit()
+    feed_cache.invalidate_post(post_uuid)  # Seiten mit eingebetteten Kommentaren/Zählern
+    await event_hub.publish("comment_added", post_id=post_uuid, comment=_comment_to_dict(comment, {user.id: user.email}))
     return {"ok": True, "id": str(comment.id)}
+
+# -----------------------------------------------------------------------------
+# Reaktionen: Like / Dislike
+# -----------------------------------------------------------------------------
+# Jede Reaktion ist eine Zeile in `reactions` (höchstens eine pro Post und User).
+# Zähleränderungen landen in derselben Transaktion als +1/-1 im Log `reaction_events`;
+# der ReactionAggregator rechnet sie gesammelt in Post.likes / Post.dislikes ein (Write-Behind).
+# Alle Endpunkte sind idempotent: doppeltes Liken ändert nichts.
+REACTION_DELTA_FIELD = {"like": "like_delta", "dislike": "dislike_delta"}
+
+
+async def _set_reaction(session: AsyncSession, post_id: str, user: User, kind: str, active: bool) -> dict:
+    """
+    Setzt (active=True) oder entfernt (active=False) die Reaktion `kind` des Users.
+    - Like und Dislike schließen sich aus: Liken ersetzt ein vorhandenes Dislike (und umgekehrt).
+    - Liefert den neuen Zustand: likes, dislikes, is_liked, is_disliked.
+    """
+    try:
+        post_uuid = uuid.UUID(post_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid post_id")
+    # ID vorab merken: nach einem Rollback ist `user` abgelaufen und würde synchron nachladen
+    user_id = user.id
+
+    exists = await session.execute(select(Post.id).where(Post.id == post_uuid, Post.status == "ready"))
+    if exists.first() is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    result = await session.execute(
+        select(Reaction).where(Reaction.post_id == post_uuid, Reaction.user_id == user_id)
+    )
+    reaction = result.scalars().first()
+    current = reaction.kind if reaction else None
+
+    deltas = {"like_delta": 0, "dislike_delta": 0}
+    if active and current != kind:
+        if reaction is None:
+            session.add(Reaction(post_id=post_uuid, user_id=user_id, kind=kind))
+        else:
+            # Wechsel Like <-> Dislike: alten Zähler runter
+            deltas[REACTION_DELTA_FIELD[current]] -= 1
+            reaction.kind = kind
+        deltas[REACTION_DELTA_FIELD[kind]] += 1
+    elif not active and current == kind:
+        await session.delete(reaction)
+        deltas[REACTION_DELTA_FIELD[kind]] -= 1
+
+    if any(deltas.values()):
+        session.add(ReactionEvent(post_id=post_uuid, **deltas))
+        try:
+            await session.commit()
+            feed_cache.invalidate_post(post_uuid)  # Zähler auf gecachten Seiten veraltet
+            # Nur die Änderung verschicken; Clients addieren sie auf ihre Zähler
+            await event_hub.publish(
+                "reaction", post_id=post_uuid, user_id=user_id,
+                likes=deltas["like_delta"], dislikes=deltas["dislike_delta"],
+            )
+        except IntegrityError:
+            # Paralleler Request desselben Users hat die Reaktion schon angelegt -> nichts zu tun
+            await session.rollback()
+
+    # Anzeige: aggregierter Zähler + noch nicht eingerechnete Änderungen (eine Abfrage)
+    counts = (await session.execute(select(*counter_columns()).where(Post.id == post_uuid))).one()
+    result = await session.execute(
+        select(Reaction.kind).where(Reaction.post_id == post_uuid, Reaction.user_id == user_id)
+    )
+    state = result.scalar()
+    return {
+        "post_id": str(post_uuid),
+        "likes": counts.likes,
+        "dislikes": counts.dislikes,
+        "is_liked": state == "like",
+        "is_disliked": state == "dislike",
+    }
+
+
+@app.post("/post/{post_id}/like")
+async def like_post(
+    post_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """Post liken (entfernt ggf. ein Dislike desselben Users)."""
+    return await _set_reaction(session, post_id, user, "like", True)
+
+
+@app.post("/post/{post_id}/unlike")
+async def unlike_post(
+    post_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """Like zurücknehmen (ohne Like: keine Änderung)."""
+    return await _set_reaction(session, post_id, user, "like", False)
+
+
+@app.post("/post/{post_id}/dislike")
+async def dislike_post(
+    post_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """Post disliken (entfernt ggf. ein Like desselben Users)."""
+    return await _set_reaction(session, post_id, user, "dislike", True)
+
+
+@app.post("/post/{post_id}/undislike")
+async def undislike_post(
+    post_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user),
+):
+    """Dislike zurücknehmen (ohne Dislike: keine Änderung)."""
+    return await _set_reaction(session, post_id, user, "dislike", False)
+
+# -----------------------------------------------------------------------------
+# GET /events – Live-Änderungen als Server-Sent Events
+# -----------------------------------------------------------------------------
+# Ereignisse (Feld "type" im JSON):
+#   post_created  {"post": {... wie ein Feed-Eintrag ohne is_owner/is_liked/is_disliked}}
+#   post_deleted  {"post_id": ...}
+#   comment_added {"post_id": ..., "comment": {... wie in GET /post/{id}/comments}}
+#   reaction      {"post_id": ..., "user_id": ..., "likes": +-1/0, "dislikes": +-1/0}
+#   resync        Ereignisse verpasst -> Feed einmal neu laden
+@app.get("/events")
+async def stream_events(
+    request: Request,
+    user: User = Depends(current_active_user_fast),
+):
+    """
+    Offener Stream mit allen Änderungen am Feed (text/event-stream).
+    - Beim Wiederverbinden schickt der Client den Header Last-Event-ID; verpasste Ereignisse
+      werden nachgeliefert, sofern sie noch im Puffer des Hubs liegen (sonst "resync").
+    - Ein Client lädt /feed einmal und wendet danach nur noch diese Änderungen an.
+    - Jeder Stream endet nach EVENT_STREAM_MAX_AGE Sekunden; der Client verbindet sich neu.
+    """
+    subscription = event_hub.subscribe(request.headers.get("Last-Event-ID"))
+
+    async def frames():
+        try:
+            async for frame in subscription.frames():
+                yield frame
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        # kein Zwischenspeichern durch Browser/Proxys (z. B. nginx puffert sonst die Antwort)
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+# -----------------------------------------------------------------------------
+# GET /metrics – Prometheus-Format
+# -----------------------------------------------------------------------------
+def _component_metrics():
+    """Zähler aus Feed-Cache, Event-Hub und Upload-Queue (beim Abruf von /metrics gelesen)."""
+    for prefix, stats, counters in (
+        ("feed_cache", feed_cache.stats(), {"hits", "misses", "evictions"}),
+        ("events", event_hub.stats(), {"published", "dropped"}),
+        ("upload_jobs", upload_queue.stats(), {"done", "failed"}),
+    ):
+        for key, value in stats.items():
+            if key in counters:
+                yield f"{prefix}_{key}_total", "counter", f"{prefix}: {key} seit Prozessstart.", value
+            else:
+                yield f"{prefix}_{key}", "gauge", f"{prefix}: aktueller Wert von {key}.", value
+
+
+registry.register_collector(_component_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """
+    Messwerte dieses Worker-Prozesses im Prometheus-Textformat.
+    Mit gesetztem METRICS_TOKEN nur mit "Authorization: Bearer <token>" abrufbar.
+    """
+    if METRICS_TOKEN and not secrets.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {METRICS_TOKEN}".encode()
+    ):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+# -----------------------------------------------------------------------------
+# GET /admin/profile – Sampling-Profiler (nur Superuser)
+# -----------------------------------------------------------------------------
+# Pro Prozess läuft höchstens ein Profil gleichzeitig
+_profile_lock = asyncio.Lock()
+
+
+@app.get("/admin/profile", tags=["admin"])
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(PROFILE_INTERVAL_MS, ge=1, le=1000),
+    idle: bool = Query(False, description="Auch wartende Threads (Leerlauf) mitzählen"),
+    user: User = Depends(current_superuser),
+):
+    """
+    Profiliert den Worker-Prozess, der diese Anfrage bekommt, für `seconds` Sekunden und
+    liefert die Stacks im collapsed-Format (text/plain), z. B.:
+        curl -H "Authorization: Bearer <TOKEN>" "http://localhost:8000/admin/profile?seconds=30" > profile.txt
+        flamegraph.pl profile.txt > profile.svg    # oder profile.txt auf speedscope.app laden
+    Das Sampling läuft in einem Thread; die Event-Loop bedient währenddessen normal weiter.
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+    async with _profile_lock:
+        profiler = SamplingProfiler(interval_ms, include_idle=idle)
+        stacks = await asyncio.to_thread(profiler.run, seconds)
+    return Response(
+        profiler.collapse(stacks),
+        media_type="text/plain; charset=utf-8",
+        headers={"Cache-Control": "no-store", "X-Profile-Samples": str(profiler.samples)},
+    )
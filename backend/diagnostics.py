@@ -0,0 +1,201 @@
+"""
+Beschreibung:
+- `SamplingProfiler`: statistischer Profiler für den laufenden Worker (GET /admin/profile).
+  Ergebnis im "collapsed stack"-Format, direkt verwendbar mit flamegraph.pl, speedscope.app
+  oder inferno.
+- `LoopLagMonitor`: misst, wie verspätet die Event-Loop ihre Aufgaben abarbeitet, und loggt
+  den Stack des Codes, der die Loop gerade blockiert.
+
+Für Anfänger:
+- Ein Sampling-Profiler misst nicht jeden Funktionsaufruf, sondern schaut alle paar
+  Millisekunden nach, wo jeder Thread gerade steht (`sys._current_frames()`). Häufig gesehene
+  Stacks sind die, in denen die Zeit vergeht. Das kostet kaum etwas und stört den Betrieb nicht.
+- Collapsed-Format: eine Zeile je Stack, Funktionen von außen nach innen mit ";" getrennt,
+  am Ende die Anzahl Samples, z. B. "MainThread;run (asyncio/runners.py:86);... 42".
+- Eine wartende Coroutine steht auf keinem Stack – sichtbar ist nur, was gerade rechnet oder
+  blockiert. Leerlauf (Loop wartet in `select`, Pool- und aiosqlite-Threads warten auf Arbeit)
+  wird standardmäßig weggelassen (`idle=true` zeigt ihn).
+- Event-Loop-Lag: Alle Requests eines Workers teilen sich eine Event-Loop. Ruft ein Handler
+  etwas Synchrones auf (z. B. ein SDK mit `requests`), stehen alle anderen Requests still.
+  Der Monitor plant alle LOOP_LAG_INTERVAL Sekunden einen Herzschlag ein; kommt der zu spät,
+  war die Loop blockiert. Ein Wächter-Thread sieht das schon während der Blockade und loggt,
+  welche Zeile gerade läuft.
+"""
+
+import asyncio
+import linecache
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+
+from backend.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# Abstand zwischen zwei Samples (ms) und maximale Dauer eines Profils (s).
+PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_SECONDS: float = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+# "1" = Event-Loop-Lag überwachen (Standard), "0" = aus.
+LOOP_LAG_MONITOR: bool = os.getenv("LOOP_LAG_MONITOR", "1") == "1"
+# Ab dieser Verspätung (ms) gilt die Loop als blockiert und es wird geloggt.
+LOOP_LAG_THRESHOLD_MS: float = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+# Abstand der Herzschläge (s).
+LOOP_LAG_INTERVAL: float = float(os.getenv("LOOP_LAG_INTERVAL", "0.05"))
+
+# Ein Thread wartet nur auf Arbeit, wenn sein innerster Python-Frame gerade in einer Zeile mit
+# einem dieser Aufrufe steht (Loop: selector.poll/select, Pool-Threads: queue.get, Locks: wait).
+# `sleep(` gehört bewusst nicht dazu: ein time.sleep in der Event-Loop ist eine Blockade.
+IDLE_CALLS = (".poll(", ".select(", ".get(", ".wait(", ".acquire(")
+
+loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "Verspätung der Herzschläge der Event-Loop.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+loop_blocked = registry.counter(
+    "event_loop_blocked_total", "Blockaden der Event-Loop über LOOP_LAG_THRESHOLD_MS."
+)
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    """Dateiname relativ zum passenden sys.path-Eintrag (z. B. "fastapi/routing.py")."""
+    best = ""
+    for entry in sys.path:
+        if entry and filename.startswith(entry.rstrip(os.sep) + os.sep) and len(entry) > len(best):
+            best = entry.rstrip(os.sep) + os.sep
+    return filename[len(best):].replace(os.sep, "/")
+
+
+def _frame_label(code) -> str:
+    """Eine Funktion im Stack: "qualname (datei:erste Zeile)" – gleiche Funktion, gleiches Label."""
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+@lru_cache(maxsize=4096)
+def _is_wait_line(filename: str, lineno: int) -> bool:
+    line = linecache.getline(filename, lineno)
+    return any(call in line for call in IDLE_CALLS)
+
+
+def _is_idle(frame) -> bool:
+    return _is_wait_line(frame.f_code.co_filename, frame.f_lineno)
+
+
+class SamplingProfiler:
+    """
+    Sammelt Stacks aller Threads des Prozesses (außer dem eigenen).
+    `run` blockiert für die Messdauer und gehört daher in einen Thread.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, include_idle: bool = False):
+        self.interval = interval_ms / 1000
+        self.include_idle = include_idle
+        self.samples = 0
+
+    def run(self, seconds: float) -> Counter:
+        """Profiliert `seconds` Sekunden lang; liefert {collapsed stack: Anzahl Samples}."""
+        own = threading.get_ident()
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (not self.include_idle and _is_idle(frame)):
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+        return stacks
+
+    @staticmethod
+    def collapse(stacks: Counter) -> str:
+        """Collapsed-Stack-Text, häufigste Stacks zuerst."""
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class LoopLagMonitor:
+    """
+    Herzschlag-Task in der Event-Loop plus Wächter-Thread.
+    - Der Task misst die Verspätung jedes Herzschlags (Histogramm event_loop_lag_seconds) und
+      loggt nach einer Blockade deren Dauer.
+    - Der Thread prüft, ob der letzte Herzschlag länger als die Schwelle her ist, und loggt
+      dann einmal pro Blockade den aktuellen Stack des Loop-Threads – also den Code, der blockiert.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+        interval: float = LOOP_LAG_INTERVAL,
+        enabled: bool = LOOP_LAG_MONITOR,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval
+        self.enabled = enabled
+        self._last_beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._reported = False
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        if not self.enabled:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat(), name="loop-lag-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _beat(self) -> None:
+        while True:
+            scheduled = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            lag = max(0.0, now - scheduled)
+            loop_lag.observe(lag)
+            if lag >= self.threshold:
+                loop_blocked.inc()
+                logger.warning("Event loop was blocked for %.0f ms", lag * 1000)
+            self._reported = False
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            blocked = time.monotonic() - self._last_beat - self.interval
+            if blocked < self.threshold or self._reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._reported = True
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                "Event loop blocked for more than %.0f ms, currently running:\n%s", blocked * 1000, stack
+            )
@@ -0,0 +1,235 @@
+"""
+Beschreibung:
+- Live-Ereignisse für den Feed (Server-Sent Events, GET /events).
+- `EventHub`: In-Prozess-Pub/Sub. Schreibende Endpunkte veröffentlichen kompakte Änderungen
+  (neuer Post, gelöschter Post, neuer Kommentar, Zähler-Änderung), alle offenen
+  /events-Verbindungen bekommen sie sofort.
+- `EventBroker`: austauschbare Transportschicht zwischen `publish` und der Verteilung.
+  `MemoryBroker` (Standard) verteilt nur im eigenen Prozess. Auswahl per EVENT_BROKER.
+
+Für Anfänger:
+- Ohne Push-Kanal erfährt ein Client von Änderungen nur, indem er /feed neu lädt.
+  Mit /events lädt er den Feed einmal und wendet danach nur noch die Änderungen an.
+- Server-Sent Events sind eine normale HTTP-Antwort, die offen bleibt. Jede Nachricht ist ein
+  Block "id: ...\\ndata: {json}\\n\\n". Leerlauf-Kommentare (": ping") halten Proxys wach.
+- Jedes Ereignis wird genau einmal serialisiert; alle Abonnenten bekommen dieselben Bytes.
+- Mehrere Worker-Prozesse: Mit `MemoryBroker` sieht jeder Prozess nur seine eigenen Ereignisse.
+  Dafür einen Broker mit gemeinsamem Kanal (z. B. Redis Pub/Sub, PostgreSQL LISTEN/NOTIFY)
+  als Unterklasse von `EventBroker` ergänzen und in `make_broker` eintragen.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import deque
+from typing import Callable, Optional
+
+from backend.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# Transport zwischen publish und Verteilung: "memory" (Standard, nur dieser Prozess).
+EVENT_BROKER: str = os.getenv("EVENT_BROKER", "memory")
+# Maximal gepufferte Nachrichten je Verbindung. Läuft der Puffer voll (Client zu langsam),
+# bekommt der Client ein "resync" und die Verbindung wird beendet.
+EVENT_QUEUE_SIZE: int = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+# So viele letzte Ereignisse werden für Wiederverbindungen (Last-Event-ID) aufbewahrt.
+EVENT_REPLAY_SIZE: int = int(os.getenv("EVENT_REPLAY_SIZE", "1024"))
+# Sekunden ohne Ereignis, nach denen ein ": ping" gesendet wird.
+EVENT_KEEPALIVE: float = float(os.getenv("EVENT_KEEPALIVE", "15"))
+# Nach so vielen Sekunden endet ein Stream; der Client verbindet sich mit Last-Event-ID neu und
+# verpasst nichts. Uvicorn wartet beim Beenden auf offene Antworten – ohne Obergrenze würden
+# offene Streams das Herunterfahren (und Auto-Reload) beliebig lange aufhalten.
+EVENT_STREAM_MAX_AGE: float = float(os.getenv("EVENT_STREAM_MAX_AGE", "60"))
+
+# Nachricht an Clients, die Ereignisse verpasst haben: Feed einmal komplett neu laden.
+RESYNC_FRAME = b'data: {"type":"resync"}\n\n'
+KEEPALIVE_FRAME = b": ping\n\n"
+# Erster Block jedes Streams: Browser (EventSource) verbinden sich nach 1 s neu statt nach ~3 s.
+RETRY_FRAME = b"retry: 1000\n\n"
+
+
+class EventBroker:
+    """
+    Schnittstelle für den Transport der Ereignisse.
+    - `publish(payload)`: serialisiertes Ereignis (JSON-Bytes) abschicken.
+    - `start(deliver)`: ab jetzt jedes empfangene Ereignis an `deliver` übergeben
+      (auch die eigenen – so sehen alle Prozesse dieselbe Reihenfolge).
+    """
+
+    async def start(self, deliver: Callable[[bytes], None]) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+    async def publish(self, payload: bytes) -> None:
+        raise NotImplementedError
+
+
+class MemoryBroker(EventBroker):
+    """Verteilt direkt im eigenen Prozess (kein Netzwerk, keine Verzögerung)."""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[bytes], None]] = None
+
+    async def start(self, deliver: Callable[[bytes], None]) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, payload: bytes) -> None:
+        if self._deliver is not None:
+            self._deliver(payload)
+
+
+def make_broker() -> EventBroker:
+    """Broker gemäß EVENT_BROKER."""
+    if EVENT_BROKER == "memory":
+        return MemoryBroker()
+    raise ValueError(f"Unknown EVENT_BROKER: {EVENT_BROKER!r}")
+
+
+class Subscription:
+    """
+    Eine offene /events-Verbindung: Puffer mit fertigen SSE-Blöcken.
+    `None` im Puffer bedeutet: Stream beenden.
+    """
+
+    def __init__(self, size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+    def push(self, frame: Optional[bytes]) -> bool:
+        """Legt einen Block ab; False, wenn der Puffer voll ist."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self, final: Optional[bytes] = None) -> None:
+        """Verwirft Ungesendetes und beendet den Stream (optional mit einem letzten Block)."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        if final is not None:
+            self.queue.put_nowait(final)
+        self.queue.put_nowait(None)
+
+    async def frames(self, keepalive: float = EVENT_KEEPALIVE, max_age: float = EVENT_STREAM_MAX_AGE):
+        """
+        Liefert die Blöcke für die HTTP-Antwort: nach `keepalive` Sekunden Leerlauf ein Ping,
+        nach `max_age` Sekunden (oder bei `close`) ist Schluss.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_age
+        yield RETRY_FRAME
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                frame = await asyncio.wait_for(self.queue.get(), min(keepalive, remaining))
+            except asyncio.TimeoutError:
+                if deadline - loop.time() > 0:
+                    yield KEEPALIVE_FRAME
+                continue
+            if frame is None:
+                return
+            yield frame
+
+
+class EventHub:
+    """
+    Pub/Sub-Verteiler für Live-Ereignisse.
+    - Ereignis-IDs haben die Form "<instanz>-<laufende Nummer>". Die Instanz wechselt bei jedem
+      Start; eine Last-Event-ID einer anderen Instanz (Neustart, anderer Worker) führt zu "resync".
+    - Die letzten `replay_size` Blöcke werden aufbewahrt, damit kurze Verbindungsabbrüche
+      ohne Neuladen des Feeds überbrückt werden.
+    """
+
+    def __init__(
+        self,
+        broker: Optional[EventBroker] = None,
+        queue_size: int = EVENT_QUEUE_SIZE,
+        replay_size: int = EVENT_REPLAY_SIZE,
+    ):
+        self.broker = broker or make_broker()
+        self.queue_size = queue_size
+        self.instance = uuid.uuid4().hex[:8]
+        self.published = 0
+        self.dropped = 0
+        self._seq = 0
+        self._recent: deque[tuple[int, bytes]] = deque(maxlen=replay_size)
+        self._subscribers: set[Subscription] = set()
+
+    async def start(self) -> None:
+        await self.broker.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self.broker.stop()
+        for sub in list(self._subscribers):
+            sub.close()
+        self._subscribers.clear()
+
+    async def publish(self, event_type: str, **data) -> None:
+        """
+        Veröffentlicht ein Ereignis {"type": event_type, ...}. Fehler im Transport werden nur
+        geloggt: die eigentliche Änderung ist zu diesem Zeitpunkt schon gespeichert.
+        """
+        try:
+            await self.broker.publish(dumps({"type": event_type, **data}))
+        except Exception:
+            logger.exception("Could not publish %s event", event_type)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Neue Verbindung anmelden. Mit `last_event_id` (Header Last-Event-ID beim Wiederverbinden)
+        werden verpasste Ereignisse nachgeliefert – oder "resync", wenn das nicht mehr geht.
+        """
+        sub = Subscription(self.queue_size)
+        if last_event_id:
+            missed = self._missed_since(last_event_id)
+            if missed is None or len(missed) >= self.queue_size:
+                sub.push(RESYNC_FRAME)
+            else:
+                for frame in missed:
+                    sub.push(frame)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+    def _missed_since(self, last_event_id: str) -> Optional[list[bytes]]:
+        """Blöcke nach `last_event_id`; None, wenn die ID unbekannt oder zu alt ist."""
+        instance, _, seq = last_event_id.partition("-")
+        if instance != self.instance or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq == self._seq:
+            return []
+        if not self._recent or seq < self._recent[0][0] - 1 or seq > self._seq:
+            return None
+        return [frame for n, frame in self._recent if n > seq]
+
+    def _deliver(self, payload: bytes) -> None:
+        """Vom Broker aufgerufen: Block bauen, merken und an alle Verbindungen verteilen."""
+        self._seq += 1
+        self.published += 1
+        frame = b"id: %s-%d\ndata: %s\n\n" % (self.instance.encode(), self._seq, payload)
+        self._recent.append((self._seq, frame))
+        for sub in list(self._subscribers):
+            if not sub.push(frame):
+                # Zu langsamer Client: nicht unbegrenzt puffern, sondern neu synchronisieren lassen
+                self.dropped += 1
+                self._subscribers.discard(sub)
+                sub.close(RESYNC_FRAME)
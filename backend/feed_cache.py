@@ -0,0 +1,178 @@
+"""
+Beschreibung:
+- In-Prozess-Cache für fertig serialisierte Feed-Seiten (TTL + LRU, begrenzt nach Anzahl und Bytes).
+- Schlüssel: (cursor, limit, comments) – also genau die Query-Parameter von GET /feed.
+- Gespeichert wird nur der für alle User gleiche Teil. Die benutzerabhängigen Felder
+  (`is_owner`, `is_liked`, `is_disliked`) werden pro Request an die fertigen JSON-Bytes angehängt.
+
+Für Anfänger:
+- LRU ("least recently used"): ist der Cache voll, fliegt der am längsten nicht genutzte Eintrag raus.
+- TTL ("time to live"): Einträge verfallen nach einer festen Zeit, auch ohne Schreibzugriff.
+  Das begrenzt, wie lange andere Worker-Prozesse veraltete Seiten ausliefern.
+- Schreibende Endpunkte invalidieren: neue/gelöschte Posts verschieben alle Seiten
+  (`invalidate_all`), Kommentare und Reaktionen betreffen nur Seiten mit diesem Post
+  (`invalidate_post`).
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from backend.responses import dumps
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# "1" = Cache aktiv (Standard), "0" = jede Anfrage baut die Seite aus der DB.
+FEED_CACHE_ENABLED: bool = os.getenv("FEED_CACHE_ENABLED", "1") == "1"
+# Sekunden, die eine Seite höchstens im Cache bleibt.
+FEED_CACHE_TTL: float = float(os.getenv("FEED_CACHE_TTL", "10"))
+# Obergrenzen: Anzahl Seiten und Summe der JSON-Bytes aller Seiten.
+FEED_CACHE_MAX_ENTRIES: int = int(os.getenv("FEED_CACHE_MAX_ENTRIES", "256"))
+FEED_CACHE_MAX_BYTES: int = int(os.getenv("FEED_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+@dataclass
+class FeedPage:
+    """
+    Eine serialisierte Feed-Seite ohne benutzerabhängige Felder.
+    - fragments: JSON je Post, ohne schließende Klammer (dort werden die User-Felder angehängt)
+    - post_ids / owner_ids: passend zu `fragments`, für Reaktions-Lookup und `is_owner`
+    - tail: Rest der Antwort nach der Post-Liste (`],"next_cursor":...`)
+    - since: Marker für GET /feed?since=... (Zeitpunkt vor dem Lesen der Seite). Steht im Body,
+      deshalb auch im digest: nach einem Neuaufbau der Seite ändert sich das ETag, selbst wenn
+      die Posts gleich geblieben sind (der Client bekommt dann einmal die volle Seite).
+    - digest: Prüfsumme des gemeinsamen Teils (Basis für das ETag, einmal pro Seite berechnet)
+    """
+    fragments: list[bytes]
+    post_ids: list[uuid.UUID]
+    owner_ids: list[uuid.UUID]
+    tail: bytes
+    since: Optional[str] = None
+    size: int = field(init=False)
+    digest: bytes = field(init=False)
+
+    def __post_init__(self):
+        self.size = sum(len(f) for f in self.fragments) + len(self.tail) + 64 * len(self.fragments)
+        h = hashlib.blake2b(digest_size=16)
+        for fragment in self.fragments:
+            h.update(fragment)
+        h.update(self.tail)
+        h.update(dumps(self.since))
+        self.digest = h.digest()
+
+    @classmethod
+    def build(cls, posts: list[dict], next_cursor: Optional[str], since: Optional[str] = None) -> "FeedPage":
+        """`posts`: Dicts mit allen gemeinsamen Feldern (`id`/`user_id` als uuid.UUID)."""
+        return cls(
+            fragments=[dumps(p)[:-1] for p in posts],
+            post_ids=[p["id"] for p in posts],
+            owner_ids=[p["user_id"] for p in posts],
+            tail=b"],\"next_cursor\":" + dumps(next_cursor),
+            since=since,
+        )
+
+    def etag(self, user_id: uuid.UUID, reactions: dict) -> str:
+        """
+        Starkes ETag der Antwort für diesen User, ohne sie zu rendern: gemeinsamer Teil
+        (digest) + alles, was `render` benutzerabhängig anhängt.
+        """
+        h = hashlib.blake2b(self.digest, digest_size=16)
+        h.update(user_id.bytes)
+        for post_id in self.post_ids:
+            kind = reactions.get(post_id)
+            if kind:
+                h.update(post_id.bytes + kind.encode("ascii"))
+        return f'"{h.hexdigest()}"'
+
+    def render(self, user_id: uuid.UUID, reactions: dict) -> bytes:
+        """Fertige Antwort für einen User: gemeinsamer Teil + is_owner/is_liked/is_disliked."""
+        parts = []
+        for fragment, post_id, owner_id in zip(self.fragments, self.post_ids, self.owner_ids):
+            kind = reactions.get(post_id)
+            parts.append(
+                fragment
+                + b',"is_owner":' + (b"true" if owner_id == user_id else b"false")
+                + b',"is_liked":' + (b"true" if kind == "like" else b"false")
+                + b',"is_disliked":' + (b"true" if kind == "dislike" else b"false")
+                + b"}"
+            )
+        return b'{"posts":[' + b",".join(parts) + self.tail + b',"since":' + dumps(self.since) + b"}"
+
+
+class FeedCache:
+    """
+    Begrenzter TTL/LRU-Cache für `FeedPage`s mit Treffer-/Fehlzählern.
+    - `generation` steigt bei jeder Invalidierung. Wer eine Seite aus der DB baut, merkt sich
+      die Generation vorher; `put` verwirft das Ergebnis, wenn inzwischen invalidiert wurde
+      (sonst könnte eine veraltete Seite nach dem Schreibzugriff im Cache landen).
+    """
+
+    def __init__(
+        self,
+        ttl: float = FEED_CACHE_TTL,
+        max_entries: int = FEED_CACHE_MAX_ENTRIES,
+        max_bytes: int = FEED_CACHE_MAX_BYTES,
+        enabled: bool = FEED_CACHE_ENABLED,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, tuple[float, FeedPage]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: tuple) -> Optional[FeedPage]:
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, page: FeedPage, generation: int) -> None:
+        if not self.enabled or generation != self.generation or page.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, page)
+        self._bytes += page.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_all(self) -> None:
+        """Neuer oder gelöschter Post: alle Seitengrenzen können sich verschoben haben."""
+        self.generation += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def invalidate_post(self, post_id: uuid.UUID) -> None:
+        """Kommentar oder Reaktion: nur Seiten verwerfen, die diesen Post enthalten."""
+        self.generation += 1
+        for key in [k for k, (_, page) in self._entries.items() if post_id in page.post_ids]:
+            self._remove(key)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key: tuple) -> None:
+        _, page = self._entries.pop(key)
+        self._bytes -= page.size
@@ -0,0 +1,353 @@
+"""
+Beschreibung:
+- Messwerte für den Betrieb: Latenz je Route, SQL-Statements und -Zeit je Request,
+  Dauer der Speicher-Aufrufe (ImageKit/lokal) und Antwortgrößen.
+- `MetricsMiddleware`: ASGI-Middleware, die jeden Request misst und optional einen
+  `Server-Timing`-Header anhängt (METRICS_SERVER_TIMING=1).
+- `render()` liefert alles im Prometheus-Textformat für GET /metrics.
+
+Für Anfänger:
+- Ein Histogramm zählt Messwerte in "Eimern" (buckets): wie viele Requests waren schneller als
+  5 ms, 10 ms, 25 ms, ... Daraus berechnet Prometheus z. B. das 95. Perzentil (p95).
+- Gemessen wird je Route-Vorlage (`/post/{post_id}/comments`), nicht je konkreter URL –
+  sonst gäbe es für jede Post-ID eine eigene Zeitreihe.
+- Während eines Requests sammelt ein `RequestTiming` (in einer ContextVar) die Zeit der
+  einzelnen Abschnitte ("db", "storage", "spool"). SQL wird über SQLAlchemy-Engine-Events
+  gemessen, ohne die Endpunkte anzufassen; SQL von Hintergrund-Tasks (Upload-Worker,
+  Reaktions-Aggregator) zählt nur in den globalen DB-Metriken.
+- Server-Timing zeigt die Aufteilung im Browser (DevTools → Network → Timing) oder mit
+  `curl -i`. Der Header wird vor dem Body gesendet und enthält daher nur die Zeit bis dahin.
+- Jeder Worker-Prozess zählt für sich. Bei mehreren Workern liefert /metrics die Werte des
+  Workers, der die Anfrage gerade bekommt; für Prometheus die Worker einzeln abfragen oder
+  einen Worker pro Container betreiben.
+"""
+
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# "1" = Requests messen (Standard), "0" = Middleware reicht nur durch.
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1") == "1"
+# "1" = Server-Timing-Header an jede Antwort hängen (verrät Interna, daher Standard aus).
+METRICS_SERVER_TIMING: bool = os.getenv("METRICS_SERVER_TIMING", "0") == "1"
+# Wenn gesetzt, verlangt GET /metrics den Header "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+# Routen ohne Latenz-/Größenmessung (kommagetrennt). /events ist ein Dauer-Stream und
+# /admin/profile dauert absichtlich Sekunden: beides würde die Histogramme verzerren.
+METRICS_EXCLUDE_ROUTES: set[str] = {
+    r.strip() for r in os.getenv("METRICS_EXCLUDE_ROUTES", "/metrics,/events,/admin/profile").split(",") if r.strip()
+}
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Eimergrenzen (obere Grenzen; +Inf kommt automatisch dazu)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Label für Requests, zu denen keine Route passt (404) – begrenzt die Zahl der Zeitreihen
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Zähler, der nur wächst (z. B. Anzahl Requests je Route und Status)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Histogram:
+    """
+    Histogramm mit festen Eimern. Gespeichert wird je Label-Kombination die Anzahl pro Eimer
+    (nicht kumuliert), die Summe und die Anzahl; `samples` kumuliert erst bei der Ausgabe.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            # [Zähler je Eimer (+Inf am Ende), Summe, Anzahl]
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> Iterable[str]:
+        bounds = self.buckets + (float("inf"),)
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {count}"
+
+
+class Registry:
+    """
+    Sammlung aller Metriken plus "Collector"-Funktionen für Werte, die anderswo gezählt werden
+    (Feed-Cache, Event-Hub, Upload-Queue). Ein Collector liefert Tupel
+    (name, typ, hilfetext, wert) und wird erst beim Abruf von /metrics aufgerufen.
+    """
+
+    def __init__(self):
+        self._metrics: list = []
+        self._collectors: list[Callable[[], Iterable[tuple]]] = []
+
+    def counter(self, name: str, help: str, labels: tuple = ()) -> Counter:
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[tuple]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> bytes:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            for name, kind, help, value in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_number(value)}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "Anzahl Requests je Route und Statuscode.", ("method", "route", "status")
+)
+http_duration = registry.histogram(
+    "http_request_duration_seconds", "Dauer bis zum letzten Byte der Antwort.", ("method", "route")
+)
+http_response_size = registry.histogram(
+    "http_response_size_bytes", "Größe des Antwort-Bodys.", ("method", "route"), SIZE_BUCKETS
+)
+http_sql_statements = registry.histogram(
+    "http_request_sql_statements", "SQL-Statements je Request.", ("method", "route"), COUNT_BUCKETS
+)
+http_phase_duration = registry.histogram(
+    "http_request_phase_duration_seconds",
+    "Zeit je Abschnitt eines Requests (db, storage, spool), summiert über den Request.",
+    ("method", "route", "phase"),
+)
+db_statement_duration = registry.histogram(
+    "db_statement_duration_seconds",
+    "Dauer einzelner SQL-Statements (alle, auch aus Hintergrund-Tasks).",
+    ("engine", "operation"),
+)
+storage_call_duration = registry.histogram(
+    "storage_call_duration_seconds",
+    "Dauer der Aufrufe ans Speicher-Backend (ImageKit oder lokal).",
+    ("backend", "operation", "outcome"),
+)
+
+
+# -----------------------------------------------------------------------------
+# Zeiten je Request
+# -----------------------------------------------------------------------------
+class RequestTiming:
+    """Sammelt während eines Requests die Zeiten der Abschnitte und die Zahl der SQL-Statements."""
+
+    __slots__ = ("start", "sql_statements", "phases")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_statements = 0
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """Header-Wert, z. B. 'app;dur=12.3, db;dur=4.1;desc="7 queries"'."""
+        parts = [f"app;dur={(time.perf_counter() - self.start) * 1000:.1f}"]
+        for phase, seconds in self.phases.items():
+            entry = f"{phase};dur={seconds * 1000:.1f}"
+            if phase == "db":
+                entry += f';desc="{self.sql_statements} queries"'
+            parts.append(entry)
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """Misst einen Abschnitt des aktuellen Requests (außerhalb eines Requests: keine Wirkung)."""
+    timing = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timing is not None:
+            timing.add(name, time.perf_counter() - start)
+
+
+@contextmanager
+def storage_call(backend: str, operation: str):
+    """Misst einen Aufruf ans Speicher-Backend: Histogramm + Abschnitt "storage" des Requests."""
+    timing = _current.get()
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        seconds = time.perf_counter() - start
+        storage_call_duration.observe(seconds, backend, operation, outcome)
+        if timing is not None:
+            timing.add("storage", seconds)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Hängt Zeitmessung an alle SQL-Statements einer (Async-)Engine.
+    Die Startzeit liegt am Ausführungskontext des Statements, daher auch bei parallelen
+    Verbindungen eindeutig.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        db_statement_duration.observe(seconds, name, operation)
+        timing = _current.get()
+        if timing is not None:
+            timing.sql_statements += 1
+            timing.add("db", seconds)
+
+
+# -----------------------------------------------------------------------------
+# ASGI-Middleware
+# -----------------------------------------------------------------------------
+def route_label(scope) -> str:
+    """
+    Route-Vorlage eines Requests, z. B. "/post/{post_id}/comments".
+    Die Pfadparameter werden im konkreten Pfad wieder durch ihre Namen ersetzt. `route.path`
+    allein reicht nicht: bei eingebundenen Routern (include_router mit prefix) fehlt dort das Präfix.
+    """
+    if scope.get("route") is None:
+        return UNMATCHED_ROUTE
+    names = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    return "/".join("{%s}" % names[s] if s in names else s for s in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    """
+    Misst jeden HTTP-Request: Dauer bis zum letzten Body-Byte, Statuscode, Antwortgröße,
+    SQL-Statements und Abschnittszeiten. Reine ASGI-Middleware (keine BaseHTTPMiddleware),
+    damit Streaming-Antworten (Medien, /events) unverändert durchlaufen.
+    """
+
+    def __init__(self, app, server_timing: bool = METRICS_SERVER_TIMING, enabled: bool = METRICS_ENABLED):
+        self.app = app
+        self.server_timing = server_timing
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            # Der Router trägt Route und Pfadparameter in den Scope ein (nach dem Aufruf verfügbar)
+            route = route_label(scope)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            if route not in METRICS_EXCLUDE_ROUTES:
+                http_duration.observe(time.perf_counter() - timing.start, method, route)
+                http_response_size.observe(size, method, route)
+                http_sql_statements.observe(timing.sql_statements, method, route)
+                for name, seconds in timing.phases.items():
+                    http_phase_duration.observe(seconds, method, route, name)
+
+
+def render() -> bytes:
+    """Alle Metriken im Prometheus-Textformat."""
+    return registry.render()
@@ -0,0 +1,38 @@
+"""
+Beschreibung:
+- Hilfsfunktionen rund um Alembic (Schema-Migrationen).
+- `alembic_config()` baut die Konfiguration mit absoluten Pfaden, damit Migrationen
+  unabhängig vom aktuellen Arbeitsverzeichnis funktionieren.
+- `upgrade_head()` entspricht `alembic upgrade head`.
+
+Für Anfänger:
+- Eine Migration beschreibt eine Schemaänderung (Tabelle, Spalte, Index) als Python-Code.
+- Alembic merkt sich in der Tabelle `alembic_version`, welche Migrationen schon gelaufen sind.
+- Neue Migration anlegen:  alembic revision --autogenerate -m "beschreibung"
+- Migrationen anwenden:    alembic upgrade head
+"""
+
+import os
+
+from alembic import command
+from alembic.config import Config
+
+# Projektwurzel (eine Ebene über backend/)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config() -> Config:
+    """Alembic-Konfiguration aus alembic.ini, mit absolutem Pfad zum Migrationsordner."""
+    cfg = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(PROJECT_ROOT, "migrations"))
+    return cfg
+
+
+def upgrade_head() -> None:
+    """
+    Wendet alle ausstehenden Migrationen an (blockierend).
+    Beim Aufruf aus der App bleibt deren Logging-Konfiguration unangetastet.
+    """
+    cfg = alembic_config()
+    cfg.attributes["configure_logger"] = False
+    command.upgrade(cfg, "head")
@@ -0,0 +1,118 @@
+"""
+Beschreibung:
+- Write-Behind-Aggregation der Reaktionszähler (Likes/Dislikes).
+- Reaktions-Endpunkte schreiben Zähleränderungen nur als neue Zeilen in `reaction_events`.
+- `ReactionAggregator` faltet diese Zeilen in festen Abständen in Post.likes/Post.dislikes.
+- Lesende Endpunkte addieren die noch offenen Änderungen in derselben Abfrage zu den Zählern
+  (`counter_columns`).
+
+Für Anfänger:
+- Ein UPDATE auf dieselbe Zeile (Zähler eines beliebten Posts) lässt alle Schreiber
+  nacheinander warten. Ein INSERT in ein Log braucht diese Zeile nicht.
+- Das Aufräumen passiert gesammelt: viele +1/-1 werden zu einem UPDATE pro Post.
+- DELETE ... RETURNING holt und entfernt die Einträge in einem Schritt. Laufen mehrere
+  Worker-Prozesse, kann so kein Eintrag doppelt gezählt werden.
+- Zähler und offene Änderungen müssen aus EINER Abfrage kommen: Zwei getrennte SELECTs sehen
+  je einen eigenen Stand der Datenbank. Läuft der Aggregator dazwischen, wären die Einträge
+  schon gelöscht, aber noch nicht im gelesenen Zähler – die Anzeige zählte zu wenig.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+
+from backend.database import Post, ReactionEvent, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# Sekunden zwischen zwei Aggregationsläufen.
+REACTION_AGGREGATE_INTERVAL: float = float(os.getenv("REACTION_AGGREGATE_INTERVAL", "2.0"))
+# Höchstens so viele Log-Einträge pro Lauf (begrenzt Transaktionsdauer und Speicher).
+REACTION_AGGREGATE_BATCH: int = int(os.getenv("REACTION_AGGREGATE_BATCH", "10000"))
+
+
+def counter_columns() -> tuple:
+    """
+    Spalten "likes" und "dislikes" für ein SELECT auf Post: aggregierter Zähler plus noch nicht
+    eingerechnete Änderungen (korrelierte Unterabfragen über den Index auf reaction_events.post_id).
+    """
+    def pending(delta):
+        return (
+            select(func.coalesce(func.sum(delta), 0))
+            .where(ReactionEvent.post_id == Post.id)
+            .scalar_subquery()
+        )
+
+    return (
+        (Post.likes + pending(ReactionEvent.like_delta)).label("likes"),
+        (Post.dislikes + pending(ReactionEvent.dislike_delta)).label("dislikes"),
+    )
+
+
+async def aggregate_once(batch: int = REACTION_AGGREGATE_BATCH) -> int:
+    """
+    Faltet bis zu `batch` Log-Einträge in die Post-Zähler (eine Transaktion).
+    Liefert die Anzahl verarbeiteter Einträge.
+    """
+    async with async_session_maker() as session:
+        oldest = select(ReactionEvent.id).order_by(ReactionEvent.id).limit(batch)
+        result = await session.execute(
+            delete(ReactionEvent)
+            .where(ReactionEvent.id.in_(oldest))
+            .returning(ReactionEvent.post_id, ReactionEvent.like_delta, ReactionEvent.dislike_delta)
+        )
+        rows = result.all()
+        if not rows:
+            await session.rollback()
+            return 0
+
+        totals = defaultdict(lambda: [0, 0])
+        for post_id, like_delta, dislike_delta in rows:
+            totals[post_id][0] += like_delta
+            totals[post_id][1] += dislike_delta
+
+        for post_id, (likes, dislikes) in totals.items():
+            if likes or dislikes:
+                await session.execute(
+                    update(Post)
+                    .where(Post.id == post_id)
+                    .values(likes=Post.likes + likes, dislikes=Post.dislikes + dislikes)
+                )
+        await session.commit()
+        return len(rows)
+
+
+class ReactionAggregator:
+    """
+    Hintergrund-Task, der `aggregate_once` alle `interval` Sekunden ausführt.
+    `stop()` beendet den Task und rechnet verbleibende Einträge noch ein.
+    """
+
+    def __init__(self, interval: float = REACTION_AGGREGATE_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="reaction-aggregator")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while await aggregate_once():
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                # Bei großem Rückstand direkt weitermachen, bis der Batch nicht mehr voll ist
+                while await aggregate_once() >= REACTION_AGGREGATE_BATCH:
+                    pass
+            except Exception:
+                logger.exception("Reaction counter aggregation failed")
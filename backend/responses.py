@@ -0,0 +1,33 @@
+"""
+Beschreibung:
+- Schnelle JSON-Serialisierung mit orjson für die großen Antworten (Feed, Kommentare).
+- `ORJSONResponse`: Response-Klasse, die ihren Inhalt direkt mit orjson in Bytes wandelt.
+
+Für Anfänger:
+- FastAPI wandelt zurückgegebene Dicts normalerweise erst mit `jsonable_encoder` in reine
+  Python-Grundtypen um und serialisiert danach. Bei 1000 Posts kostet das spürbar CPU.
+- orjson kann UUID und datetime direkt schreiben; `str(uuid)` und `isoformat()` pro Zeile
+  entfallen. Die Form der Antworten beschreiben die Pydantic-Modelle in `backend/schemas.py`.
+- Gibt ein Endpunkt ein Response-Objekt zurück, überspringt FastAPI die eigene Serialisierung.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+
+# Dict-Schlüssel dürfen auch UUIDs sein (z. B. {post_id: [...]}); sie werden zu Strings.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(value: Any) -> bytes:
+    """Kompaktes JSON als Bytes (UUID/datetime nativ, ohne Leerzeichen)."""
+    return orjson.dumps(value, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(Response):
+    """JSON-Antwort, serialisiert mit orjson."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
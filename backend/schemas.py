@@ -14,6 +14,10 @@ Für Anfänger:
 # Pydantic stellt BaseModel bereit: Damit definierst du klare, typgeprüfte Datenobjekte.
 from pydantic import BaseModel
 
+# Zeitstempel und optionale Felder in den Antwortmodellen
+from datetime import datetime
+from typing import Optional
+
 # fastapi-users bringt vorgefertigte Schemas für User mit (lesen, erstellen, aktualisieren).
 from fastapi_users import schemas
 
@@ -22,32 +26,73 @@ from fastapi_users import schemas
 import uuid
 
 
-class PostCreate(BaseModel):
+class CommentOut(BaseModel):
     """
-    Schema für das Anlegen eines Posts.
-    Dieses Modell wird typischerweise als Request-Body bei "POST /post" verwendet.
+    Ein Kommentar in API-Antworten (GET /post/{id}/comments, GET /comments, GET /feed?comments=N).
     """
-    # Titel des Posts. Pflichtfeld (str).
-    title: str
+    id: uuid.UUID
+    post_id: uuid.UUID
+    user_id: uuid.UUID
+    text: str
+    created_at: Optional[datetime]
+    # E-Mail des Autors ("Unknown", falls der User nicht mehr existiert)
+    author: str
+
 
-    # Inhalt/Text des Posts. Pflichtfeld (str).
-    content: str
+class FeedPostOut(BaseModel):
+    """
+    Ein Post im Feed.
+    - is_owner / is_liked / is_disliked beziehen sich auf den eingeloggten User.
+    - comment_count / comments nur bei GET /feed?comments=N.
+    Hinweis: `file_type` enthält (wie bisher) den Dateinamen.
+    """
+    id: uuid.UUID
+    user_id: uuid.UUID
+    caption: Optional[str]
+    url: str
+    file_type: str
+    created_at: Optional[datetime]
+    email: str
+    likes: int
+    dislikes: int
+    is_owner: bool
+    is_liked: bool
+    is_disliked: bool
+    comment_count: Optional[int] = None
+    comments: Optional[list[CommentOut]] = None
+
+
+class FeedResponse(BaseModel):
+    """
+    Antwort von GET /feed: eine Seite Posts, der Cursor für die nächste Seite (oder None)
+    und der Marker für spätere Delta-Abfragen (?since=).
+    """
+    posts: list[FeedPostOut]
+    next_cursor: Optional[str]
+    since: Optional[str] = None
 
 
-class PostResponse(BaseModel):
+class FeedDeltaResponse(BaseModel):
     """
-    Schema für die Antwort eines Endpunkts, der einen Post zurückliefert.
-    In einfachen Fällen spiegelt es PostCreate wider.
-    Hinweis:
-    - Hier sind nur title und content enthalten.
-    - Optional könntest du in der Zukunft Felder wie id, created_at ergänzen.
-      (Hier NICHT getan, da die Logik unverändert bleiben soll.)
+    Antwort von GET /feed?since=...: seit dem Marker neue Posts (neueste zuerst), IDs der
+    seitdem gelöschten Posts und der neue Marker.
+    `reset=True`: Delta nicht möglich (Marker zu alt oder zu viele neue Posts) – Feed neu laden.
     """
-    # Titel des Posts.
-    title: str
+    posts: list[FeedPostOut]
+    deleted: list[uuid.UUID]
+    since: str
+    reset: bool = False
+
+
+class CommentsResponse(BaseModel):
+    """Antwort von GET /post/{id}/comments (aufsteigend nach Zeit)."""
+    comments: list[CommentOut]
+
 
-    # Inhalt/Text des Posts.
-    content: str
+class CommentsBatchResponse(BaseModel):
+    """Antwort von GET /comments: neueste Kommentare und Gesamtzahl je angefragtem Post."""
+    comments: dict[uuid.UUID, list[CommentOut]]
+    counts: dict[uuid.UUID, int]
 
 
 class UserRead(schemas.BaseUser[uuid.UUID]):
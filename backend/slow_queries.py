@@ -0,0 +1,245 @@
+"""
+Beschreibung:
+- Opt-in-Log für langsame SQL-Statements (SLOW_QUERY_MS > 0).
+- Jedes Statement über der Schwelle wird mit seinen Parametern geloggt; unter SQLite kommt der
+  Ausführungsplan (`EXPLAIN QUERY PLAN`) dazu, vollständige Tabellen-Scans werden markiert.
+- Alle SLOW_QUERY_REPORT_INTERVAL Sekunden erscheint ein Bericht mit den SLOW_QUERY_TOP_N
+  Statements, die insgesamt am meisten Zeit gekostet haben.
+
+Für Anfänger:
+- Gemessen wird über SQLAlchemy-Engine-Events (`before_cursor_execute`/`after_cursor_execute`),
+  also für alle Statements – auch die von fastapi-users und den Hintergrund-Tasks.
+- SQLAlchemy schickt Statements mit Platzhaltern (`?`). Gleiche Abfragen haben daher denselben
+  Text und werden im Bericht zusammengefasst, egal mit welchen Werten sie liefen.
+- "SCAN posts" im Plan heißt: SQLite liest die ganze Tabelle, weil kein passender Index da ist.
+  "SEARCH posts USING INDEX ..." ist der gewünschte Fall. "USE TEMP B-TREE" heißt: das Ergebnis
+  wird nachträglich sortiert/gruppiert, statt die Reihenfolge eines Index zu nutzen.
+- Der Plan wird pro Statement-Text nur einmal ermittelt (EXPLAIN führt die Abfrage nicht aus,
+  kostet aber trotzdem eine Runde zur Datenbank).
+- Parameter können personenbezogene Daten enthalten (z. B. E-Mail-Adressen; Passwort-Hashes
+  werden ersetzt). Für Produktion ggf. SLOW_QUERY_LOG_PARAMS=0 setzen.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# Schwelle in Millisekunden; 0 (Standard) = aus.
+SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "0"))
+# "1" = unter SQLite den Ausführungsplan langsamer Statements ermitteln und loggen.
+SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1"
+# "1" = gebundene Parameter mitloggen (gekürzt).
+SLOW_QUERY_LOG_PARAMS: bool = os.getenv("SLOW_QUERY_LOG_PARAMS", "1") == "1"
+# Sekunden zwischen zwei Top-N-Berichten und Anzahl Statements pro Bericht.
+SLOW_QUERY_REPORT_INTERVAL: float = float(os.getenv("SLOW_QUERY_REPORT_INTERVAL", "300"))
+SLOW_QUERY_TOP_N: int = int(os.getenv("SLOW_QUERY_TOP_N", "10"))
+# Höchstens so viele verschiedene Statements pro Berichtszeitraum (und gemerkte Pläne).
+SLOW_QUERY_MAX_STATEMENTS: int = int(os.getenv("SLOW_QUERY_MAX_STATEMENTS", "500"))
+
+# Statements, für die EXPLAIN QUERY PLAN etwas Sinnvolles liefert
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+# "SCAN posts" (SQLite >= 3.36) bzw. "SCAN TABLE posts" (ältere Versionen), ohne "USING ... INDEX"
+FULL_SCAN_RE = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+# Länge, auf die Statements und Parameter im Log gekürzt werden
+MAX_TEXT = 300
+# Werte mit diesen Anfängen sind Passwort-Hashes und landen nicht im Log
+PASSWORD_HASH_PREFIXES = ("$argon2", "$2a$", "$2b$", "$2y$")
+
+
+def _shorten(text: str, limit: int = MAX_TEXT) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _format_params(parameters) -> str:
+    """
+    Parameter lesbar machen: 16-Byte-BLOBs (UUID-Spalten unter SQLite) als UUID,
+    Passwort-Hashes (argon2/bcrypt, z. B. beim Registrieren) nur als Platzhalter.
+    """
+    def one(value):
+        if isinstance(value, (bytes, memoryview)) and len(value) == 16:
+            return str(uuid.UUID(bytes=bytes(value)))
+        if isinstance(value, str) and value.startswith(PASSWORD_HASH_PREFIXES):
+            return "<password hash>"
+        return value
+
+    if isinstance(parameters, (list, tuple)):
+        parameters = type(parameters)(one(v) for v in parameters)
+    elif isinstance(parameters, dict):
+        parameters = {k: one(v) for k, v in parameters.items()}
+    return _shorten(repr(parameters))
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    """Tabellen, die laut Plan komplett gelesen werden."""
+    return [m.group(1) for m in map(FULL_SCAN_RE.match, plan) if m]
+
+
+@dataclass
+class StatementStats:
+    """Langsame Ausführungen eines Statement-Textes im aktuellen Berichtszeitraum."""
+    engine: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last_params: str = ""
+    plan: list[str] = field(default_factory=list)
+
+
+class SlowQueryLog:
+    """
+    Sammelt langsame Statements und schreibt sie ins Log.
+    - `instrument(engine, name)`: Zeitmessung an eine (Async-)Engine hängen (nur wenn aktiv).
+    - `start()`/`stop()`: Hintergrund-Task für den regelmäßigen Top-N-Bericht; `stop()` schreibt
+      den letzten Bericht.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        explain: bool = SLOW_QUERY_EXPLAIN,
+        log_params: bool = SLOW_QUERY_LOG_PARAMS,
+        interval: float = SLOW_QUERY_REPORT_INTERVAL,
+        top_n: int = SLOW_QUERY_TOP_N,
+        max_statements: int = SLOW_QUERY_MAX_STATEMENTS,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.log_params = log_params
+        self.interval = interval
+        self.top_n = top_n
+        self.max_statements = max_statements
+        self._stats: dict[str, StatementStats] = {}
+        self._plans: dict[str, list[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def instrument(self, engine, name: str) -> None:
+        if not self.enabled:
+            return
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context._slow_query_start = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            start = getattr(context, "_slow_query_start", None)
+            if start is None:
+                return
+            seconds = time.perf_counter() - start
+            if seconds >= self.threshold:
+                self.record(conn, name, statement, parameters, executemany, seconds)
+
+    def record(self, conn, engine_name: str, statement: str, parameters, executemany: bool, seconds: float) -> None:
+        """Ein langsames Statement loggen und für den Bericht zählen."""
+        plan = self._plan(conn, statement, parameters, executemany)
+        params = ("executemany" if executemany else _format_params(parameters)) if self.log_params else ""
+        # Bei vollem Zeitraum werden neue Statements nur noch geloggt, nicht mehr gezählt
+        stats = self._stats.get(statement)
+        if stats is None and len(self._stats) < self.max_statements:
+            stats = self._stats[statement] = StatementStats(engine=engine_name, plan=plan)
+        if stats is not None:
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.last_params = params
+
+        message = "Slow query (%.1f ms, %s): %s"
+        args = [seconds * 1000, engine_name, _shorten(statement)]
+        if self.log_params:
+            message += " | params: %s"
+            args.append(params)
+        if plan:
+            message += " | plan: %s"
+            args.append(" / ".join(plan))
+        if scans := full_scans(plan):
+            message += " | FULL SCAN: %s"
+            args.append(", ".join(scans))
+        logger.warning(message, *args)
+
+    def _plan(self, conn, statement: str, parameters, executemany: bool) -> list[str]:
+        """
+        Ausführungsplan (Spalte "detail" von EXPLAIN QUERY PLAN), je Statement-Text einmal.
+        Läuft über den rohen DB-API-Cursor derselben Verbindung, damit die Engine-Events
+        nicht erneut auslösen und der Plan dieselbe Transaktion sieht.
+        """
+        if not self.explain or executemany or conn.dialect.name != "sqlite":
+            return []
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return []
+        plan = self._plans.get(statement)
+        if plan is not None:
+            return plan
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            plan = [row[3] for row in cursor.fetchall()]
+        except Exception:
+            logger.debug("EXPLAIN QUERY PLAN failed for %s", _shorten(statement), exc_info=True)
+            plan = []
+        finally:
+            cursor.close()
+        if len(self._plans) >= self.max_statements:
+            self._plans.clear()
+        self._plans[statement] = plan
+        return plan
+
+    def report(self) -> Optional[str]:
+        """Top-N-Bericht des abgelaufenen Zeitraums (nach Gesamtzeit); setzt die Zähler zurück."""
+        stats, self._stats = self._stats, {}
+        if not stats:
+            return None
+        ranked = sorted(stats.items(), key=lambda item: item[1].total, reverse=True)[: self.top_n]
+        lines = [f"Slow query report: {sum(s.count for s in stats.values())} slow executions, "
+                 f"{len(stats)} statements (top {len(ranked)} by total time)"]
+        for rank, (statement, s) in enumerate(ranked, 1):
+            scans = full_scans(s.plan)
+            flags = f" FULL SCAN: {', '.join(scans)}" if scans else ""
+            lines.append(
+                f"{rank:>3}. {s.count}x total {s.total * 1000:.1f} ms, max {s.max * 1000:.1f} ms, "
+                f"{s.engine}{flags}: {_shorten(statement)}"
+            )
+        return "\n".join(lines)
+
+    async def start(self) -> None:
+        if self.enabled and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="slow-query-report")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._log_report()
+
+    def _log_report(self) -> None:
+        text = self.report()
+        if text:
+            logger.warning(text)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._log_report()
+
+
+# Gemeinsame Instanz: in backend/database.py an die Engines gehängt, im lifespan-Hook gestartet
+slow_query_log = SlowQueryLog()
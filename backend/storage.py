@@ -0,0 +1,132 @@
+"""
+Beschreibung:
+- Austauschbares Speicher-Backend für Medien (Upload, Löschen, URL-Erzeugung).
+- Zwei Implementierungen:
+    * ImageKitStorage (backend/storage_imagekit.py): echter Dienst mit CDN
+    * LocalStorage (hier): Dateien im lokalen Verzeichnis, ausgeliefert über GET /media/{name}
+- Auswahl per Umgebungsvariable STORAGE_BACKEND ("imagekit" oder "local").
+
+Für Anfänger:
+- Die API kennt nur die Schnittstelle `StorageBackend`. Welcher Speicher dahinter steckt,
+  entscheidet die Konfiguration. So lassen sich Upload und Feed ohne Netzwerk messen.
+- Alle Methoden sind blockierend (synchron) und werden von der API im Upload-Thread-Pool ausgeführt.
+"""
+
+import errno
+import mmap
+import os
+import shutil
+import uuid
+import urllib.parse
+from dataclasses import dataclass
+from typing import Optional
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# Welches Backend genutzt wird: "imagekit" (Standard) oder "local".
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "imagekit")
+# Ablageverzeichnis für LocalStorage.
+STORAGE_LOCAL_DIR: str = os.getenv("STORAGE_LOCAL_DIR", "./media")
+# Öffentliche Basis-URL, unter der das Backend erreichbar ist (für /media/{name}-Links).
+STORAGE_PUBLIC_URL: str = os.getenv("STORAGE_PUBLIC_URL", "http://localhost:8000").rstrip("/")
+
+
+@dataclass
+class StoredFile:
+    """Ergebnis eines Uploads: öffentliche URL, gespeicherter Name und Backend-ID (zum Löschen)."""
+    url: str
+    name: str
+    file_id: str
+
+
+class StorageBackend:
+    """Schnittstelle für Medien-Speicher."""
+
+    def upload(self, path: str, file_name: str) -> StoredFile:
+        """
+        Lädt die lokale Datei `path` unter dem Wunschnamen `file_name` hoch.
+        `path` ist eine temporäre Spool-Datei: das Backend darf sie verschieben statt kopieren.
+        """
+        raise NotImplementedError
+
+    def delete(self, file_id: str) -> None:
+        """Löscht eine zuvor hochgeladene Datei anhand ihrer Backend-ID."""
+        raise NotImplementedError
+
+    def url(self, name: str) -> str:
+        """Baut die öffentliche URL für einen gespeicherten Dateinamen."""
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """
+    Speichert Dateien in einem lokalen Verzeichnis.
+    - Eindeutige Namen: "<uuid>_<originalname>" (wie use_unique_file_name bei ImageKit).
+    - Upload = Spool-Datei per `os.replace` an ihren Platz schieben (nur ein Eintrag im
+      Verzeichnis ändert sich, die Daten werden nicht ein zweites Mal geschrieben). Liegen
+      Spool- und Ablageverzeichnis auf verschiedenen Dateisystemen, wird kopiert.
+    - Auslieferung über `open_mapped` (mmap): der Kernel liefert die Seiten direkt
+      aus dem Page-Cache, ohne die Datei vorab komplett in Python-Speicher zu lesen.
+    """
+
+    def __init__(self, root: str = STORAGE_LOCAL_DIR, public_url: str = STORAGE_PUBLIC_URL):
+        self.root = root
+        self.public_url = public_url
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, name: str) -> Optional[str]:
+        """Sicherer Pfad innerhalb von `root`; None bei Pfad-Tricks wie "../"."""
+        if not name or os.path.basename(name) != name or name in (".", ".."):
+            return None
+        return os.path.join(self.root, name)
+
+    def upload(self, path: str, file_name: str) -> StoredFile:
+        name = f"{uuid.uuid4().hex}_{os.path.basename(file_name or 'upload')}"
+        target = os.path.join(self.root, name)
+        try:
+            os.replace(path, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:  # EXDEV: anderes Dateisystem, Umbenennen nicht möglich
+                raise
+            shutil.copyfile(path, target)
+        return StoredFile(url=self.url(name), name=name, file_id=name)
+
+    def delete(self, file_id: str) -> None:
+        path = self._path(file_id)
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+    def url(self, name: str) -> str:
+        return f"{self.public_url}/media/{urllib.parse.quote(name)}"
+
+    def open_mapped(self, name: str) -> Optional[mmap.mmap | bytes]:
+        """
+        Öffnet eine gespeicherte Datei als schreibgeschützte Speicherabbildung.
+        Liefert None, wenn die Datei fehlt. Leere Dateien lassen sich nicht mappen
+        und liefern stattdessen b"".
+        """
+        path = self._path(name)
+        if not path or not os.path.isfile(path):
+            return None
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """Liefert das konfigurierte Speicher-Backend (einmalig erzeugt, danach wiederverwendet)."""
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "local":
+            _storage = LocalStorage()
+        elif STORAGE_BACKEND == "imagekit":
+            from backend.storage_imagekit import ImageKitStorage  # lädt das SDK nur bei Bedarf
+            _storage = ImageKitStorage()
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND!r}")
+    return _storage
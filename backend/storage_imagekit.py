@@ -1,11 +1,15 @@
 """
 Beschreibung:
-- Initialisiert einen ImageKit-Client für Datei-Uploads und URL-Erzeugung.
+- Erzeugt einen ImageKit-Client für Datei-Uploads und URL-Erzeugung (`make_client`).
+- Stellt `ImageKitStorage` bereit, die ImageKit-Implementierung von `backend.storage.StorageBackend`.
 
 Für Anfänger:
 - Die Zugangsdaten (API-Schlüssel und URL-Endpunkt) werden aus der Umgebungsdatei `.env`
   in den Prozess geladen und anschließend aus den Umgebungsvariablen gelesen.
-- In dieser Variante wird die Logik NICHT verändert, nur ausführlich kommentiert.
+- Der Import dieses Moduls ist billig: SDK und dotenv werden erst in `make_client` geladen,
+  der Client entsteht erst mit `ImageKitStorage()` – in der API einmal im lifespan-Hook
+  (`get_storage()`), nicht schon beim `import backend.api`. Das SDK zieht u. a. `requests`
+  nach sich (rund 0,15 s); Worker und Tests mit STORAGE_BACKEND=local zahlen das nie.
 
 Voraussetzungen:
 - Eine `.env`-Datei im Projektverzeichnis mit z. B.:
@@ -17,49 +21,96 @@ Voraussetzungen:
     imagekitio     (ImageKit SDK)
 """
 
-# Lädt Umgebungsvariablen aus einer .env-Datei in den aktuellen Prozess.
-# Beispiel: Wenn in .env "FOO=bar" steht, ist danach os.getenv("FOO") -> "bar".
-from dotenv import load_dotenv
-
-# ImageKit Python SDK. Stellt die Klasse `ImageKit` bereit, die für
-# Authentifizierung, Upload und URL-Generierung verwendet wird.
-from imagekitio import ImageKit
-
 # Standardbibliothek: Zugriff auf Umgebungsvariablen wie os.getenv("NAME").
 import os
 
-# Liest die in .env definierten Variablen und setzt sie in den Prozess-Kontext.
-# Falls die Variablen bereits im OS-Umfeld gesetzt sind, überschreibt `load_dotenv`
-# diese standardmäßig nicht (abhängig von den Parametern). Hier wird die
-# Standardverwendung ohne Parameter genutzt.
-load_dotenv()
-
-# Erzeugt eine Instanz des ImageKit-Clients.
-# Die drei wichtigsten Parameter:
-#   - private_key: Geheimer Schlüssel (serverseitig verwenden, niemals im Frontend)
-#   - public_key: Öffentlicher Schlüssel (darf clientseitig vorkommen)
-#   - url_endpoint: Basis-URL deines ImageKit-Projekts (z. B. https://ik.imagekit.io/<endpoint>)
-#
-# WICHTIGER HINWEIS (nur Kommentar, keine Logikänderung):
-#   In dieser Fassung wird `url_endpoint` als reiner String "IMAGEKIT_URL" gesetzt
-#   und NICHT aus der Umgebung gelesen. Das bedeutet, der Client erhält buchstäblich
-#   den Text "IMAGEKIT_URL" statt einer echten URL. In der Praxis führt das
-#   typischerweise zu fehlerhaften URLs.
-#
-#   Üblicherweise würde man hier verwenden:
-#       url_endpoint=os.getenv("IMAGEKIT_URL")
-#   Da du explizit keine Logikänderung möchtest, bleibt es unverändert.
-imagekit = ImageKit(
-    private_key=os.getenv("IMAGEKIT_PRIVATE_KEY"),  # liest PRIVATE KEY aus .env
-    public_key=os.getenv("IMAGEKIT_PUBLIC_KEY"),    # liest PUBLIC KEY aus .env
-    url_endpoint=("IMAGEKIT_URL"),                  # HINWEIS: hier steht ein fester String, keine env-Auswertung
-)
-
-# Ab hier könntest du (in anderen Modulen) `imagekit` importieren und verwenden, z. B.:
-#   from backend.storage_imagekit import imagekit
-#   res = imagekit.upload_file(file=<bytes_or_stream>, file_name="bild.jpg")
+from backend.storage import StorageBackend, StoredFile
+
+
+def make_client():
+    """
+    Erzeugt eine Instanz des ImageKit-Clients (lädt dabei SDK und .env).
+    Wirft ValueError, wenn Schlüssel fehlen – deshalb beim Start aufrufen, nicht erst beim
+    ersten Upload.
+    """
+    # Lädt Umgebungsvariablen aus einer .env-Datei in den aktuellen Prozess.
+    # Beispiel: Wenn in .env "FOO=bar" steht, ist danach os.getenv("FOO") -> "bar".
+    from dotenv import load_dotenv
+
+    # ImageKit Python SDK. Stellt die Klasse `ImageKit` bereit, die für
+    # Authentifizierung, Upload und URL-Generierung verwendet wird.
+    from imagekitio import ImageKit
+
+    # Liest die in .env definierten Variablen und setzt sie in den Prozess-Kontext.
+    # Falls die Variablen bereits im OS-Umfeld gesetzt sind, überschreibt `load_dotenv`
+    # diese standardmäßig nicht (abhängig von den Parametern). Hier wird die
+    # Standardverwendung ohne Parameter genutzt.
+    load_dotenv()
+
+    # Die drei wichtigsten Parameter:
+    #   - private_key: Geheimer Schlüssel (serverseitig verwenden, niemals im Frontend)
+    #   - public_key: Öffentlicher Schlüssel (darf clientseitig vorkommen)
+    #   - url_endpoint: Basis-URL deines ImageKit-Projekts (z. B. https://ik.imagekit.io/<endpoint>)
+    #
+    # WICHTIGER HINWEIS (nur Kommentar, keine Logikänderung):
+    #   In dieser Fassung wird `url_endpoint` als reiner String "IMAGEKIT_URL" gesetzt
+    #   und NICHT aus der Umgebung gelesen. Das bedeutet, der Client erhält buchstäblich
+    #   den Text "IMAGEKIT_URL" statt einer echten URL. In der Praxis führt das
+    #   typischerweise zu fehlerhaften URLs.
+    #
+    #   Üblicherweise würde man hier verwenden:
+    #       url_endpoint=os.getenv("IMAGEKIT_URL")
+    #   Da du explizit keine Logikänderung möchtest, bleibt es unverändert.
+    return ImageKit(
+        private_key=os.getenv("IMAGEKIT_PRIVATE_KEY"),  # liest PRIVATE KEY aus .env
+        public_key=os.getenv("IMAGEKIT_PUBLIC_KEY"),    # liest PUBLIC KEY aus .env
+        url_endpoint=("IMAGEKIT_URL"),                  # HINWEIS: hier steht ein fester String, keine env-Auswertung
+    )
+
+# Verwendung in anderen Modulen, z. B.:
+#   from backend.storage import get_storage
+#   stored = get_storage().upload(path, "bild.jpg")
 #
 # Typische Fehlerquellen:
-# - Fehlende/verkehrte .env-Werte: os.getenv(...) gibt dann None zurück.
+# - Fehlende/verkehrte .env-Werte: os.getenv(...) gibt dann None zurück (ImageKit wirft ValueError).
 # - `url_endpoint` auf einem Literal-String statt echter URL (siehe Hinweis oben).
 # - .env versehentlich committet (Sicherheitsrisiko). Immer in .gitignore eintragen.
+
+
+# -----------------------------------------------------------------------------
+# ImageKit als Speicher-Backend (siehe backend/storage.py)
+# -----------------------------------------------------------------------------
+class ImageKitStorage(StorageBackend):
+    """
+    Speicher-Backend über einen ImageKit-Client (Standard: neu aus `make_client`).
+    - upload: Datei-Handle an das SDK übergeben (eindeutige Namen, Tag "backend-upload")
+    - delete: Datei über die ImageKit-fileId löschen
+    - url:    URL über den Client bauen (nutzt `url_endpoint`, siehe Hinweis oben)
+    """
+
+    def __init__(self, client=None):
+        self.client = client if client is not None else make_client()
+
+    def upload(self, path: str, file_name: str) -> StoredFile:
+        # Upload-Options-Klasse des ImageKit SDK (Paket ist mit dem Client schon geladen)
+        from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
+
+        # `with` schließt das Datei-Handle zuverlässig
+        with open(path, "rb") as reader:
+            result = self.client.upload_file(
+                file=reader,                      # Binär-Handle der zwischengespeicherten Datei
+                file_name=file_name,              # Zieldateiname bei ImageKit
+                options=UploadFileRequestOptions(
+                    use_unique_file_name=True,    # True = eindeutige Namen, Kollisionsschutz
+                    tags=["backend-upload"]       # Tagging zu Diagnose/Zwecken
+                )
+            )
+        if result.response_metadata.http_status_code != 200:
+            raise RuntimeError(f"ImageKit returned {result.response_metadata.http_status_code}")
+        return StoredFile(url=result.url, name=result.name, file_id=result.file_id)
+
+    def delete(self, file_id: str) -> None:
+        self.client.delete_file(file_id=file_id)
+
+    def url(self, name: str) -> str:
+        return self.client.url({"path": f"/{name}"})
@@ -0,0 +1,333 @@
+"""
+Beschreibung:
+- Asynchrone Upload-Jobs: POST /upload nimmt die Datei an, legt einen Job an und antwortet sofort.
+- Der eigentliche Transfer zu ImageKit läuft in Hintergrund-Workern (asyncio-Queue im Prozess).
+- Der Job-Zustand liegt in einem austauschbaren Speicher ("Job-Store"):
+    * MemoryJobStore: nur im RAM, geht beim Neustart verloren (Tests, Demos, nur ein Worker-Prozess)
+    * SQLJobStore: Tabelle `upload_jobs` in der App-Datenbank; offene Jobs werden beim Start fortgesetzt
+- Mehrere Worker-Prozesse: Ein Worker übernimmt einen Job nur, wenn er ihn per `claim` von
+  "pending" auf "running" setzen konnte. So läuft jeder Job genau einmal, auch wenn beim Start
+  alle Prozesse dieselben offenen Jobs einreihen.
+- Erledigte und fehlgeschlagene Jobs bleiben UPLOAD_JOB_RETENTION Sekunden für
+  GET /upload/{job_id} abrufbar und werden danach gelöscht (höchstens einmal pro Minute geprüft).
+  Jobs gelöschter Posts verschwinden mit dem Post (siehe Post.upload_jobs).
+
+Für Anfänger:
+- Eine Queue (Warteschlange) entkoppelt "Annehmen" und "Abarbeiten".
+- Mehrere Worker-Tasks holen Jobs aus der Queue und rufen die Verarbeitungsfunktion auf.
+- Die Verarbeitungsfunktion selbst (Upload + Post aktualisieren) kommt aus `backend/api.py`.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import delete, select, update
+
+from backend.database import UploadJob, async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+# Welcher Job-Store genutzt wird: "db" (Tabelle upload_jobs) oder "memory".
+UPLOAD_JOB_BACKEND: str = os.getenv("UPLOAD_JOB_BACKEND", "db")
+# Verzeichnis, in dem hochgeladene Dateien bis zur Verarbeitung liegen.
+UPLOAD_SPOOL_DIR: str = os.getenv("UPLOAD_SPOOL_DIR", "./upload_spool")
+# Maximale Anzahl wartender Jobs. Ist die Queue voll, antwortet /upload mit 503.
+UPLOAD_QUEUE_MAXSIZE: int = int(os.getenv("UPLOAD_QUEUE_MAXSIZE", "100"))
+# "1" = beim Start Jobs im Status "running" (vom letzten Lauf abgebrochen) wieder auf "pending"
+# setzen. Nur richtig, wenn kein anderer Prozess gerade Jobs bearbeitet: run_production.py
+# erledigt das einmal vor dem Start der Worker und setzt den Wert für die Worker auf "0".
+UPLOAD_REQUEUE_ON_START: bool = os.getenv("UPLOAD_REQUEUE_ON_START", "1") == "1"
+# Sekunden, die erledigte/fehlgeschlagene Jobs aufbewahrt werden (Standard: 7 Tage).
+UPLOAD_JOB_RETENTION: float = float(os.getenv("UPLOAD_JOB_RETENTION", str(7 * 24 * 3600)))
+# Mindestabstand (s) zwischen zwei Aufräumläufen der Worker
+PRUNE_INTERVAL = 60
+
+# Job-Status
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_FINISHED = (JOB_DONE, JOB_FAILED)
+
+
+class QueueFull(Exception):
+    """Die Upload-Queue ist voll; der Client soll es später erneut versuchen."""
+
+
+# -----------------------------------------------------------------------------
+# Job-Stores
+# -----------------------------------------------------------------------------
+class JobStore:
+    """
+    Schnittstelle für den Job-Speicher. Jobs sind einfache Dicts mit den Feldern
+    id, post_id, user_id, status, error, spool_path, file_name, content_type.
+    `durable`: Jobs überleben einen Neustart (offene Jobs laufen danach weiter).
+    """
+
+    durable = False
+
+    async def create(self, job: dict) -> None:
+        raise NotImplementedError
+
+    async def update(self, job_id: uuid.UUID, **fields) -> None:
+        raise NotImplementedError
+
+    async def get(self, job_id: uuid.UUID) -> Optional[dict]:
+        raise NotImplementedError
+
+    async def claim(self, job_id: uuid.UUID) -> bool:
+        """Setzt den Job von "pending" auf "running"; False, wenn ihn schon jemand übernommen hat."""
+        raise NotImplementedError
+
+    async def requeue_interrupted(self) -> int:
+        """Abgebrochene Jobs ("running") wieder auf "pending" setzen; liefert die Anzahl."""
+        raise NotImplementedError
+
+    async def unfinished(self) -> list[dict]:
+        """Jobs, die noch auf einen Worker warten (pending)."""
+        raise NotImplementedError
+
+    async def prune(self, before: datetime) -> int:
+        """Löscht erledigte/fehlgeschlagene Jobs, die zuletzt vor `before` geändert wurden."""
+        raise NotImplementedError
+
+
+class MemoryJobStore(JobStore):
+    """Job-Store im Arbeitsspeicher. Schnell, aber nicht dauerhaft."""
+
+    def __init__(self):
+        self._jobs: dict[uuid.UUID, dict] = {}
+
+    async def create(self, job: dict) -> None:
+        self._jobs[job["id"]] = dict(job, updated_at=datetime.utcnow())
+
+    async def update(self, job_id: uuid.UUID, **fields) -> None:
+        if job_id in self._jobs:
+            self._jobs[job_id].update(fields, updated_at=datetime.utcnow())
+
+    async def get(self, job_id: uuid.UUID) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def claim(self, job_id: uuid.UUID) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job["status"] != JOB_PENDING:
+            return False
+        job["status"] = JOB_RUNNING
+        return True
+
+    async def requeue_interrupted(self) -> int:
+        return 0
+
+    async def unfinished(self) -> list[dict]:
+        return []
+
+    async def prune(self, before: datetime) -> int:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in JOB_FINISHED and job["updated_at"] < before
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+
+class SQLJobStore(JobStore):
+    """Job-Store in der Tabelle `upload_jobs` (überlebt Neustarts)."""
+
+    durable = True
+
+    _FIELDS = ("id", "post_id", "user_id", "status", "error", "spool_path", "file_name", "content_type")
+
+    def _to_dict(self, row: UploadJob) -> dict:
+        return {name: getattr(row, name) for name in self._FIELDS}
+
+    async def create(self, job: dict) -> None:
+        async with async_session_maker() as session:
+            session.add(UploadJob(**{k: job.get(k) for k in self._FIELDS}))
+            await session.commit()
+
+    async def update(self, job_id: uuid.UUID, **fields) -> None:
+        async with async_session_maker() as session:
+            row = await session.get(UploadJob, job_id)
+            if row is None:
+                return
+            for key, value in fields.items():
+                setattr(row, key, value)
+            row.updated_at = datetime.utcnow()
+            await session.commit()
+
+    async def get(self, job_id: uuid.UUID) -> Optional[dict]:
+        async with async_session_maker() as session:
+            row = await session.get(UploadJob, job_id)
+            return self._to_dict(row) if row else None
+
+    async def claim(self, job_id: uuid.UUID) -> bool:
+        # Bedingtes UPDATE: von mehreren gleichzeitigen Versuchen ändert nur einer die Zeile
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(UploadJob)
+                .where(UploadJob.id == job_id, UploadJob.status == JOB_PENDING)
+                .values(status=JOB_RUNNING, updated_at=datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def requeue_interrupted(self) -> int:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(UploadJob)
+                .where(UploadJob.status == JOB_RUNNING)
+                .values(status=JOB_PENDING, updated_at=datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def unfinished(self) -> list[dict]:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(UploadJob)
+                .where(UploadJob.status == JOB_PENDING)
+                .order_by(UploadJob.created_at.asc())
+            )
+            return [self._to_dict(row) for row in result.scalars().all()]
+
+    async def prune(self, before: datetime) -> int:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                delete(UploadJob).where(UploadJob.status.in_(JOB_FINISHED), UploadJob.updated_at < before)
+            )
+            await session.commit()
+            return result.rowcount
+
+
+def make_job_store(kind: str = UPLOAD_JOB_BACKEND) -> JobStore:
+    """Erzeugt den konfigurierten Job-Store ("db" oder "memory")."""
+    if kind == "memory":
+        return MemoryJobStore()
+    if kind == "db":
+        return SQLJobStore()
+    raise ValueError(f"Unknown UPLOAD_JOB_BACKEND: {kind!r}")
+
+
+# -----------------------------------------------------------------------------
+# Queue + Worker
+# -----------------------------------------------------------------------------
+class UploadQueue:
+    """
+    In-Prozess-Warteschlange für Upload-Jobs.
+    - `submit(job)` speichert den Job im Store und reiht ihn ein (oder wirft QueueFull).
+    - `start()` startet `workers` Hintergrund-Tasks und nimmt offene Jobs aus dem Store wieder auf
+      (abgebrochene "running"-Jobs nur mit `requeue_on_start`, siehe UPLOAD_REQUEUE_ON_START).
+    - `stop()` beendet die Worker. Mit dauerhaftem Store sofort: wartende Jobs bleiben "pending",
+      abgebrochene "running" und laufen beim nächsten Start weiter. Mit MemoryJobStore gingen sie
+      verloren, daher wird dort vorher die ganze Queue abgearbeitet.
+    - Erledigte Jobs älter als `retention` Sekunden werden beim Start und danach höchstens alle
+      PRUNE_INTERVAL Sekunden (nach einem fertigen Job) gelöscht.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        process: Callable[[dict], Awaitable[None]],
+        workers: int,
+        maxsize: int = UPLOAD_QUEUE_MAXSIZE,
+        requeue_on_start: bool = UPLOAD_REQUEUE_ON_START,
+        retention: float = UPLOAD_JOB_RETENTION,
+    ):
+        self.store = store
+        self.requeue_on_start = requeue_on_start
+        self.retention = retention
+        self._last_prune = 0.0
+        self._process = process
+        self._workers = workers
+        self._maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        # Plätze, die `submit` schon vergeben hat, deren Job aber noch gespeichert wird
+        self._reserved = 0
+        self.done = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self._maxsize)
+        self._tasks = [asyncio.create_task(self._worker(), name=f"upload-worker-{i}") for i in range(self._workers)]
+        # Nach einem Neustart: unterbrochene und wartende Jobs erneut einreihen
+        if self.requeue_on_start and (count := await self.store.requeue_interrupted()):
+            logger.info("Requeued %d interrupted upload job(s)", count)
+        await self._prune()
+        for job in await self.store.unfinished():
+            logger.info("Resuming upload job %s", job["id"])
+            await self._queue.put(job)
+
+    async def stop(self) -> None:
+        if self._queue is None:
+            return
+        if not self.store.durable:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, job: dict) -> None:
+        if self._queue is None:
+            raise RuntimeError("UploadQueue not started")
+        # Platz reservieren, bevor `store.create` die Kontrolle abgibt: sonst sehen parallele
+        # Requests dieselbe freie Queue und put_nowait scheitert erst nach dem Speichern.
+        if 0 < self._maxsize <= self._queue.qsize() + self._reserved:
+            raise QueueFull()
+        self._reserved += 1
+        try:
+            await self.store.create(job)
+        finally:
+            self._reserved -= 1
+        self._queue.put_nowait(job)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "done": self.done,
+            "failed": self.failed,
+        }
+
+    async def _prune(self) -> None:
+        """Abgelaufene Jobs löschen (Fehler nur loggen: Aufräumen darf keinen Worker beenden)."""
+        self._last_prune = time.monotonic()
+        try:
+            count = await self.store.prune(datetime.utcnow() - timedelta(seconds=self.retention))
+        except Exception:
+            logger.warning("Pruning finished upload jobs failed", exc_info=True)
+            return
+        if count:
+            logger.info("Pruned %d finished upload job(s)", count)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if not await self.store.claim(job["id"]):
+                    # Schon von einem anderen Worker(-Prozess) übernommen oder erledigt – oder der
+                    # Post wurde vorher gelöscht (Job samt Zeile weg): dann die Spool-Datei entfernen
+                    if await self.store.get(job["id"]) is None and os.path.exists(job["spool_path"]):
+                        os.unlink(job["spool_path"])
+                    continue
+                await self._process(job)
+                await self.store.update(job["id"], status=JOB_DONE)
+                self.done += 1
+            except Exception as e:
+                self.failed += 1
+                logger.exception("Upload job %s failed", job["id"])
+                await self.store.update(job["id"], status=JOB_FAILED, error=str(e))
+            finally:
+                self._queue.task_done()
+            if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+                await self._prune()
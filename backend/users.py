@@ -11,19 +11,25 @@ Für Anfänger:
 """
 
 import os
+import time
 import uuid
+import asyncio
 import logging
-from typing import Optional, AsyncGenerator
+from dataclasses import dataclass
+from typing import Any, Optional, AsyncGenerator
 
-from fastapi import Depends, Request
+import jwt
+from fastapi import Depends, HTTPException, Request, status
 from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, models
 from fastapi_users.authentication import AuthenticationBackend, BearerTransport, JWTStrategy
 from fastapi_users.db import SQLAlchemyUserDatabase
+from fastapi_users.jwt import decode_jwt, generate_jwt
+from sqlalchemy import select
 
 # Diese beiden kommen aus deinem Projekt:
 #   - `User`: dein User-ORM/Pydantic-Modell (SQLAlchemy-Userklasse, die fastapi-users erwartet)
 #   - `get_user_db`: Dependency, die eine SQLAlchemyUserDatabase-Instanz liefert
-from backend.database import User, get_user_db
+from backend.database import User, get_user_db, read_session_maker
 
 # -----------------------------------------------------------------------------
 # Konfiguration und Logging
@@ -37,6 +43,14 @@ JWT_SECRET: str = os.getenv("JWT_SECRET", "dev-insecure-change-me")
 # Token-Lebensdauer in Sekunden (z. B. 3600 = 1 Stunde)
 JWT_LIFETIME_SECONDS: int = int(os.getenv("JWT_LIFETIME_SECONDS", "3600"))
 
+# Schneller Auth-Pfad für Leseendpunkte: Benutzer aus den signierten Token-Claims statt aus
+# der DB ("1" = an, Standard). "0" = überall die normale fastapi-users-Prüfung mit DB-Abfrage.
+AUTH_STATELESS: bool = os.getenv("AUTH_STATELESS", "1") == "1"
+
+# Wie oft (Sekunden) die Liste deaktivierter User aus der DB nachgeladen wird.
+# Deaktivierungen in anderen Worker-Prozessen greifen spätestens nach dieser Zeit.
+AUTH_REVOCATION_TTL: float = float(os.getenv("AUTH_REVOCATION_TTL", "30"))
+
 # Logger statt print verwenden. Ausgabe steuerst du über Log-Level und Handler.
 logger = logging.getLogger(__name__)
 
@@ -58,6 +72,20 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     async def on_after_register(self, user: User, request: Optional[Request] = None) -> None:
         logger.info("User %s has registered.", user.id)
 
+    # Nach Änderungen (z. B. PATCH /users/{id}): Deaktivierung sofort im schnellen Auth-Pfad sperren
+    async def on_after_update(
+        self, user: User, update_dict: dict[str, Any], request: Optional[Request] = None
+    ) -> None:
+        if "is_active" in update_dict:
+            if user.is_active:
+                revoked_users.restore(user.id)
+            else:
+                revoked_users.revoke(user.id)
+
+    # Gelöschte User: vorhandene Tokens in diesem Prozess sofort ungültig
+    async def on_after_delete(self, user: User, request: Optional[Request] = None) -> None:
+        revoked_users.revoke(user.id, deleted=True)
+
     # Wird nach Anforderung "Passwort vergessen" aufgerufen
     async def on_after_forgot_password(
         self, user: User, token: str, request: Optional[Request] = None
@@ -95,13 +123,32 @@ async def get_user_manager(
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
 # 2) Strategie: JWT-Strategie mit Secret und Gültigkeitsdauer
+class ClaimsJWTStrategy(JWTStrategy):
+    """
+    Wie JWTStrategy, schreibt aber zusätzlich E-Mail und Status-Flags ins Token.
+    - `read_token` (fastapi-users, Schreibendpunkte) lädt den User weiterhin aus der DB.
+    - `current_active_user_fast` (Leseendpunkte) vertraut den signierten Claims.
+    """
+
+    async def write_token(self, user: models.UP) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "email": user.email,
+            "active": user.is_active,
+            "superuser": user.is_superuser,
+            "verified": user.is_verified,
+        }
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+
 def get_jwt_strategy() -> JWTStrategy:
     """
     Liefert die JWT-Strategie, die Tokens signiert und validiert.
     - secret: Schlüssel zum Signieren
     - lifetime_seconds: wie lange ein Token gültig ist
     """
-    return JWTStrategy(secret=JWT_SECRET, lifetime_seconds=JWT_LIFETIME_SECONDS)
+    return ClaimsJWTStrategy(secret=JWT_SECRET, lifetime_seconds=JWT_LIFETIME_SECONDS)
 
 # 3) Backend: kombiniert Transport und Strategie
 auth_backend = AuthenticationBackend(
@@ -126,3 +173,117 @@ fastapi_users = FastAPIUsers[User, uuid.UUID](
 #   - `current_user()`         -> beliebiger eingeloggter User
 #   - `current_superuser()`    -> erfordert Superuser-Rechte
 current_active_user = fastapi_users.current_user(active=True)
+
+# Aktiver Superuser (Spalte is_superuser), immer mit DB-Abfrage – für Admin-Endpunkte wie
+# GET /admin/profile. Superuser werden z. B. direkt in der DB oder über PATCH /users/{id} gesetzt.
+current_superuser = fastapi_users.current_user(active=True, superuser=True)
+
+
+# -----------------------------------------------------------------------------
+# Schneller Auth-Pfad (ohne DB-Abfrage pro Request)
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class TokenUser:
+    """Benutzer aus den Token-Claims. Hat dieselben Felder wie `User`, die Endpunkte lesen."""
+    id: uuid.UUID
+    email: str
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+
+
+class RevokedUsers:
+    """
+    Kleiner In-Prozess-Cache der User-IDs, deren Tokens nicht mehr gelten.
+    - Deaktivierte User: alle `ttl` Sekunden mit einer Abfrage aus der DB nachgeladen.
+    - Gelöschte User haben keine Zeile mehr. Deshalb prüft das Nachladen zusätzlich, ob es die
+      seit dem letzten Mal in Tokens gesehenen IDs noch gibt – so wirkt eine Löschung auch in
+      Worker-Prozessen, in denen der Lösch-Hook nicht lief (spätestens nach `ttl` Sekunden).
+    - Lokale Änderungen (UserManager-Hooks) wirken sofort.
+    - Gelöschte User bleiben bis zum Prozessende gesperrt.
+    """
+
+    # Höchstens so viele IDs pro IN-Abfrage beim Existenz-Check
+    CHECK_BATCH = 500
+
+    def __init__(self, ttl: float = AUTH_REVOCATION_TTL):
+        self.ttl = ttl
+        self._inactive: set[uuid.UUID] = set()
+        self._deleted: set[uuid.UUID] = set()
+        self._seen: set[uuid.UUID] = set()
+        self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def revoke(self, user_id: uuid.UUID, deleted: bool = False) -> None:
+        (self._deleted if deleted else self._inactive).add(user_id)
+
+    def restore(self, user_id: uuid.UUID) -> None:
+        self._inactive.discard(user_id)
+
+    async def _refresh(self) -> None:
+        async with self._lock:
+            if time.monotonic() - self._loaded_at < self.ttl:
+                return  # ein paralleler Request hat schon nachgeladen
+            seen, self._seen = list(self._seen - self._deleted), set()
+            async with read_session_maker() as session:
+                result = await session.execute(select(User.id).where(User.is_active.is_(False)))
+                self._inactive = set(result.scalars().all())
+                existing: set[uuid.UUID] = set()
+                for start in range(0, len(seen), self.CHECK_BATCH):
+                    result = await session.execute(
+                        select(User.id).where(User.id.in_(seen[start:start + self.CHECK_BATCH]))
+                    )
+                    existing.update(result.scalars().all())
+            self._deleted.update(set(seen) - existing)
+            self._loaded_at = time.monotonic()
+
+    async def is_revoked(self, user_id: uuid.UUID) -> bool:
+        if user_id in self._deleted:
+            return True
+        self._seen.add(user_id)
+        if time.monotonic() - self._loaded_at >= self.ttl:
+            await self._refresh()
+        return user_id in self._inactive or user_id in self._deleted
+
+
+revoked_users = RevokedUsers()
+
+
+async def _user_from_claims(token: Optional[str] = Depends(bearer_transport.scheme)) -> TokenUser:
+    """
+    Prüft Signatur, Ablauf und Audience des Tokens und baut daraus einen `TokenUser`.
+    - Tokens ohne Claims (vor ClaimsJWTStrategy ausgestellt) werden einmalig per DB geprüft.
+    - Ungültig, deaktiviert oder gelöscht -> 401 wie bei `current_active_user`.
+    """
+    if token is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    strategy = get_jwt_strategy()
+    try:
+        data = decode_jwt(token, strategy.decode_key, strategy.token_audience, algorithms=[strategy.algorithm])
+        user_id = uuid.UUID(data["sub"])
+    except (jwt.PyJWTError, KeyError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    if "active" in data and "email" in data:
+        user = TokenUser(
+            id=user_id,
+            email=data["email"],
+            is_active=bool(data["active"]),
+            is_superuser=bool(data.get("superuser", False)),
+            is_verified=bool(data.get("verified", False)),
+        )
+    else:
+        async with read_session_maker() as session:
+            row = await session.get(User, user_id)
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        user = TokenUser(row.id, row.email, row.is_active, row.is_superuser, row.is_verified)
+
+    if not user.is_active or await revoked_users.is_revoked(user.id):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return user
+
+
+# Dependency für Leseendpunkte (Feed, Kommentare, Upload-Status): keine Auth-Abfrage pro Request.
+# Mit AUTH_STATELESS=0 identisch mit `current_active_user`.
+current_active_user_fast = _user_from_claims if AUTH_STATELESS else current_active_user
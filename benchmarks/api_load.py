@@ -0,0 +1,426 @@
+"""
+Beschreibung:
+- Lasttest für die heißen Pfade der API: GET /feed, GET /post/{id}/comments, POST /upload,
+  POST /auth/jwt/login und GET /users/me.
+- Ablauf:
+  1. Frische SQLite-DB (test.db im Arbeitsordner) per Alembic anlegen und mit einstellbaren
+     Mengen an Usern, Posts und Kommentaren füllen.
+  2. Backend als eigenen uvicorn-Prozess starten – mit STORAGE_BACKEND=local statt ImageKit
+     (kein Netzwerk, keine Kosten, reproduzierbar).
+  3. Je Szenario eine feste Anzahl Requests mit fester Parallelität (geschlossene Schleife:
+     jeder Worker schickt den nächsten Request, sobald der vorige fertig ist).
+  4. Ergebnis: p50/p95/p99/max-Latenz, Durchsatz, Fehler/Statuscodes je Szenario und die
+     Spitzen-RSS des Server-Prozesses – als JSON-Datei zum Vergleich zwischen Commits.
+
+Für Anfänger:
+- p95 = 95 % der Requests waren mindestens so schnell. Ausreißer zeigen sich in p99/max.
+- Die Client-Threads laufen in diesem Prozess, der Server in einem anderen. So misst der Test
+  den echten HTTP-Weg (uvicorn, Serialisierung, Auth), ohne dass sich beide die CPU-Zeit
+  eines Python-Prozesses teilen.
+- Die Repo-Datei ./test.db wird nie angefasst; alles liegt im Arbeitsordner (--workdir).
+
+Aufruf (im Projektordner):
+    uv run python -m benchmarks.api_load --users 100 --posts 2000 --comments 5 \\
+        --concurrency 16 --requests 2000 --output benchmarks/results/run.json
+    # gleicher Lauf, danach p95 und Durchsatz je Szenario mit einem früheren Ergebnis vergleichen:
+    uv run python -m benchmarks.api_load --compare benchmarks/results/api_load-<commit>.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ["login", "me", "feed", "feed_deep", "comments", "upload"]
+PASSWORD = "bench-password"
+
+
+# -----------------------------------------------------------------------------
+# Testdaten
+# -----------------------------------------------------------------------------
+def seed(db_path: str, users: int, posts: int, comments: int, rng: random.Random) -> dict:
+    """
+    Legt das Schema per Alembic an und füllt es per Bulk-Insert.
+    `comments` ist der Mittelwert je Post (gleichverteilt zwischen 0 und 2 * comments).
+    Liefert E-Mails und Post-IDs für die Szenarien.
+    """
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    sys.path.insert(0, PROJECT_ROOT)
+    from fastapi_users.password import PasswordHelper
+    from sqlalchemy import insert
+    from backend import database as db
+
+    async def run() -> dict:
+        await db.run_migrations()
+        hashed = PasswordHelper().hash(PASSWORD)  # einmal hashen, für alle User gleich
+        user_rows = [
+            {"id": uuid.uuid4(), "email": f"bench{i}@example.com", "hashed_password": hashed,
+             "is_active": True, "is_superuser": False, "is_verified": True}
+            for i in range(users)
+        ]
+        start = datetime.datetime.utcnow() - datetime.timedelta(minutes=posts)
+        post_rows = [
+            {"id": uuid.uuid4(), "user_id": rng.choice(user_rows)["id"], "caption": f"Beitrag {i}",
+             "url": f"http://127.0.0.1/media/{i}.jpg", "file_type": "image", "file_name": f"{i}.jpg",
+             "created_at": start + datetime.timedelta(minutes=i), "status": "ready",
+             "likes": rng.randint(0, 50), "dislikes": rng.randint(0, 5)}
+            for i in range(posts)
+        ]
+        comment_rows = [
+            {"id": uuid.uuid4(), "post_id": p["id"], "user_id": rng.choice(user_rows)["id"],
+             "text": f"Kommentar {k}", "created_at": p["created_at"] + datetime.timedelta(seconds=k + 1)}
+            for p in post_rows
+            for k in range(rng.randint(0, 2 * comments))
+        ]
+        async with db.async_session_maker() as session:
+            for model, rows in ((db.User, user_rows), (db.Post, post_rows), (db.Comment, comment_rows)):
+                for i in range(0, len(rows), 5000):
+                    await session.execute(insert(model), rows[i:i + 5000])
+            await session.commit()
+        await db.engine.dispose()
+        return {
+            "emails": [u["email"] for u in user_rows],
+            "post_ids": [str(p["id"]) for p in post_rows],
+            "comments": len(comment_rows),
+        }
+
+    return asyncio.run(run())
+
+
+# -----------------------------------------------------------------------------
+# Server
+# -----------------------------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir: str, db_path: str, port: int, workers: int) -> subprocess.Popen:
+    """uvicorn im Arbeitsordner starten; Uploads landen in workdir/media statt bei ImageKit."""
+    env = dict(
+        os.environ,
+        PYTHONPATH=PROJECT_ROOT,
+        DATABASE_URL=f"sqlite+aiosqlite:///{db_path}",
+        STORAGE_BACKEND="local",
+        STORAGE_LOCAL_DIR=os.path.join(workdir, "media"),
+        STORAGE_PUBLIC_URL=f"http://127.0.0.1:{port}",
+        UPLOAD_SPOOL_DIR=os.path.join(workdir, "upload_spool"),
+    )
+    cmd = [sys.executable, "-m", "uvicorn", "backend.api:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    proc = subprocess.Popen(cmd, cwd=workdir, env=env)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return proc
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Server did not start within 60 s")
+
+
+def _process_tree(pid: int) -> list[int]:
+    """pid und alle Kindprozesse (Linux /proc; bei --workers > 1 die Worker)."""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as fh:
+                    ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    tree, todo = [], [pid]
+    while todo:
+        current = todo.pop()
+        tree.append(current)
+        todo.extend(children.get(current, []))
+    return tree
+
+
+def peak_rss_kib(pid: int):
+    """Höchste RSS (VmHWM) eines Server-Prozesses in KiB; None ohne /proc (z. B. macOS)."""
+    if not os.path.isdir("/proc"):
+        return None
+    peak = 0
+    for p in _process_tree(pid):
+        try:
+            with open(f"/proc/{p}/status") as fh:
+                for line in fh:
+                    if line.startswith("VmHWM:"):
+                        peak = max(peak, int(line.split()[1]))
+        except OSError:
+            continue
+    return peak or None
+
+
+# -----------------------------------------------------------------------------
+# Last erzeugen
+# -----------------------------------------------------------------------------
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Perzentil (0..100) einer sortierten Liste, Nearest-Rank."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def run_scenario(name: str, make_request, total: int, concurrency: int, warmup: int) -> dict:
+    """
+    Führt `total` Requests mit `concurrency` Threads aus (je Thread eine requests.Session mit
+    Keep-Alive). `make_request(session, i)` liefert die Response.
+    """
+    local = threading.local()
+    counter = iter(range(total + warmup))
+    lock = threading.Lock()
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    errors = 0
+    received = 0
+
+    def worker() -> None:
+        nonlocal errors, received
+        local.session = requests.Session()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            try:
+                r = make_request(local.session, i)
+                elapsed = time.perf_counter() - start
+                status, size = str(r.status_code), len(r.content)
+            except requests.exceptions.RequestException:
+                elapsed, status, size = time.perf_counter() - start, "error", 0
+            if i < warmup:
+                continue
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+                received += size
+                if status == "error" or not status.startswith("2"):
+                    errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - started
+    latencies.sort()
+    ms = lambda v: round(v * 1000, 3)
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "status": statuses,
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1]) if latencies else 0.0,
+            "mean": ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+        },
+        "bytes_received": received,
+    }
+
+
+def build_scenarios(base: str, data: dict, tokens: list[str], rng: random.Random, args) -> dict:
+    """Request-Funktionen je Szenario (alle deterministisch aus dem Seed)."""
+    auth = [{"Authorization": f"Bearer {t}"} for t in tokens]
+    post_ids = data["post_ids"]
+    comment_targets = [rng.choice(post_ids) for _ in range(1024)]
+    payload = rng.randbytes(args.upload_kib * 1024)
+
+    # Cursor tieferer Feed-Seiten einmal einsammeln (feed_deep: Seiten jenseits des Caches)
+    cursors, cursor = [], None
+    for _ in range(min(args.deep_pages, len(post_ids) // args.page_size)):
+        params = {"limit": args.page_size, **({"cursor": cursor} if cursor else {})}
+        cursor = requests.get(f"{base}/feed", headers=auth[0], params=params, timeout=30).json()["next_cursor"]
+        if not cursor:
+            break
+        cursors.append(cursor)
+    cursors = cursors or [None]
+
+    return {
+        "login": lambda s, i: s.post(
+            f"{base}/auth/jwt/login", data={"username": data["emails"][i % len(data["emails"])], "password": PASSWORD}
+        ),
+        "me": lambda s, i: s.get(f"{base}/users/me", headers=auth[i % len(auth)]),
+        "feed": lambda s, i: s.get(
+            f"{base}/feed", headers=auth[i % len(auth)], params={"limit": args.page_size, "comments": args.feed_comments}
+        ),
+        "feed_deep": lambda s, i: s.get(
+            f"{base}/feed", headers=auth[i % len(auth)],
+            params={"limit": args.page_size, "comments": args.feed_comments, "cursor": cursors[i % len(cursors)]},
+        ),
+        "comments": lambda s, i: s.get(
+            f"{base}/post/{comment_targets[i % len(comment_targets)]}/comments", headers=auth[i % len(auth)]
+        ),
+        "upload": lambda s, i: s.post(
+            f"{base}/upload", headers=auth[i % len(auth)],
+            files={"file": (f"bench{i}.jpg", payload, "image/jpeg")}, data={"caption": f"bench {i}"},
+        ),
+    }
+
+
+def wait_for_uploads(db_path: str, timeout: float = 120) -> float:
+    """Wartet, bis die Upload-Queue leer ist (keine Posts mehr "pending"); liefert die Dauer."""
+    import sqlite3
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        with sqlite3.connect(db_path) as conn:
+            if conn.execute("SELECT count(*) FROM posts WHERE status = 'pending'").fetchone()[0] == 0:
+                break
+        time.sleep(0.1)
+    return round(time.perf_counter() - start, 3)
+
+
+def git_commit() -> str:
+    """Kurzer Commit-Hash; "-dirty", wenn es nicht committete Änderungen gibt."""
+    try:
+        run = lambda *cmd: subprocess.run(
+            ["git", *cmd], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        commit = run("rev-parse", "--short", "HEAD")
+        return commit + ("-dirty" if run("status", "--porcelain", "--untracked-files=no") else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# -----------------------------------------------------------------------------
+# Vergleich zweier Läufe
+# -----------------------------------------------------------------------------
+def compare(old_path: str, new: dict) -> None:
+    """Druckt p95 und Durchsatz je Szenario: alt -> neu (Änderung in %)."""
+    with open(old_path) as fh:
+        old = json.load(fh)
+    print(f"\nVergleich {old['meta']['commit']} -> {new['meta']['commit']}")
+    for name, result in new["scenarios"].items():
+        before = old["scenarios"].get(name)
+        if not before:
+            continue
+        for label, a, b in (
+            ("p95 ms", before["latency_ms"]["p95"], result["latency_ms"]["p95"]),
+            ("req/s ", before["throughput_rps"], result["throughput_rps"]),
+        ):
+            change = f"{(b - a) / a * 100:+.1f}%" if a else "n/a"
+            print(f"  {name:<10} {label} {a:>10} -> {b:>10}  ({change})")
+
+
+# -----------------------------------------------------------------------------
+# Einstieg
+# -----------------------------------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=5, help="Kommentare je Post (Mittelwert)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests je Szenario")
+    parser.add_argument("--warmup", type=int, default=50, help="nicht gemessene Requests je Szenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Auswahl aus {','.join(SCENARIOS)}")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--feed-comments", type=int, default=3, help="?comments= bei feed/feed_deep")
+    parser.add_argument("--deep-pages", type=int, default=50, help="Cursor-Seiten für feed_deep")
+    parser.add_argument("--upload-kib", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn-Worker")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workdir", help="Ordner für test.db/Medien (Standard: temporär)")
+    parser.add_argument("--output", help="JSON-Ergebnisdatei (Standard: benchmarks/results/api_load-<commit>.json)")
+    parser.add_argument("--compare", help="früheres Ergebnis, mit dem verglichen wird")
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(args.seed)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="api-load-"))
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, "test.db")
+    if os.path.exists(db_path):
+        os.unlink(db_path)
+
+    t0 = time.perf_counter()
+    data = seed(db_path, args.users, args.posts, args.comments, rng)
+    seed_seconds = round(time.perf_counter() - t0, 2)
+    print(f"Seeded {args.users} users, {args.posts} posts, {data['comments']} comments in {seed_seconds}s ({workdir})")
+
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = start_server(workdir, db_path, port, args.workers)
+    results = {}
+    try:
+        # Ein Token je gleichzeitigem Worker (verteilte "echte" User)
+        tokens = [
+            requests.post(f"{base}/auth/jwt/login", data={"username": email, "password": PASSWORD}, timeout=30)
+            .json()["access_token"]
+            for email in data["emails"][:max(1, min(args.concurrency, len(data["emails"])))]
+        ]
+        requests_by_name = build_scenarios(base, data, tokens, rng, args)
+        for name in scenarios:
+            result = run_scenario(name, requests_by_name[name], args.requests, args.concurrency, args.warmup)
+            if name == "upload":
+                result["drain_seconds"] = wait_for_uploads(db_path)
+            result["server_peak_rss_kib"] = peak_rss_kib(server.pid)
+            results[name] = result
+            lat = result["latency_ms"]
+            print(f"{name:<10} {result['throughput_rps']:>8} req/s  p50 {lat['p50']:>8} ms  p95 {lat['p95']:>8} ms  "
+                  f"p99 {lat['p99']:>8} ms  errors {result['errors']}")
+        server_peak = peak_rss_kib(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    if server_peak is None:
+        # Ohne /proc: Spitzenwert aller beendeten Kindprozesse (Linux KiB, macOS Bytes)
+        rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        server_peak = rss // 1024 if sys.platform == "darwin" else rss
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed_seconds": seed_seconds,
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "workdir")},
+            "seeded_comments": data["comments"],
+        },
+        "server_peak_rss_kib": server_peak,
+        "scenarios": results,
+    }
+    output = args.output or os.path.join(PROJECT_ROOT, "benchmarks", "results", f"api_load-{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Peak server RSS: {server_peak} KiB -> {output}")
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Beschreibung:
+- Budget-Prüfung für die Startzeit: misst mit `python -X importtime`, wie lange
+  `import backend.api` dauert, und endet mit Exit-Code 1, wenn
+    * die Importzeit das Budget (--budget-ms bzw. IMPORT_TIME_BUDGET_MS) überschreitet oder
+    * ein Modul geladen wird, das erst bei Bedarf geladen werden soll (FORBIDDEN_MODULES).
+- Gedacht für CI oder vor einem Commit, z. B. nach neuen Abhängigkeiten oder Top-Level-Imports.
+
+Für Anfänger:
+- `-X importtime` schreibt für jedes importierte Modul eine Zeile nach stderr:
+  "import time: <eigene µs> | <kumulativ µs> | <modul>". Die kumulative Zeit eines Moduls
+  enthält alle Module, die es selbst importiert.
+- Jeder Lauf ist ein frischer Interpreter (wie ein neu gestarteter Worker). Gewertet wird der
+  schnellste von --runs Läufen, damit einzelne Ausreißer (Festplatten-Cache, andere Prozesse)
+  nicht zählen. Der erste Lauf schreibt außerdem die .pyc-Dateien.
+- Das Budget hängt von der Maschine ab: in CI einmal messen und mit etwas Luft festlegen.
+- Schwere, selten gebrauchte Pakete gehören in die Funktion, die sie braucht
+  (siehe `make_client` in backend/storage_imagekit.py), nicht an den Dateianfang.
+
+Aufruf (im Projektordner):
+    uv run python -m benchmarks.import_time
+    uv run python -m benchmarks.import_time --budget-ms 1200 --runs 7 --top 20
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Obergrenze für `import backend.api` in Millisekunden (bestes von --runs Läufen).
+IMPORT_TIME_BUDGET_MS: float = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+# Pakete, die beim Import der API NICHT geladen werden dürfen:
+# ImageKit-SDK (zieht requests nach sich) und dotenv nur in make_client, Alembic nur für Migrationen.
+FORBIDDEN_MODULES = ("imagekitio", "dotenv", "alembic", "requests")
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def measure(module: str) -> tuple[float, dict[str, float]]:
+    """
+    Ein Import von `module` in einem frischen Interpreter.
+    Liefert (kumulative Zeit von `module` in ms, {Modul: eigene Zeit in ms}).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total = None
+    self_times: dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, name = m.groups()
+        self_times[name] = int(self_us) / 1000
+        if name == module and not indent:
+            total = int(cumulative_us) / 1000
+    if total is None:
+        raise SystemExit(f"{module} not found in -X importtime output (already imported by site?)")
+    return total, self_times
+
+
+def by_package(self_times: dict[str, float]) -> list[tuple[str, float]]:
+    """Eigene Zeiten je Top-Level-Paket aufsummiert, größte zuerst."""
+    totals: dict[str, float] = defaultdict(float)
+    for name, ms in self_times.items():
+        totals[name.split(".")[0]] += ms
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget check for the backend")
+    parser.add_argument("--module", default="backend.api", help="module to import (default: backend.api)")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters; the fastest run counts")
+    parser.add_argument("--top", type=int, default=10, help="packages to list by own import time")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    best, self_times = min(runs, key=lambda run: run[0])
+
+    print(f"import {args.module}: best {best:.0f} ms of {len(runs)} runs "
+          f"(all: {', '.join(f'{total:.0f}' for total, _ in runs)}), budget {args.budget_ms:.0f} ms")
+    print(f"{'package':<32} {'own ms':>8}")
+    for package, ms in by_package(self_times)[: args.top]:
+        print(f"{package:<32} {ms:>8.1f}")
+
+    failures = []
+    if best > args.budget_ms:
+        failures.append(f"import time {best:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+    loaded = sorted(
+        name for name in FORBIDDEN_MODULES
+        if any(imported == name or imported.startswith(name + ".") for imported in self_times)
+    )
+    if loaded:
+        failures.append(f"modules that should load lazily were imported: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Beschreibung:
+- Vergleicht die Serialisierung einer Feed-Seite (Standard: 1000 Posts mit je 3 Kommentaren):
+  1. alter Weg: str()/isoformat() je Feld -> jsonable_encoder -> json.dumps (FastAPI-Standard)
+  2. Pydantic: FeedResponse(...).model_dump_json()
+  3. neuer Weg: native Typen -> orjson (backend/responses.py)
+- Gemessen werden Zeit pro Seite und Speicher-Spitze (tracemalloc).
+- Die orjson-Ausgabe wird gegen `FeedResponse` validiert, die Form bleibt also gleich.
+
+Aufruf (im Projektordner):
+    uv run python -m benchmarks.serialization --posts 1000 --repeat 20
+"""
+
+import argparse
+import datetime
+import json
+import time
+import tracemalloc
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.responses import dumps
+from backend.schemas import FeedResponse
+
+
+def make_page(posts: int, comments: int) -> dict:
+    """Feed-Seite mit nativen Typen, wie `_build_feed_page` sie baut (inkl. User-Felder)."""
+    now = datetime.datetime(2025, 1, 1, 12, 0, 0)
+    users = [uuid.uuid4() for _ in range(20)]
+    page = []
+    for i in range(posts):
+        post_id = uuid.uuid4()
+        page.append({
+            "id": post_id,
+            "user_id": users[i % len(users)],
+            "caption": f"Beitrag {i}",
+            "url": f"https://ik.imagekit.io/demo/{post_id.hex}.jpg",
+            "file_type": "image",
+            "created_at": now - datetime.timedelta(minutes=i),
+            "email": f"user{i % len(users)}@example.com",
+            "likes": i % 17,
+            "dislikes": i % 5,
+            "comment_count": comments,
+            "comments": [
+                {
+                    "id": uuid.uuid4(),
+                    "post_id": post_id,
+                    "user_id": users[(i + k) % len(users)],
+                    "text": f"Kommentar {k}",
+                    "created_at": now - datetime.timedelta(minutes=i, seconds=k),
+                    "author": f"user{(i + k) % len(users)}@example.com",
+                }
+                for k in range(comments)
+            ],
+            "is_owner": i % 20 == 0,
+            "is_liked": i % 3 == 0,
+            "is_disliked": False,
+        })
+    return {"posts": page, "next_cursor": "2025-01-01T12:00:00|" + uuid.uuid4().hex}
+
+
+def as_strings(page: dict) -> dict:
+    """Vorheriger Stand von api.py: UUIDs/Zeitstempel schon beim Aufbau in Strings umwandeln."""
+    def conv(d: dict) -> dict:
+        return {
+            k: (str(v) if isinstance(v, uuid.UUID) else v.isoformat() if isinstance(v, datetime.datetime) else v)
+            for k, v in d.items()
+        }
+    return {
+        "posts": [dict(conv(p), comments=[conv(c) for c in p["comments"]]) for p in page["posts"]],
+        "next_cursor": page["next_cursor"],
+    }
+
+
+def legacy(page: dict) -> bytes:
+    data = jsonable_encoder(as_strings(page))
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def pydantic(page: dict) -> bytes:
+    return FeedResponse(**page).model_dump_json().encode("utf-8")
+
+
+def fast(page: dict) -> bytes:
+    return dumps(page)
+
+
+def measure(fn, page: dict, repeat: int) -> dict:
+    fn(page)  # Aufwärmen
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(page)
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    fn(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms_per_page": round(elapsed * 1000, 3), "peak_kib": round(peak / 1024, 1), "bytes": len(body)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--comments", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    page = make_page(args.posts, args.comments)
+    FeedResponse.model_validate_json(fast(page))
+    results = {
+        "legacy_jsonable_encoder": measure(legacy, page, args.repeat),
+        "pydantic_model_dump_json": measure(pydantic, page, args.repeat),
+        "orjson": measure(fast, page, args.repeat),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
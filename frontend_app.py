@@ -562,8 +562,12 @@
 # ------------------------------------------------------------------------------
 
 import os
+import json
+import time
 import base64
+import threading
 import urllib.parse
+from collections import deque
 from datetime import datetime
 from typing import Optional, Dict, List
 
@@ -576,6 +580,24 @@ import streamlit as st
 APP_NAME = "Lichtblick"  # Anzeigename der App
 # Backend-Basis-URL. Standard ist lokales FastAPI unter Port 8000.
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000").rstrip("/")
+# Anzahl Beiträge pro Feed-Seite (Backend begrenzt zusätzlich serverseitig).
+FEED_PAGE_SIZE = int(os.getenv("FEED_PAGE_SIZE", "20"))
+# Abfrageintervall und Zeitlimit (Sekunden) für den Status asynchroner Uploads.
+UPLOAD_POLL_INTERVAL = float(os.getenv("UPLOAD_POLL_INTERVAL", "1.0"))
+UPLOAD_POLL_TIMEOUT = float(os.getenv("UPLOAD_POLL_TIMEOUT", "120"))
+# Wie viele (neueste) Kommentare pro Beitrag gesammelt vorgeladen werden.
+COMMENTS_PREVIEW_LIMIT = int(os.getenv("COMMENTS_PREVIEW_LIMIT", "20"))
+# Wie viele GET-Antworten mit ETag für bedingte Requests (If-None-Match) gemerkt werden.
+HTTP_VALIDATOR_CACHE_SIZE = int(os.getenv("HTTP_VALIDATOR_CACHE_SIZE", "64"))
+# Live-Updates über GET /events ("1" = an). Die Seite prüft alle LIVE_REFRESH_INTERVAL Sekunden,
+# ob Änderungen angekommen sind, und rendert nur dann neu.
+LIVE_EVENTS = os.getenv("LIVE_EVENTS", "1") == "1"
+LIVE_REFRESH_INTERVAL = float(os.getenv("LIVE_REFRESH_INTERVAL", "2"))
+# Ohne Abruf durch die Seite (Tab geschlossen, andere Seite) beendet sich der Empfänger nach
+# so vielen Sekunden selbst; beim nächsten Besuch verbindet er sich mit Last-Event-ID neu.
+LIVE_IDLE_TIMEOUT = float(os.getenv("LIVE_IDLE_TIMEOUT", "300"))
+# Höchstens so viele unverarbeitete Ereignisse; darüber hinaus wird der Feed neu geladen.
+LIVE_EVENT_BUFFER = int(os.getenv("LIVE_EVENT_BUFFER", "1000"))
 # Grundlayout der Streamlit-Seite
 st.set_page_config(page_title=APP_NAME, page_icon="🌤️", layout="wide")
 
@@ -586,6 +608,8 @@ st.session_state.setdefault("token", None)               # JWT aus /auth/jwt/log
 st.session_state.setdefault("user", None)                # JSON von /users/me
 st.session_state.setdefault("theme", "light")            # "light" oder "dark"
 st.session_state.setdefault("beitraege", [])             # gecachter Beitrags-Feed
+st.session_state.setdefault("beitraege_cursor", None)    # next_cursor der zuletzt geladenen Seite
+st.session_state.setdefault("beitraege_since", None)     # Marker für Delta-Abfragen (/feed?since=)
 # Informationen, ob das Backend Like/Dislike/Comments unterstützt. None=unbekannt.
 st.session_state.setdefault("api_support", {"like": None, "dislike": None, "comments": None})
 # Lokaler Zustand für Reaktionen je Post, falls Backend-Endpunkte fehlen.
@@ -595,6 +619,12 @@ st.session_state.setdefault("local_reacts", {})
 st.session_state.setdefault("local_comments", {})        # {post_id: [{"author":..., "text":...}]}
 # Cache für Server-Kommentare, um unnötige GETs zu vermeiden.
 st.session_state.setdefault("comments_cache", {})        # {post_id: [...]}
+# Gesamtzahl der Kommentare je Beitrag (aus dem Batch-Endpunkt), auch wenn nur ein Teil geladen ist.
+st.session_state.setdefault("comments_counts", {})       # {post_id: n}
+# Letzte GET-Antworten mit ETag: {(url inkl. Query, Authorization): (etag, body)}.
+st.session_state.setdefault("http_validators", {})
+# Empfänger der Live-Ereignisse (LiveFeed), je Sitzung höchstens einer.
+st.session_state.setdefault("live_feed", None)
 
 def _rerun():
     """Sicherer Neu-Render der App. Streamlit-Versionen variieren in API-Namen."""
@@ -712,13 +742,46 @@ def _safe_request(method: str, url: str, **kwargs) -> Optional[requests.Response
     """
     Wrapper um requests.request mit Timeout und Fehlerbehandlung.
     Liefert None bei Netzwerkfehlern, damit die UI sauber bleibt.
+
+    Bedingte Requests: Für GET-Antworten mit ETag werden ETag und Body gemerkt und beim
+    nächsten gleichen GET als If-None-Match mitgeschickt. Antwortet das Backend mit 304,
+    bekommt der Aufrufer die gemerkte Antwort als normale 200-Antwort zurück.
     """
     timeout = kwargs.pop("timeout", 20)
+    key = None
+    if method.lower() == "get":
+        full_url = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        headers = dict(kwargs.pop("headers", None) or {})
+        key = (full_url, headers.get("Authorization"))
+        cached = st.session_state["http_validators"].get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        kwargs["headers"] = headers
     try:
-        return requests.request(method, url, timeout=timeout, **kwargs)
+        r = requests.request(method, url, timeout=timeout, **kwargs)
     except requests.exceptions.RequestException as exc:
         st.error(f"Netzwerkfehler: {exc}")
         return None
+    if key is None:
+        return r
+    validators = st.session_state["http_validators"]
+    if r.status_code == 304 and key in validators:
+        etag, body = validators.pop(key)
+        validators[key] = (etag, body)  # als zuletzt benutzt ans Ende
+        cached_response = requests.Response()
+        cached_response.status_code = 200
+        cached_response._content = body
+        cached_response.headers.update(r.headers)
+        cached_response.headers["Content-Type"] = "application/json"
+        cached_response.url = r.url
+        cached_response.encoding = "utf-8"
+        return cached_response
+    if r.status_code == 200 and r.headers.get("ETag"):
+        validators.pop(key, None)
+        validators[key] = (r.headers["ETag"], r.content)
+        while len(validators) > HTTP_VALIDATOR_CACHE_SIZE:
+            validators.pop(next(iter(validators)))
+    return r
 
 def api_login(email: str, password: str) -> Optional[str]:
     """Login am Backend. Gibt JWT-Access-Token zurück oder None bei Fehler."""
@@ -746,36 +809,139 @@ def api_register(email: str, password: str) -> (bool, Optional[str]):
             return False, f"Status {r.status_code}"
     return False, "Netzwerkfehler"
 
-def api_beitraege() -> List[Dict]:
+def _prepare_post(p: Dict) -> Dict:
+    """
+    Ergänze Standardfelder, falls Backend sie nicht liefert, und übernimm eingebettete
+    Kommentare (?comments=N) in den Kommentar-Cache.
     """
-    Hole Beiträge vom Backend (/feed).
-    Ergänze Standardfelder, falls Backend sie nicht liefert.
+    p["id"] = str(p.get("id"))
+    p.setdefault("likes", 0)
+    p.setdefault("is_liked", False)
+    p.setdefault("dislikes", 0)
+    p.setdefault("is_disliked", False)
+    if "comments" in p:
+        st.session_state["comments_cache"][p["id"]] = p.pop("comments")
+        st.session_state["comments_counts"][p["id"]] = p.get("comment_count", 0)
+    return p
+
+def api_beitraege(cursor: Optional[str] = None, full: bool = False) -> List[Dict]:
     """
-    r = _safe_request("get", f"{BACKEND_URL}/feed", headers=_headers(), timeout=25)
+    Hole eine Seite Beiträge vom Backend (/feed).
+    - Ohne cursor: erste (neueste) Seite. Mit cursor: die Seite danach.
+    - Der next_cursor der Antwort landet in st.session_state["beitraege_cursor"].
+    - Die neuesten Kommentare je Beitrag kommen gleich mit (?comments=N) und wandern
+      in den Kommentar-Cache, sodass eine Feed-Seite mit genau einem Request rendert.
+    - Sind schon Beiträge geladen (ohne cursor, ohne full=True), werden nur die Änderungen seit dem
+      letzten Stand geholt (/feed?since=...) und in die vorhandene Liste eingearbeitet; das Ergebnis
+      ist die komplette, aktualisierte Liste. Geht das nicht (altes Backend, Marker zu alt),
+      wird die erste Seite neu geladen.
+    """
+    if cursor is None and not full and st.session_state["beitraege"] and st.session_state["beitraege_since"]:
+        merged = _api_beitraege_delta()
+        if merged is not None:
+            return merged
+    params = {"limit": FEED_PAGE_SIZE, "comments": COMMENTS_PREVIEW_LIMIT}
+    if cursor:
+        params["cursor"] = cursor
+    r = _safe_request("get", f"{BACKEND_URL}/feed", headers=_headers(), params=params, timeout=25)
     if r and r.ok:
         data = r.json()
-        posts = data.get("posts", [])
-        for p in posts:
-            p["id"] = str(p.get("id"))
-            p.setdefault("likes", 0)
-            p.setdefault("is_liked", False)
-            p.setdefault("dislikes", 0)
-            p.setdefault("is_disliked", False)
-        return posts
+        st.session_state["beitraege_cursor"] = data.get("next_cursor")
+        if cursor is None:
+            st.session_state["beitraege_since"] = data.get("since")
+        return [_prepare_post(p) for p in data.get("posts", [])]
     return []
 
-def api_upload(file, caption: str) -> bool:
-    """Lade Datei + Beschriftung hoch (/upload)."""
+def _api_beitraege_delta() -> Optional[List[Dict]]:
+    """
+    Neue und gelöschte Beiträge seit st.session_state["beitraege_since"] in die vorhandene Liste
+    einarbeiten: neue vorn (bereits bekannte werden ersetzt), gelöschte entfernen.
+    None, wenn das Backend kein Delta liefern kann – dann lädt der Aufrufer neu.
+    """
+    params = {"since": st.session_state["beitraege_since"], "limit": FEED_PAGE_SIZE,
+              "comments": COMMENTS_PREVIEW_LIMIT}
+    r = _safe_request("get", f"{BACKEND_URL}/feed", headers=_headers(), params=params, timeout=15)
+    if not r or not r.ok:
+        return None
+    data = r.json()
+    if data.get("reset") or "deleted" not in data:
+        return None
+    st.session_state["beitraege_since"] = data["since"]
+    deleted = {str(pid) for pid in data["deleted"]}
+    for pid in deleted:
+        st.session_state["comments_cache"].pop(pid, None)
+        st.session_state["comments_counts"].pop(pid, None)
+        st.session_state["local_reacts"].pop(pid, None)
+    neue = [_prepare_post(p) for p in data.get("posts", [])]
+    known = deleted | {p["id"] for p in neue}
+    return neue + [p for p in st.session_state["beitraege"] if p.get("id") not in known]
+
+def api_beitraege_weitere() -> List[Dict]:
+    """Hänge die nächste Feed-Seite an st.session_state["beitraege"] an."""
+    cursor = st.session_state["beitraege_cursor"]
+    if not cursor:
+        return st.session_state["beitraege"]
+    known = {p.get("id") for p in st.session_state["beitraege"]}
+    neue = [p for p in api_beitraege(cursor) if p.get("id") not in known]
+    st.session_state["beitraege"] = st.session_state["beitraege"] + neue
+    return st.session_state["beitraege"]
+
+def api_upload(file, caption: str) -> Optional[str]:
+    """
+    Lade Datei + Beschriftung hoch (/upload).
+    Das Backend antwortet sofort mit einer Job-ID; der Transfer zu ImageKit läuft im Hintergrund.
+    Liefert die Job-ID oder None bei Fehler.
+    """
     files = {"file": (file.name, file.getvalue(), file.type)}
     data = {"caption": caption}
     r = _safe_request("post", f"{BACKEND_URL}/upload", files=files, data=data, headers=_headers(), timeout=120)
-    return bool(r and r.ok)
+    if r and r.ok:
+        return r.json().get("job_id")
+    return None
+
+def api_upload_status(job_id: str) -> Optional[Dict]:
+    """Status eines Upload-Jobs (/upload/{job_id}): pending, running, done oder failed."""
+    r = _safe_request("get", f"{BACKEND_URL}/upload/{job_id}", headers=_headers(), timeout=10)
+    return r.json() if r and r.ok else None
+
+def wait_for_upload(job_id: str, timeout: float = UPLOAD_POLL_TIMEOUT) -> Optional[Dict]:
+    """
+    Frage den Upload-Status regelmäßig ab, bis der Job fertig ist oder das Zeitlimit erreicht wird.
+    Liefert den letzten Status (oder None, falls das Backend nicht erreichbar war).
+    """
+    deadline = time.monotonic() + timeout
+    status = None
+    while time.monotonic() < deadline:
+        status = api_upload_status(job_id)
+        if not status or status.get("status") in ("done", "failed"):
+            break
+        time.sleep(UPLOAD_POLL_INTERVAL)
+    return status
 
 def api_delete(post_id: str) -> bool:
     """Lösche Beitrag (/post/{id})."""
     r = _safe_request("delete", f"{BACKEND_URL}/post/{post_id}", headers=_headers(), timeout=20)
     return bool(r and r.ok)
 
+def _apply_server_reacts(post_id: str, r: requests.Response) -> None:
+    """
+    Übernimmt den Reaktionszustand aus der Backend-Antwort (likes, dislikes, is_liked, is_disliked)
+    in Beitrag und lokalen Zustand. So zeigt die UI nach dem optimistischen Update die echten Zähler.
+    """
+    try:
+        data = r.json()
+    except ValueError:
+        return
+    keys = ("likes", "is_liked", "dislikes", "is_disliked")
+    if not all(k in data for k in keys):
+        return
+    for p in st.session_state["beitraege"]:
+        if p.get("id") == post_id:
+            p.update({k: data[k] for k in keys})
+            break
+    if post_id in st.session_state["local_reacts"]:
+        st.session_state["local_reacts"][post_id].update({k: data[k] for k in keys})
+
 # Likes / Dislikes optional (Fallback lokal)
 # Die folgenden Funktionen versuchen zuerst den Backend-Endpunkt.
 # Wenn /post/{id}/like (oder /unlike, /dislike, /undislike) 404 liefert,
@@ -788,6 +954,8 @@ def api_like(post_id: str) -> Optional[bool]:
         st.session_state["api_support"]["like"] = False
         return None
     st.session_state["api_support"]["like"] = True
+    if r.ok:
+        _apply_server_reacts(post_id, r)
     return bool(r.ok)
 
 def api_unlike(post_id: str) -> Optional[bool]:
@@ -797,6 +965,8 @@ def api_unlike(post_id: str) -> Optional[bool]:
         st.session_state["api_support"]["like"] = False
         return None
     st.session_state["api_support"]["like"] = True
+    if r.ok:
+        _apply_server_reacts(post_id, r)
     return bool(r.ok)
 
 def api_dislike(post_id: str) -> Optional[bool]:
@@ -806,6 +976,8 @@ def api_dislike(post_id: str) -> Optional[bool]:
         st.session_state["api_support"]["dislike"] = False
         return None
     st.session_state["api_support"]["dislike"] = True
+    if r.ok:
+        _apply_server_reacts(post_id, r)
     return bool(r.ok)
 
 def api_undislike(post_id: str) -> Optional[bool]:
@@ -815,6 +987,8 @@ def api_undislike(post_id: str) -> Optional[bool]:
         st.session_state["api_support"]["dislike"] = False
         return None
     st.session_state["api_support"]["dislike"] = True
+    if r.ok:
+        _apply_server_reacts(post_id, r)
     return bool(r.ok)
 
 def api_comments(post_id: str) -> Optional[List[Dict]]:
@@ -832,6 +1006,18 @@ def api_comments(post_id: str) -> Optional[List[Dict]]:
         return r.json().get("comments", [])
     return None
 
+def api_comments_batch(post_ids: List[str]) -> Optional[Dict]:
+    """
+    Hole Kommentare für mehrere Beiträge in einem Request (/comments?post_id=...).
+    Liefert {"comments": {id: [...]}, "counts": {id: n}} oder None bei Fehler
+    bzw. wenn das Backend den Batch-Endpunkt nicht kennt.
+    """
+    params = [("post_id", pid) for pid in post_ids] + [("limit", COMMENTS_PREVIEW_LIMIT)]
+    r = _safe_request("get", f"{BACKEND_URL}/comments", headers=_headers(), params=params, timeout=15)
+    if r and r.ok:
+        return r.json()
+    return None
+
 def api_add_comment(post_id: str, text: str) -> Optional[bool]:
     """
     Füge Kommentar hinzu. True bei Erfolg, False bei Backend-Fehler,
@@ -968,6 +1154,33 @@ def toggle_dislike(post_id: str):
             _apply_local(post_id, dislike=False)
 
 # Kommentare holen/zwischenspeichern
+def prefetch_comments(post_ids: List[str]) -> None:
+    """
+    Lade Kommentare aller sichtbaren Beiträge, die noch nicht im Cache sind, mit EINEM Request.
+    Normalerweise sind sie schon über den Feed eingebettet; das hier greift z. B. nach dem
+    Posten eines Kommentars (Cache-Eintrag invalidiert).
+    Ohne Batch-Endpunkt im Backend lädt get_comments() später wie bisher einzeln nach.
+    """
+    if st.session_state["api_support"]["comments"] is False:
+        return
+    missing = [pid for pid in post_ids if pid not in st.session_state["comments_cache"]]
+    if not missing:
+        return
+    data = api_comments_batch(missing)
+    if data is None:
+        return
+    st.session_state["api_support"]["comments"] = True
+    for pid, comments in data.get("comments", {}).items():
+        st.session_state["comments_cache"][pid] = comments
+    st.session_state["comments_counts"].update(data.get("counts", {}))
+
+def load_all_comments(post_id: str) -> None:
+    """Alle Kommentare eines Beitrags nachladen (wenn der Batch nur die neuesten geliefert hat)."""
+    data = api_comments(post_id)
+    if data is not None:
+        st.session_state["comments_cache"][post_id] = data
+        st.session_state["comments_counts"][post_id] = len(data)
+
 def get_comments(post_id: str) -> List[Dict]:
     """
     Hole Kommentare aus Server-Cache oder Backend.
@@ -996,6 +1209,7 @@ def add_comment(post_id: str, text: str, author: str):
         if ok:
             # Server-Kommentare invalidieren, damit nach Posten frisch geladen wird
             st.session_state["comments_cache"].pop(post_id, None)
+            st.session_state["comments_counts"].pop(post_id, None)
             return True
         if ok is False:
             return False
@@ -1003,6 +1217,176 @@ def add_comment(post_id: str, text: str, author: str):
     st.session_state["local_comments"].setdefault(post_id, []).append({"author": author, "text": text})
     return True
 
+# ------------------------------------------------------------
+# Live-Updates (Server-Sent Events von GET /events)
+# ------------------------------------------------------------
+# Der Feed wird einmal geladen; danach kommen nur noch Änderungen (neuer/gelöschter Beitrag,
+# neuer Kommentar, Zähler-Änderungen) und werden lokal eingearbeitet.
+# Ein Hintergrund-Thread hält die Verbindung offen und sammelt die Ereignisse. Er fasst
+# st.session_state nicht an (kein Streamlit-Kontext); das Einarbeiten passiert im UI-Run.
+
+class LiveFeed:
+    """Hintergrund-Empfänger für GET /events mit automatischem Wiederverbinden."""
+
+    def __init__(self, token: str):
+        self.token = token
+        self.events = deque()
+        self.overflow = False
+        self.last_event_id: Optional[str] = None
+        self.last_poll = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+        self._thread.start()
+
+    def alive(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def resume(self) -> "LiveFeed":
+        """Neuer Empfänger mit demselben Token, der bei der letzten Ereignis-ID weitermacht."""
+        live = LiveFeed.__new__(LiveFeed)
+        live.__dict__.update(self.__dict__)
+        live.last_poll = time.monotonic()
+        live._stop = threading.Event()
+        live._thread = threading.Thread(target=live._run, name="live-feed", daemon=True)
+        live._thread.start()
+        return live
+
+    def has_events(self) -> bool:
+        self.last_poll = time.monotonic()
+        return bool(self.events) or self.overflow
+
+    def drain(self) -> List[Dict]:
+        """Alle bisher empfangenen Ereignisse abholen; bei Überlauf ein einzelnes "resync"."""
+        self.last_poll = time.monotonic()
+        if self.overflow:
+            self.overflow = False
+            self.events.clear()
+            return [{"type": "resync"}]
+        out = []
+        while self.events:
+            out.append(self.events.popleft())
+        return out
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self.last_poll > LIVE_IDLE_TIMEOUT
+
+    def _run(self) -> None:
+        backoff = 0.0
+        while not self._stop.is_set() and not self._idle():
+            headers = {"Authorization": f"Bearer {self.token}", "Accept": "text/event-stream"}
+            if self.last_event_id:
+                headers["Last-Event-ID"] = self.last_event_id
+            try:
+                # Lese-Timeout deutlich über dem Ping-Intervall des Backends (15 s)
+                with requests.get(f"{BACKEND_URL}/events", headers=headers, stream=True, timeout=(5, 45)) as r:
+                    if r.status_code in (401, 403, 404):
+                        return  # Token abgelaufen oder Backend ohne /events: kein Live-Modus
+                    r.raise_for_status()
+                    self._read(r)
+                    backoff = 0.0  # Stream regulär beendet (EVENT_STREAM_MAX_AGE): sofort neu verbinden
+            except (requests.exceptions.RequestException, ValueError):
+                backoff = min(max(backoff * 2, 1.0), 30.0)
+            self._stop.wait(backoff)
+        self._stop.set()
+
+    def _read(self, r: requests.Response) -> None:
+        """SSE-Blöcke lesen: "id:"- und "data:"-Zeilen, Leerzeile schließt ein Ereignis ab."""
+        event_id, data = None, []
+        for line in r.iter_lines(decode_unicode=True):
+            if self._stop.is_set() or self._idle():
+                return
+            if line.startswith("id:"):
+                event_id = line[3:].strip()
+            elif line.startswith("data:"):
+                data.append(line[5:].lstrip())
+            elif line == "" and data:
+                if len(self.events) >= LIVE_EVENT_BUFFER:
+                    self.overflow = True
+                else:
+                    self.events.append(json.loads("\n".join(data)))
+                if event_id:
+                    self.last_event_id = event_id
+                event_id, data = None, []
+
+def live_feed_start() -> Optional[LiveFeed]:
+    """Startet (oder reaktiviert) den Empfänger für das aktuelle Token."""
+    if not LIVE_EVENTS or not st.session_state["token"]:
+        return None
+    live = st.session_state["live_feed"]
+    if live is not None and live.token != st.session_state["token"]:
+        live.stop()
+        live = None
+    if live is None:
+        live = LiveFeed(st.session_state["token"])
+    elif not live.alive():
+        live = live.resume()
+    st.session_state["live_feed"] = live
+    return live
+
+def live_feed_stop() -> None:
+    live = st.session_state["live_feed"]
+    if live is not None:
+        live.stop()
+    st.session_state["live_feed"] = None
+
+def apply_live_events() -> None:
+    """Empfangene Ereignisse in Beitragsliste, Zähler und Kommentar-Cache einarbeiten."""
+    live = st.session_state["live_feed"]
+    if live is None:
+        return
+    me = str((st.session_state["user"] or {}).get("id", ""))
+    for event in live.drain():
+        kind = event.get("type")
+        if kind == "resync":
+            # Ereignisse verpasst: Feed einmal komplett neu laden
+            st.session_state["comments_cache"] = {}
+            st.session_state["comments_counts"] = {}
+            st.session_state["beitraege"] = api_beitraege(full=True)
+            continue
+        post_id = str(event.get("post_id") or (event.get("post") or {}).get("id"))
+        if kind == "post_created":
+            if any(p.get("id") == post_id for p in st.session_state["beitraege"]):
+                continue
+            post = dict(event["post"], id=post_id, is_liked=False, is_disliked=False)
+            post["is_owner"] = str(post.get("user_id")) == me
+            st.session_state["beitraege"] = [post] + st.session_state["beitraege"]
+            st.session_state["comments_cache"][post_id] = []
+            st.session_state["comments_counts"][post_id] = 0
+        elif kind == "post_deleted":
+            st.session_state["beitraege"] = [p for p in st.session_state["beitraege"] if p.get("id") != post_id]
+            st.session_state["comments_cache"].pop(post_id, None)
+            st.session_state["comments_counts"].pop(post_id, None)
+            st.session_state["local_reacts"].pop(post_id, None)
+        elif kind == "comment_added":
+            # Ohne Cache-Eintrag lädt prefetch_comments ohnehin frisch (z. B. nach eigenem Kommentar)
+            cached = st.session_state["comments_cache"].get(post_id)
+            if cached is None or any(c.get("id") == event["comment"].get("id") for c in cached):
+                continue
+            cached.append(event["comment"])
+            counts = st.session_state["comments_counts"]
+            counts[post_id] = counts.get(post_id, len(cached) - 1) + 1
+        elif kind == "reaction":
+            # Eigene Reaktionen sind schon über die Antwort des Like-Endpunkts eingearbeitet
+            if str(event.get("user_id")) == me:
+                continue
+            for p in st.session_state["beitraege"]:
+                if p.get("id") == post_id:
+                    p["likes"] = max(0, int(p.get("likes", 0)) + event.get("likes", 0))
+                    p["dislikes"] = max(0, int(p.get("dislikes", 0)) + event.get("dislikes", 0))
+                    if post_id in st.session_state["local_reacts"]:
+                        st.session_state["local_reacts"][post_id].update(likes=p["likes"], dislikes=p["dislikes"])
+                    break
+
+@st.fragment(run_every=LIVE_REFRESH_INTERVAL)
+def live_watch():
+    """Prüft im Hintergrund (nur dieses Fragment läuft erneut), ob Ereignisse vorliegen."""
+    live = st.session_state["live_feed"]
+    if live is not None and live.has_events():
+        st.rerun(scope="app")
+
 # ------------------------------------------------------------
 # Komponenten
 # ------------------------------------------------------------
@@ -1091,14 +1475,18 @@ def page_upload():
         with st.container():
             st.markdown('<div class="primary">', unsafe_allow_html=True)
             if st.button("Teilen", use_container_width=True, disabled=not uploaded):
-                # Upload anstoßen
+                # Upload anstoßen: Backend nimmt die Datei an und verarbeitet sie im Hintergrund
                 with st.spinner("Upload läuft…"):
-                    ok = api_upload(uploaded, caption or "")
-                if ok:
+                    job_id = api_upload(uploaded, caption or "")
+                    status = wait_for_upload(job_id) if job_id else None
+                state = (status or {}).get("status")
+                if state == "done":
                     st.success("Beitrag veröffentlicht.")
                     # Beiträge neu laden, damit der neue Beitrag erscheint
                     st.session_state["beitraege"] = api_beitraege()
                     _rerun()
+                elif state in ("pending", "running"):
+                    st.info("Upload wird noch verarbeitet. Der Beitrag erscheint in Kürze.")
                 else:
                     st.error("Upload fehlgeschlagen.")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -1181,6 +1569,12 @@ def render_post_card(post: Dict):
     if comments:
         for c in comments:
             st.markdown(f"- **{c.get('author','?')}**: {c.get('text')}")
+        # Batch liefert nur die neuesten Kommentare; Rest auf Wunsch nachladen
+        total = st.session_state["comments_counts"].get(post["id"], len(comments))
+        if total > len(comments):
+            if st.button(f"Alle {total} Kommentare anzeigen", key=f"c_all_{post['id']}", use_container_width=True):
+                load_all_comments(post["id"])
+                _rerun()
     else:
         st.markdown("_Keine Kommentare_")
 
@@ -1209,15 +1603,30 @@ def page_beitraege():
     top_hero()
     st.subheader("Beiträge")
 
-    # Beiträge laden, wenn Cache leer
+    # Live-Empfänger vor dem ersten Laden starten, damit keine Änderung dazwischen verloren geht
+    live = live_feed_start()
+
+    # Beiträge laden, wenn Cache leer; sonst nur die Änderungen einarbeiten:
+    # live über /events oder, ohne Live-Verbindung, per Delta-Abfrage (/feed?since=)
     if not st.session_state["beitraege"]:
         st.session_state["beitraege"] = api_beitraege()
+        if live is not None:
+            live.drain()  # bereits im geladenen Feed enthalten
+    elif live is not None:
+        apply_live_events()
+    else:
+        st.session_state["beitraege"] = api_beitraege()
+    if live is not None:
+        live_watch()
 
     posts = st.session_state["beitraege"]
     if not posts:
         st.info("Noch keine Beiträge vorhanden.")
         return
 
+    # Kommentare aller sichtbaren Beiträge gesammelt vorladen (ein Request statt einer pro Karte)
+    prefetch_comments([p["id"] for p in posts])
+
     # Zweispaltiges Layout für Karten
     L, R = st.columns(2, gap="large")
     cols = [L, R]
@@ -1225,6 +1634,12 @@ def page_beitraege():
         with cols[i % 2]:
             render_post_card(p)
 
+    # Weitere Seiten erst auf Wunsch laden (Keyset-Cursor vom Backend)
+    if st.session_state["beitraege_cursor"]:
+        if st.button("Weitere Beiträge laden", use_container_width=True, key="feed_more"):
+            api_beitraege_weitere()
+            _rerun()
+
 # ------------------------------------------------------------
 # Sidebar + Routing
 # ------------------------------------------------------------
@@ -1246,6 +1661,9 @@ with st.sidebar:
             st.session_state["user"] = None
             st.session_state["token"] = None
             st.session_state["beitraege"] = []
+            st.session_state["beitraege_cursor"] = None
+            st.session_state["beitraege_since"] = None
+            live_feed_stop()
             _rerun()
         st.divider()
         # Navigation zwischen Beiträgen und Upload
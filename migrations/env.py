@@ -0,0 +1,64 @@
+"""
+Alembic-Umgebung für die async Engine aus backend/database.py.
+
+- Die Verbindungs-URL und die Metadaten (für --autogenerate) kommen direkt aus dem Projekt.
+- SQLite kann die meisten ALTER-Befehle nicht; `render_as_batch=True` lässt Alembic
+  solche Änderungen über "Tabelle kopieren und ersetzen" abbilden.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.database import Base, DATABASE_URL, apply_sqlite_pragmas
+
+config = context.config
+
+# Logging nur konfigurieren, wenn Alembic über die Kommandozeile läuft
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """SQL-Skript erzeugen, ohne mit der Datenbank zu verbinden (alembic upgrade --sql)."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,
+        # SQLite meldet den Postgres-UUID-Typ beim Auslesen als NUMERIC; ohne diese Ausnahme
+        # würde --autogenerate bei jeder UUID-Spalte eine (falsche) Typänderung vorschlagen.
+        compare_type=connection.dialect.name != "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    """Migrationen über eine eigene async Engine ausführen."""
+    engine = create_async_engine(DATABASE_URL)
+    apply_sqlite_pragmas(engine)  # u. a. busy_timeout, falls die App parallel schon läuft
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
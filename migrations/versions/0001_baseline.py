@@ -0,0 +1,72 @@
+"""Ausgangsschema: user, posts, comments
+
+Entspricht dem Stand, den früher `Base.metadata.create_all` beim Start angelegt hat.
+Bestehende Datenbanken (z. B. ./test.db) haben diese Tabellen schon; sie werden dann
+übersprungen, sodass `alembic upgrade head` auch ohne vorheriges `alembic stamp` läuft.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from fastapi_users_db_sqlalchemy.generics import GUID
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "user" not in existing:
+        op.create_table(
+            "user",
+            sa.Column("id", GUID(), nullable=False),
+            sa.Column("email", sa.String(length=320), nullable=False),
+            sa.Column("hashed_password", sa.String(length=1024), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("is_superuser", sa.Boolean(), nullable=False),
+            sa.Column("is_verified", sa.Boolean(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    if "posts" not in existing:
+        op.create_table(
+            "posts",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("caption", sa.Text(), nullable=True),
+            sa.Column("url", sa.String(), nullable=False),
+            sa.Column("file_type", sa.String(), nullable=False),
+            sa.Column("file_name", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    if "comments" not in existing:
+        op.create_table(
+            "comments",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("text", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("comments")
+    op.drop_table("posts")
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_table("user")
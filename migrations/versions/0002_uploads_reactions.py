@@ -0,0 +1,102 @@
+"""Upload-Status, Reaktionen und Zähler-Log
+
+- posts: status, file_id, likes, dislikes + Keyset-Index (created_at DESC, id)
+- neue Tabellen upload_jobs, reactions, reaction_events
+
+Datenbanken, die vor Alembic über den früheren Spalten-/Index-Abgleich beim Start
+schon (teilweise) auf diesem Stand sind, werden nur ergänzt.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+
+    post_columns = {c["name"] for c in inspector.get_columns("posts")}
+    new_columns = [
+        sa.Column("status", sa.String(), nullable=False, server_default="ready"),
+        sa.Column("file_id", sa.String(), nullable=True),
+        sa.Column("likes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dislikes", sa.Integer(), nullable=False, server_default="0"),
+    ]
+    missing = [c for c in new_columns if c.name not in post_columns]
+    if missing:
+        with op.batch_alter_table("posts") as batch:
+            for column in missing:
+                batch.add_column(column)
+
+    if "ix_posts_created_at_id" not in {i["name"] for i in inspector.get_indexes("posts")}:
+        op.create_index("ix_posts_created_at_id", "posts", [sa.text("created_at DESC"), "id"])
+
+    if "upload_jobs" not in existing:
+        op.create_table(
+            "upload_jobs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("spool_path", sa.String(), nullable=False),
+            sa.Column("file_name", sa.String(), nullable=False),
+            sa.Column("content_type", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_upload_jobs_status", "upload_jobs", ["status"])
+
+    if "reactions" not in existing:
+        op.create_table(
+            "reactions",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("kind", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["post_id"], ["posts.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("post_id", "user_id", name="uq_reactions_post_user"),
+        )
+
+    if "reaction_events" not in existing:
+        op.create_table(
+            "reaction_events",
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("like_delta", sa.Integer(), nullable=False),
+            sa.Column("dislike_delta", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_reaction_events_post_id", "reaction_events", ["post_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reaction_events_post_id", table_name="reaction_events")
+    op.drop_table("reaction_events")
+    op.drop_table("reactions")
+    op.drop_index("ix_upload_jobs_status", table_name="upload_jobs")
+    op.drop_table("upload_jobs")
+    op.drop_index("ix_posts_created_at_id", table_name="posts")
+    with op.batch_alter_table("posts") as batch:
+        batch.drop_column("dislikes")
+        batch.drop_column("likes")
+        batch.drop_column("file_id")
+        batch.drop_column("status")
@@ -0,0 +1,37 @@
+"""Indizes für Feed und Kommentare
+
+- comments(post_id, created_at): Kommentare eines Posts sortiert lesen, ohne Full Scan
+- posts(created_at): Zeitbereiche / Sortierung nach Datum
+- posts(user_id): Posts eines Users (Besitzprüfung, Profilansichten)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_comments_post_id_created_at", "comments", ["post_id", "created_at"]),
+    ("ix_posts_created_at", "posts", ["created_at"]),
+    ("ix_posts_user_id", "posts", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {i["name"] for i in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,70 @@
+"""UUIDs unter SQLite als 16-Byte-BLOB speichern
+
+Bisher lagen IDs unter SQLite als Text: User-IDs mit 36 Zeichen (fastapi-users GUID),
+alle anderen mit 32 Hex-Zeichen (Postgres-UUID-Typ ohne native Unterstützung).
+`PortableUUID` speichert sie als 16 Byte; diese Migration wandelt vorhandene Werte um.
+Der deklarierte Spaltentyp bleibt unverändert – SQLite speichert BLOBs in jeder Spalte
+unverändert ab. Unter PostgreSQL sind alle Spalten bereits vom Typ `uuid`: nichts zu tun.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (Tabelle, Spalte) aller UUID-Spalten
+UUID_COLUMNS = [
+    ("user", "id"),
+    ("posts", "id"),
+    ("posts", "user_id"),
+    ("comments", "id"),
+    ("comments", "post_id"),
+    ("comments", "user_id"),
+    ("reactions", "id"),
+    ("reactions", "post_id"),
+    ("reactions", "user_id"),
+    ("reaction_events", "post_id"),
+    ("upload_jobs", "id"),
+    ("upload_jobs", "post_id"),
+    ("upload_jobs", "user_id"),
+]
+
+
+def _convert(bind, table: str, column: str, to_blob: bool) -> None:
+    """Schreibt jeden Wert der Spalte in der Zielform zurück (Text -> BLOB oder umgekehrt)."""
+    source_type = "text" if to_blob else "blob"
+    values = bind.exec_driver_sql(
+        f'SELECT DISTINCT "{column}" FROM "{table}" WHERE typeof("{column}") = ?', (source_type,)
+    ).scalars().all()
+    for value in values:
+        if to_blob:
+            new = uuid.UUID(value).bytes
+        else:
+            parsed = uuid.UUID(bytes=bytes(value))
+            # Ursprüngliche Schreibweise: User-IDs mit Bindestrichen (GUID), sonst 32 Hex-Zeichen
+            new = str(parsed) if (table, column) == ("user", "id") else parsed.hex
+        bind.exec_driver_sql(f'UPDATE "{table}" SET "{column}" = ? WHERE "{column}" = ?', (new, value))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    for table, column in UUID_COLUMNS:
+        _convert(bind, table, column, to_blob=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return
+    for table, column in UUID_COLUMNS:
+        _convert(bind, table, column, to_blob=False)
@@ -0,0 +1,34 @@
+"""Löschprotokoll für Delta-Abfragen des Feeds
+
+- neue Tabelle post_deletions (post_id, deleted_at) mit Index auf deleted_at
+- GET /feed?since=... liefert daraus die seit dem Marker gelöschten Post-IDs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "post_deletions",
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("post_id"),
+    )
+    op.create_index("ix_post_deletions_deleted_at", "post_deletions", ["deleted_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_post_deletions_deleted_at", table_name="post_deletions")
+    op.drop_table("post_deletions")
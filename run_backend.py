@@ -24,5 +24,7 @@ if __name__ == "__main__":
         "backend.api:app",  # Import-String: <modulpfad>:<app-variable>
         host="0.0.0.0",     # auf allen Interfaces lauschen
         port=8000,          # HTTP-Port
-        reload=True         # automatisches Neustarten bei Codeänderungen (Dev)
+        reload=True,        # automatisches Neustarten bei Codeänderungen (Dev)
+        # offene Antworten (z. B. /events-Streams) beim Beenden höchstens 5 s abwarten
+        timeout_graceful_shutdown=5,
     )
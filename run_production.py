@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Produktions-Startskript für das FastAPI-Backend (mehrere Uvicorn-Worker-Prozesse).
+
+Erläuterung:
+- `run_backend.py` ist für die Entwicklung gedacht: ein Prozess mit Auto-Reload
+  (Datei-Überwachung kostet CPU, ein Prozess nutzt nur einen Kern).
+- Dieses Skript startet `WEB_CONCURRENCY` Worker-Prozesse (Standard: Anzahl CPU-Kerne), die sich
+  einen Port teilen. Uvicorn überwacht sie und startet abgestürzte Worker neu.
+- Einmalige Startaufgaben laufen hier im Elternprozess, BEVOR die Worker starten:
+    1) Schema-Migrationen (`alembic upgrade head`)
+    2) Upload-Jobs, die beim letzten Lauf abgebrochen wurden, wieder einreihen
+  Die Worker bekommen `DB_AUTO_MIGRATE=0` und `UPLOAD_REQUEUE_ON_START=0`, damit nicht mehrere
+  Prozesse gleichzeitig migrieren oder Jobs zurücksetzen, die ein anderer Worker gerade bearbeitet.
+- Alle Einstellungen kommen aus Umgebungsvariablen (siehe unten), z. B.:
+    WEB_CONCURRENCY=4 TIMEOUT_KEEP_ALIVE=65 python run_production.py
+
+Für Anfänger:
+- uvloop ist eine schnellere Event-Loop, httptools ein schnellerer HTTP-Parser. Beide kommen mit
+  `uvicorn[standard]`; "auto" nutzt sie, wenn sie installiert sind (uvloop nicht unter Windows).
+- Keep-Alive: wie lange eine Verbindung nach einer Antwort offen bleibt. Hinter einem Proxy/Load-
+  Balancer etwas länger als dessen Leerlauf-Timeout wählen (oft 60 s), sonst schließt Uvicorn
+  Verbindungen, die der Proxy gerade wiederverwenden will (sporadische 502).
+- Backlog: wie viele neue Verbindungen der Kernel puffert, bevor er sie ablehnt (Lastspitzen).
+- Graceful Shutdown: Bei SIGTERM/SIGINT nimmt jeder Worker keine neuen Verbindungen mehr an und
+  wartet höchstens `TIMEOUT_GRACEFUL_SHUTDOWN` Sekunden auf laufende Antworten (offene
+  /events-Streams), danach räumt der lifespan-Hook auf (Upload-Queue, Aggregator).
+- Jeder Worker hat eigenen Speicher: Feed-Cache, Metriken (/metrics) und Profiler gelten pro
+  Prozess. Live-Ereignisse mit `EVENT_BROKER=memory` erreichen nur Clients desselben Workers –
+  für mehrere Worker einen Broker mit gemeinsamem Kanal ergänzen (siehe backend/events.py).
+"""
+
+import asyncio
+import logging
+import os
+
+import uvicorn  # ASGI-Server zum Starten der FastAPI-App
+
+logger = logging.getLogger("run_production")
+
+# -----------------------------------------------------------------------------
+# Konfiguration
+# -----------------------------------------------------------------------------
+HOST: str = os.getenv("HOST", "0.0.0.0")
+PORT: int = int(os.getenv("PORT", "8000"))
+# Anzahl Worker-Prozesse (derselbe Name wie bei uvicorn/gunicorn); Standard: CPU-Kerne.
+WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+# Event-Loop ("auto", "uvloop", "asyncio") und HTTP-Parser ("auto", "httptools", "h11").
+UVICORN_LOOP: str = os.getenv("UVICORN_LOOP", "auto")
+UVICORN_HTTP: str = os.getenv("UVICORN_HTTP", "auto")
+# Sekunden, die eine Keep-Alive-Verbindung ohne neuen Request offen bleibt.
+TIMEOUT_KEEP_ALIVE: int = int(os.getenv("TIMEOUT_KEEP_ALIVE", "65"))
+# Länge der Warteschlange für neue Verbindungen (listen()-Backlog).
+BACKLOG: int = int(os.getenv("BACKLOG", "2048"))
+# Höchstwartezeit beim Beenden für offene Antworten (z. B. /events-Streams).
+TIMEOUT_GRACEFUL_SHUTDOWN: int = int(os.getenv("TIMEOUT_GRACEFUL_SHUTDOWN", "10"))
+# Gleichzeitige Verbindungen pro Worker, darüber antwortet Uvicorn mit 503 (0 = unbegrenzt).
+LIMIT_CONCURRENCY: int = int(os.getenv("LIMIT_CONCURRENCY", "0"))
+# Worker nach so vielen Requests neu starten (begrenzt schleichendes Speicherwachstum; 0 = nie).
+LIMIT_MAX_REQUESTS: int = int(os.getenv("LIMIT_MAX_REQUESTS", "0"))
+# "1" = Zugriffslog je Request (kostet unter Last spürbar Zeit; Zählungen liefert auch /metrics).
+ACCESS_LOG: bool = os.getenv("ACCESS_LOG", "1") == "1"
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "info")
+
+
+def prepare() -> None:
+    """
+    Einmalige Startaufgaben im Elternprozess (vor den Workern):
+    Migrationen anwenden und abgebrochene Upload-Jobs wieder einreihen.
+    """
+    from backend.migrate import upgrade_head
+    from backend.database import engine, read_engine
+    from backend.upload_jobs import make_job_store
+
+    upgrade_head()
+
+    async def requeue() -> int:
+        try:
+            return await make_job_store().requeue_interrupted()
+        finally:
+            # Verbindungen schließen: die Worker öffnen ihre eigenen Pools
+            await engine.dispose()
+            await read_engine.dispose()
+
+    count = asyncio.run(requeue())
+    if count:
+        logger.info("Requeued %d interrupted upload job(s)", count)
+
+
+def warn_about_process_local_state() -> None:
+    """Hinweise auf Einstellungen, die mit mehreren Workern nicht wie erwartet funktionieren."""
+    if WEB_CONCURRENCY <= 1:
+        return
+    if os.getenv("EVENT_BROKER", "memory") == "memory":
+        logger.warning(
+            "EVENT_BROKER=memory with %d workers: /events clients only see changes made in their own worker",
+            WEB_CONCURRENCY,
+        )
+    if os.getenv("UPLOAD_JOB_BACKEND", "db") == "memory":
+        logger.warning("UPLOAD_JOB_BACKEND=memory with several workers: GET /upload/{job_id} only works in the worker that accepted the upload")
+    if ":memory:" in os.getenv("DATABASE_URL", ""):
+        logger.warning("In-memory SQLite is per process: every worker has its own empty database")
+
+
+if __name__ == "__main__":
+    # Eigene Meldungen und ausgeführte Migrationen anzeigen, sonst nur Warnungen
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s:     %(message)s")
+    for name in ("run_production", "alembic.runtime.migration", "backend"):
+        logging.getLogger(name).setLevel(LOG_LEVEL.upper())
+    prepare()
+    warn_about_process_local_state()
+
+    # Für die Worker: Startaufgaben sind erledigt (Worker-Prozesse erben die Umgebung)
+    os.environ["DB_AUTO_MIGRATE"] = "0"
+    os.environ["UPLOAD_REQUEUE_ON_START"] = "0"
+
+    uvicorn.run(
+        "backend.api:app",                     # Import-String (nötig für mehrere Worker)
+        host=HOST,
+        port=PORT,
+        workers=WEB_CONCURRENCY,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP,
+        backlog=BACKLOG,
+        timeout_keep_alive=TIMEOUT_KEEP_ALIVE,
+        timeout_graceful_shutdown=TIMEOUT_GRACEFUL_SHUTDOWN,
+        limit_concurrency=LIMIT_CONCURRENCY or None,
+        limit_max_requests=LIMIT_MAX_REQUESTS or None,
+        access_log=ACCESS_LOG,
+        log_level=LOG_LEVEL,
+        proxy_headers=True,                    # X-Forwarded-For/-Proto vom Proxy übernehmen
+        reload=False,
+    )
@@ -0,0 +1,80 @@
+"""
+Gemeinsame Fixtures für die Tests.
+
+Für Anfänger:
+- Die Backend-Module lesen ihre Einstellungen beim Import aus Umgebungsvariablen. Deshalb
+  werden sie hier gesetzt, BEVOR `backend.api` importiert wird: eigene SQLite-Datei in einem
+  temporären Ordner, lokales Speicher-Backend (kein ImageKit, kein Netzwerk).
+- `client` startet die App einmal pro Testlauf mit Lifespan (Migrationen, Upload-Worker, ...).
+- Jeder Test legt sich eigene User und Posts an; die Tests hängen nicht voneinander ab.
+
+Aufruf (im Projektordner):
+    uv run --with pytest --with httpx pytest
+"""
+
+import os
+import tempfile
+import time
+import uuid
+
+import pytest
+
+TEST_DIR = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["STORAGE_LOCAL_DIR"] = os.path.join(TEST_DIR, "media")
+os.environ["UPLOAD_SPOOL_DIR"] = os.path.join(TEST_DIR, "upload_spool")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.api import app  # noqa: E402
+
+# Sekunden, die `upload_post` höchstens auf den Upload-Job wartet
+UPLOAD_TIMEOUT = 10
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def auth(token: str) -> dict:
+    """Authorization-Header für ein Access-Token."""
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def make_user(client):
+    """Registriert einen neuen User und liefert sein Access-Token."""
+    def make() -> str:
+        email = f"{uuid.uuid4().hex[:12]}@example.com"
+        r = client.post("/auth/register", json={"email": email, "password": "pw123456"})
+        assert r.status_code == 201, r.text
+        r = client.post("/auth/jwt/login", data={"username": email, "password": "pw123456"})
+        assert r.status_code == 200, r.text
+        return r.json()["access_token"]
+    return make
+
+
+@pytest.fixture
+def upload_post(client):
+    """Lädt eine kleine Datei über POST /upload hoch, wartet auf den Job und liefert die post_id."""
+    def upload(token: str, caption: str = "") -> str:
+        r = client.post(
+            "/upload",
+            files={"file": ("bild.jpg", b"\xff\xd8\xff" + os.urandom(64), "image/jpeg")},
+            data={"caption": caption},
+            headers=auth(token),
+        )
+        assert r.status_code == 202, r.text
+        job = r.json()
+        deadline = time.monotonic() + UPLOAD_TIMEOUT
+        while True:
+            status = client.get(f"/upload/{job['job_id']}", headers=auth(token)).json()
+            if status["status"] == "done":
+                return job["post_id"]
+            assert status["status"] != "failed", status
+            assert time.monotonic() < deadline, f"upload job not done: {status}"
+            time.sleep(0.02)
+    return upload
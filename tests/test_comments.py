@@ -0,0 +1,42 @@
+"""
+GET /post/{post_id}/comments: ETag/304 über den Inhalt der Antwort.
+"""
+
+from conftest import auth
+
+
+def test_comments_etag(client, make_user, upload_post):
+    token = make_user()
+    post_id = upload_post(token)
+    url = f"/post/{post_id}/comments"
+    assert client.post(url, json={"text": "erster"}, headers=auth(token)).status_code == 200
+
+    first = client.get(url, headers=auth(token))
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert [c["text"] for c in first.json()["comments"]] == ["erster"]
+
+    again = client.get(url, headers={**auth(token), "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    assert client.post(url, json={"text": "zweiter"}, headers=auth(token)).status_code == 200
+    changed = client.get(url, headers={**auth(token), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [c["text"] for c in changed.json()["comments"]] == ["erster", "zweiter"]
+
+
+def test_comments_etag_changes_with_author_email(client, make_user, upload_post):
+    token = make_user()
+    post_id = upload_post(token)
+    url = f"/post/{post_id}/comments"
+    client.post(url, json={"text": "hallo"}, headers=auth(token))
+    etag = client.get(url, headers=auth(token)).headers["ETag"]
+
+    # Gleiche Kommentare, aber neue Autor-E-Mail in der Antwort -> neues ETag
+    r = client.patch("/users/me", json={"email": "neu-" + etag.strip('"')[:8] + "@example.com"}, headers=auth(token))
+    assert r.status_code == 200, r.text
+    r = client.get(url, headers={**auth(token), "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["comments"][0]["author"].startswith("neu-")
@@ -0,0 +1,94 @@
+"""
+GET /feed: Keyset-Cursor, ETag/304 und Delta-Abfragen mit `since`.
+"""
+
+from conftest import auth
+
+
+def _all_ids(client, token):
+    """Alle Post-IDs des Feeds mit einer großen Seite (Vergleichswert für die Pagination)."""
+    r = client.get("/feed", params={"limit": 100}, headers=auth(token))
+    assert r.status_code == 200
+    assert r.json()["next_cursor"] is None, "more posts than one page in the test database"
+    return [p["id"] for p in r.json()["posts"]]
+
+
+def test_cursor_pages_cover_feed_without_gaps(client, make_user, upload_post):
+    token = make_user()
+    for i in range(5):
+        upload_post(token, caption=f"post {i}")
+    expected = _all_ids(client, token)
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/feed", params=params, headers=auth(token)).json()
+        assert len(page["posts"]) <= 2
+        ids.extend(p["id"] for p in page["posts"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == expected
+    assert len(set(ids)) == len(ids)
+
+
+def test_invalid_cursor_is_rejected(client, make_user):
+    r = client.get("/feed", params={"cursor": "nicht-base64!"}, headers=auth(make_user()))
+    assert r.status_code == 400
+
+
+def test_etag_returns_304_until_feed_changes(client, make_user, upload_post):
+    token = make_user()
+    post_id = upload_post(token)
+
+    first = client.get("/feed", headers=auth(token))
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    again = client.get("/feed", headers={**auth(token), "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # Eigene Reaktion ändert is_liked in der Antwort -> neues ETag
+    assert client.post(f"/post/{post_id}/like", headers=auth(token)).status_code == 200
+    changed = client.get("/feed", headers={**auth(token), "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_etag_differs_per_user(client, make_user, upload_post):
+    owner, other = make_user(), make_user()
+    upload_post(owner)
+    etag = client.get("/feed", headers=auth(owner)).headers["ETag"]
+    # is_owner ist pro User verschieden: das ETag des einen passt nicht für den anderen
+    r = client.get("/feed", headers={**auth(other), "If-None-Match": etag})
+    assert r.status_code == 200
+
+
+def test_since_returns_new_posts_and_deletions(client, make_user, upload_post):
+    token = make_user()
+    old_id = upload_post(token, caption="alt")
+    since = client.get("/feed", headers=auth(token)).json()["since"]
+
+    new_id = upload_post(token, caption="neu")
+    assert client.delete(f"/post/{old_id}", headers=auth(token)).status_code == 200
+
+    delta = client.get("/feed", params={"since": since, "limit": 100}, headers=auth(token)).json()
+    assert delta["reset"] is False
+    assert new_id in [p["id"] for p in delta["posts"]]
+    assert old_id in delta["deleted"]
+    assert delta["since"] > since
+
+    # Der normale Feed zeigt denselben Stand
+    full = _all_ids(client, token)
+    assert new_id in full and old_id not in full
+
+
+def test_since_and_cursor_are_exclusive(client, make_user):
+    token = make_user()
+    since = client.get("/feed", headers=auth(token)).json()["since"]
+    r = client.get("/feed", params={"since": since, "cursor": "x"}, headers=auth(token))
+    assert r.status_code == 400
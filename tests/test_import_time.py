@@ -0,0 +1,22 @@
+"""
+Startzeit-Budget: `import backend.api` in einem frischen Interpreter (siehe benchmarks/import_time.py).
+"""
+
+from benchmarks.import_time import FORBIDDEN_MODULES, IMPORT_TIME_BUDGET_MS, measure
+
+# Frische Interpreter; der schnellste zählt (wie `--runs` im Skript)
+RUNS = 3
+
+
+def test_import_time_within_budget():
+    runs = [measure("backend.api") for _ in range(RUNS)]
+    best, self_times = min(runs, key=lambda run: run[0])
+
+    assert best <= IMPORT_TIME_BUDGET_MS, (
+        f"import backend.api took {best:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)"
+    )
+    loaded = [
+        name for name in FORBIDDEN_MODULES
+        if any(imported == name or imported.startswith(name + ".") for imported in self_times)
+    ]
+    assert not loaded, f"modules that should load lazily were imported: {', '.join(loaded)}"
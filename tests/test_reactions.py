@@ -0,0 +1,48 @@
+"""
+POST /post/{post_id}/like|unlike|dislike|undislike: wiederholte Aufrufe ändern nichts.
+"""
+
+from conftest import auth
+
+
+def _react(client, token, post_id, action):
+    r = client.post(f"/post/{post_id}/{action}", headers=auth(token))
+    assert r.status_code == 200, r.text
+    body = r.json()
+    return body["likes"], body["dislikes"], body["is_liked"], body["is_disliked"]
+
+
+def test_like_and_unlike_are_idempotent(client, make_user, upload_post):
+    owner, fan = make_user(), make_user()
+    post_id = upload_post(owner)
+
+    assert _react(client, fan, post_id, "like") == (1, 0, True, False)
+    assert _react(client, fan, post_id, "like") == (1, 0, True, False)
+    assert _react(client, owner, post_id, "like") == (2, 0, True, False)
+
+    assert _react(client, fan, post_id, "unlike") == (1, 0, False, False)
+    assert _react(client, fan, post_id, "unlike") == (1, 0, False, False)
+
+
+def test_dislike_replaces_like(client, make_user, upload_post):
+    token = make_user()
+    post_id = upload_post(token)
+
+    assert _react(client, token, post_id, "like") == (1, 0, True, False)
+    assert _react(client, token, post_id, "dislike") == (0, 1, False, True)
+    assert _react(client, token, post_id, "dislike") == (0, 1, False, True)
+    # "unlike" ohne Like ist ein No-op
+    assert _react(client, token, post_id, "unlike") == (0, 1, False, True)
+    assert _react(client, token, post_id, "undislike") == (0, 0, False, False)
+
+
+def test_feed_counters_match_reactions(client, make_user, upload_post):
+    owner, fan = make_user(), make_user()
+    post_id = upload_post(owner)
+    for _ in range(3):
+        _react(client, fan, post_id, "like")
+    _react(client, owner, post_id, "dislike")
+
+    posts = client.get("/feed", params={"limit": 100}, headers=auth(fan)).json()["posts"]
+    post = next(p for p in posts if p["id"] == post_id)
+    assert (post["likes"], post["dislikes"], post["is_liked"]) == (1, 1, True)